@@ -1,11 +1,55 @@
+import json
+import os
+import threading
+import time
+
 import streamlit as st
 from streamlit_option_menu import option_menu
 
-# Import fungsi halaman dari folder src
-from src.overview import show_overview
-from src.eda import show_eda
-from src.predict import show_predict_page
-from src.aboutme import show_creator
+from src import timing
+
+# Halaman di-import saat menu-nya pertama kali dipilih (bukan di awal),
+# supaya halaman ringan tidak ikut memuat seaborn/plotly/scipy/model.
+PAGES = {
+    "Understand the Data": ("src.overview", "show_overview"),
+    "Explore The Data": ("src.eda", "show_eda"),
+    "Try the Model": ("src.predict", "show_predict_page"),
+    "Meet the Creator": ("src.aboutme", "show_creator"),
+}
+
+
+def load_page(page):
+    module_name, func_name = PAGES[page]
+    return getattr(timing.import_module(module_name), func_name)
+
+
+# -----------------------------
+# Warm-up modul berat di background setelah render pertama
+# -----------------------------
+def _warm_up():
+    for module_name, _ in PAGES.values():
+        try:
+            timing.import_module(module_name)
+        except Exception:
+            pass  # error asli akan muncul saat halaman dibuka
+
+    # Artifact model (kalau sudah di-populate) juga disiapkan
+    try:
+        from src.features import load_encoder
+        from src.forest import load_forest
+
+        load_encoder()
+        load_forest().prepare_explain()
+    except Exception:
+        pass
+
+
+@st.cache_resource
+def start_warm_up():
+    thread = threading.Thread(target=_warm_up, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
 
 # Set page config
 st.set_page_config(page_title="Hotel Cancellation Dashboard", layout="wide")
@@ -14,12 +58,7 @@ st.set_page_config(page_title="Hotel Cancellation Dashboard", layout="wide")
 with st.sidebar:
     page = option_menu(
         menu_title="Main Menu",
-        options=[
-            "Understand the Data",
-            "Explore The Data",
-            "Try the Model",
-            "Meet the Creator"
-        ],
+        options=list(PAGES),
         icons=["bar-chart", "graph-up", "cpu", "person-circle"],
         default_index=0
     )
@@ -27,12 +66,83 @@ with st.sidebar:
 # Debug info (opsional, bisa dihapus jika sudah yakin)
 st.write(f"✅ Current page: {page}")
 
-# Routing halaman
-if page == "Understand the Data":
-    show_overview()
-elif page == "Explore The Data":
-    show_eda()
-elif page == "Try the Model":
-    show_predict_page()
-elif page == "Meet the Creator":
-    show_creator()
+# Routing halaman (opsional: cProfile untuk satu rerun, diaktifkan dari panel Performance)
+profile_this_run = st.session_state.pop("profile_next_run", False)
+render_start = time.perf_counter()
+if profile_this_run:
+    profile = {}
+    with timing.profiled(profile):
+        load_page(page)()
+    st.session_state["last_profile"] = (page, profile["stats"])
+else:
+    load_page(page)()
+timing.record("page", page, time.perf_counter() - render_start)
+timing.mark_once("startup", "time-to-first-render")
+
+start_warm_up()
+
+# Export metrik tiap rerun kalau diminta (mis. untuk textfile collector Prometheus)
+if os.environ.get("HOTEL_METRICS_PROM"):
+    timing.export_prometheus(os.environ["HOTEL_METRICS_PROM"])
+if os.environ.get("HOTEL_METRICS_JSONL"):
+    timing.export_json(os.environ["HOTEL_METRICS_JSONL"])
+
+# -----------------------------
+# Panel performance: startup, timer per halaman/data/encoding/inference, counter
+# -----------------------------
+with st.sidebar.expander("⏱️ Performance"):
+    startup = timing.startup_report()
+    first = next((r for r in startup if r["name"] == "time-to-first-render"), None)
+    if first:
+        st.metric("Time to first render", f"{first['ms']:.0f} ms")
+
+    timers, counters = timing.summary()
+    st.caption(f"Timer (p50/p95/p99 dari {timing.WINDOW} sampel terakhir)")
+    st.dataframe(
+        [{k: r[k] for k in ("category", "name", "count", "p50_ms", "p95_ms", "p99_ms", "max_ms")} for r in timers],
+        use_container_width=True,
+    )
+    if counters:
+        st.caption("Counter")
+        st.dataframe(counters, use_container_width=True)
+
+    st.caption("Startup")
+    st.dataframe(
+        [{k: r[k] for k in ("category", "name", "ms", "thread")} for r in startup
+         if r["category"] in ("import", "artifact", "dataset")],
+        use_container_width=True,
+    )
+
+    col_prom, col_json = st.columns(2)
+    col_prom.download_button("Prometheus", timing.prometheus_text(), file_name="hotel_metrics.prom")
+    col_json.download_button("JSON", json.dumps(timing.json_snapshot(), indent=2), file_name="hotel_metrics.json")
+
+    if st.button("🔬 Profile next rerun"):
+        st.session_state["profile_next_run"] = True
+        st.rerun()
+    if "last_profile" in st.session_state:
+        profiled_page, stats = st.session_state["last_profile"]
+        st.caption(f"cProfile: {profiled_page}")
+        st.code(stats, language="text")
+
+# -----------------------------
+# Panel drift: booking yang di-score vs distribusi data training (src/drift.py)
+# -----------------------------
+with st.sidebar.expander("📉 Drift"):
+    try:
+        from src.drift import load_monitor
+
+        monitor = load_monitor()
+    except Exception:
+        monitor = None
+    if monitor is None:
+        st.caption("Model aktif belum punya drift_reference untuk versi rf_model ini "
+                   "(latih ulang dengan `python train.py ... --publish`).")
+    else:
+        drift_report = monitor.report()
+        st.caption(f"{drift_report['rows']:,} booking di-score vs {drift_report['reference_rows']:,} baris training")
+        st.dataframe(
+            [{"feature": col, "psi": e["psi"], "ks": e["ks"], "status": e["status"]}
+             for col, e in drift_report["features"].items()],
+            use_container_width=True,
+        )
@@ -0,0 +1,99 @@
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.schema import TARGET
+
+# -----------------------------
+# Data sintetis dengan kolom yang sama seperti cleaned_hotel_data
+# -----------------------------
+MONTHS = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+]
+COUNTRIES = ["PRT", "GBR", "FRA", "ESP", "DEU", "ITA", "IRL", "BEL", "BRA", "NLD", "USA", "CHE", "AGO"]
+
+
+def synthetic_bookings(n, seed=42, n_countries=150):
+    rng = np.random.default_rng(seed)
+    countries = COUNTRIES + [f"X{i:03d}" for i in range(max(n_countries - len(COUNTRIES), 0))]
+    df = pd.DataFrame({
+        "hotel": rng.choice(["City Hotel", "Resort Hotel"], n),
+        "lead_time": rng.integers(0, 500, n),
+        "arrival_date_year": rng.choice([2015, 2016, 2017], n),
+        "arrival_date_month": rng.choice(MONTHS, n),
+        "arrival_date_week_number": rng.integers(1, 54, n),
+        "arrival_date_day_of_month": rng.integers(1, 32, n),
+        "stays_in_weekend_nights": rng.integers(0, 5, n),
+        "stays_in_week_nights": rng.integers(0, 11, n),
+        "adults": rng.integers(1, 4, n),
+        "children": rng.integers(0, 3, n).astype(float),
+        "babies": rng.integers(0, 2, n),
+        "meal": rng.choice(["BB", "HB", "FB", "SC"], n),
+        "country": rng.choice(countries, n),
+        "market_segment": rng.choice(["Online TA", "Direct", "Offline TA/TO", "Corporate", "Complementary", "Groups"], n),
+        "distribution_channel": rng.choice(["TA/TO", "Direct", "Corporate", "GDS"], n),
+        "is_repeated_guest": rng.integers(0, 2, n),
+        "previous_cancellations": rng.integers(0, 3, n),
+        "previous_bookings_not_canceled": rng.integers(0, 3, n),
+        "reserved_room_type": rng.choice(list("ABCDEFGH"), n),
+        "assigned_room_type": rng.choice(list("ABCDEFGHI"), n),
+        "booking_changes": rng.integers(0, 5, n),
+        "deposit_type": rng.choice(["No Deposit", "Non Refund", "Refundable"], n),
+        "days_in_waiting_list": rng.integers(0, 20, n),
+        "customer_type": rng.choice(["Transient", "Contract", "Group", "Transient-Party"], n),
+        "adr": rng.gamma(4.0, 25.0, n).round(2),
+        "required_car_parking_spaces": rng.integers(0, 2, n),
+        "total_of_special_requests": rng.integers(0, 4, n),
+        "has_agent": rng.integers(0, 2, n),
+    })
+    # Target dengan pola kasar yang mirip data asli
+    logit = (
+        -1.0
+        + 0.004 * df["lead_time"]
+        + 2.0 * (df["deposit_type"] == "Non Refund")
+        - 0.8 * df["total_of_special_requests"]
+        + 0.004 * df["adr"]
+        - 1.0 * df["required_car_parking_spaces"]
+    )
+    df.insert(1, TARGET, (rng.random(n) < 1 / (1 + np.exp(-logit))).astype(int))
+    return df
+
+
+def synthetic_model(n_rows=20_000, n_estimators=100, max_depth=None, seed=42):
+    # Model + encoder dengan setting yang sama seperti `python train.py fit`
+    from sklearn.ensemble import RandomForestClassifier
+
+    from src.features import FeatureEncoder
+
+    df = synthetic_bookings(n_rows, seed=seed)
+    X = df.drop(columns=[TARGET])
+    encoder = FeatureEncoder.fit(X)
+    rf = RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth, random_state=seed, n_jobs=-1)
+    rf.fit(encoder.transform_frame(X), df[TARGET])
+    return rf, encoder
+
+
+# -----------------------------
+# Timing helper
+# -----------------------------
+def time_calls(fn, repeat=200, warmup=5):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    samples.sort()
+    return {
+        "mean_ms": statistics.fmean(samples) * 1e3,
+        "p50_ms": samples[len(samples) // 2] * 1e3,
+        "p99_ms": samples[min(int(len(samples) * 0.99), len(samples) - 1)] * 1e3,
+    }
+
+
+def print_row(label, stats):
+    print(f"{label:<40} mean {stats['mean_ms']:9.3f} ms | p50 {stats['p50_ms']:9.3f} ms | p99 {stats['p99_ms']:9.3f} ms")
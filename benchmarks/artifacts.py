@@ -0,0 +1,184 @@
+# Benchmark: ukuran artifact model vs waktu load (per codec/level joblib) + latency predict_proba
+#
+#   python -m benchmarks.artifacts                                 # model sintetis, laporan JSON
+#   python -m benchmarks.artifacts --use-artifact --out report.json
+#   python -m benchmarks.artifacts --dataset cleaned_hotel_data4 --sample-rows 50000
+#
+# Hasilnya (JSON, key terurut) bisa di-diff antar release.
+import argparse
+import gc
+import json
+import platform
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from benchmarks._common import synthetic_bookings, synthetic_model, time_calls
+from src.forest import FlatForest
+from src.schema import TARGET
+
+# (codec, level); None = tanpa kompresi. lz4 hanya kalau package lz4 terpasang.
+DEFAULT_CODECS = [
+    None,
+    ("zlib", 1), ("zlib", 3), ("zlib", 6), ("zlib", 9),
+    ("gzip", 3),
+    ("bz2", 3),
+    ("lzma", 1), ("lzma", 3),
+    ("lz4", 1), ("lz4", 3),
+]
+DEFAULT_BATCH_SIZES = [1, 10, 100, 1_000, 10_000, 100_000]
+
+
+def _codec_label(codec):
+    return "none" if codec is None else f"{codec[0]}-{codec[1]}"
+
+
+def _codec_available(codec):
+    if codec is None or codec[0] != "lz4":
+        return True
+    try:
+        import lz4  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _time_load(path, repeat, **kwargs):
+    samples = []
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        obj = joblib.load(path, **kwargs)
+        samples.append(time.perf_counter() - t0)
+        del obj
+    return {"min_ms": min(samples) * 1e3, "median_ms": statistics.median(samples) * 1e3}
+
+
+def bench_load(rf, codecs, repeat, workdir):
+    results = []
+    for codec in codecs:
+        label = _codec_label(codec)
+        if not _codec_available(codec):
+            print(f"{label:<10} dilewati (package tidak terpasang)")
+            continue
+        path = Path(workdir) / f"rf_model.{label}.pkl"
+        t0 = time.perf_counter()
+        joblib.dump(rf, path, compress=codec or 0)
+        dump_ms = (time.perf_counter() - t0) * 1e3
+
+        row = {"codec": label, "size_mb": path.stat().st_size / 1e6, "dump_ms": dump_ms, "mmap": False}
+        row.update(_time_load(path, repeat))
+        results.append(row)
+        print(f"{label:<10} {row['size_mb']:8.2f} MB | dump {dump_ms:8.1f} ms | load median {row['median_ms']:8.1f} ms")
+
+        if codec is None:
+            # Array numpy di file tanpa kompresi bisa di-mmap (read-only)
+            row = {"codec": label, "size_mb": path.stat().st_size / 1e6, "dump_ms": dump_ms, "mmap": True}
+            row.update(_time_load(path, repeat, mmap_mode="r"))
+            results.append(row)
+            print(f"{'none+mmap':<10} {row['size_mb']:8.2f} MB | {'':>17} | load median {row['median_ms']:8.1f} ms")
+        path.unlink()
+    return results
+
+
+def _repeat_for(batch, budget_rows=200_000, lo=5, hi=200):
+    # p99 butuh banyak sampel untuk batch kecil; batch besar cukup beberapa kali
+    return int(min(hi, max(lo, budget_rows // batch)))
+
+
+def bench_latency(rf, X_all, batch_sizes, engines):
+    predictors = {
+        "sklearn": rf.predict_proba,
+        "flat": FlatForest.from_sklearn(rf).predict_proba,
+    }
+    results = []
+    for engine in engines:
+        for batch in batch_sizes:
+            X = X_all[:batch]
+            stats = time_calls(lambda: predictors[engine](X), repeat=_repeat_for(batch), warmup=2)
+            row = {"engine": engine, "batch": batch, "repeat": _repeat_for(batch),
+                   "p50_ms": stats["p50_ms"], "p99_ms": stats["p99_ms"], "mean_ms": stats["mean_ms"],
+                   "rows_per_s": batch / (stats["mean_ms"] / 1e3)}
+            results.append(row)
+            print(f"{engine:<8} batch {batch:>7,} | p50 {row['p50_ms']:10.3f} ms | p99 {row['p99_ms']:10.3f} ms | "
+                  f"{row['rows_per_s']:12,.0f} rows/s")
+    return results
+
+
+def _environment():
+    import pandas as pd
+    import sklearn
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+        "joblib": joblib.__version__,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ukuran/load artifact model dan latency predict_proba")
+    parser.add_argument("--use-artifact", action="store_true", help="Pakai rf_model dari artifact store")
+    parser.add_argument("--dataset", help="Latih model dari sampel dataset di data/ (default: data sintetis)")
+    parser.add_argument("--sample-rows", type=int, default=20_000, help="Jumlah baris untuk training model benchmark")
+    parser.add_argument("--n-estimators", type=int, default=100)
+    parser.add_argument("--max-depth", type=int, default=None)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=DEFAULT_BATCH_SIZES)
+    parser.add_argument("--engines", nargs="+", choices=["sklearn", "flat"], default=["sklearn", "flat"])
+    parser.add_argument("--load-repeat", type=int, default=5)
+    parser.add_argument("--out", type=Path, default=Path("benchmarks/results/artifacts.json"))
+    args = parser.parse_args()
+
+    if args.use_artifact:
+        from src.artifacts import artifact_version, load_artifact
+        from src.features import load_encoder
+
+        rf, encoder = load_artifact("rf_model"), load_encoder()
+        source = artifact_version("rf_model")
+    elif args.dataset:
+        from src.data import read_bookings
+        from src.training import fit_model
+
+        frame = read_bookings(args.dataset)
+        frame = frame.sample(n=min(args.sample_rows, len(frame)), random_state=42)
+        rf, encoder, _ = fit_model(frame, n_estimators=args.n_estimators, max_depth=args.max_depth, sample_frac=1.0)
+        source = f"{args.dataset} ({len(frame):,} rows)"
+    else:
+        rf, encoder = synthetic_model(n_rows=args.sample_rows, n_estimators=args.n_estimators, max_depth=args.max_depth)
+        source = f"synthetic ({args.sample_rows:,} rows)"
+
+    print(f"Model: {source}, {len(rf.estimators_)} trees\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        load = bench_load(rf, DEFAULT_CODECS, args.load_repeat, tmp)
+
+    print()
+    rows = synthetic_bookings(max(args.batch_sizes), seed=7).drop(columns=[TARGET])
+    X_all = encoder.transform_frame(rows)
+    latency = bench_latency(rf, X_all, sorted(args.batch_sizes), args.engines)
+
+    report = {
+        "model": {
+            "source": source,
+            "n_estimators": len(rf.estimators_),
+            "n_nodes": int(sum(est.tree_.node_count for est in rf.estimators_)),
+            "n_features": int(rf.n_features_in_),
+        },
+        "environment": _environment(),
+        "load": load,
+        "latency": latency,
+    }
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"\n✅ Laporan disimpan di {args.out}")
+
+
+if __name__ == "__main__":
+    main()
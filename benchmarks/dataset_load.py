@@ -0,0 +1,89 @@
+# Benchmark: load dataset dari CSV vs Feather (mmap) - waktu & RSS
+#
+#   python -m benchmarks.dataset_load                     # data sintetis 500k baris
+#   python -m benchmarks.dataset_load --dataset cleaned_hotel_data4
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks._common import synthetic_bookings
+
+
+def _rss_mb():
+    # RSS saat ini (Linux), dalam MB
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize() / 1e6
+
+
+def measure(fmt, name, data_dir):
+    # Dijalankan di proses baru supaya RSS tiap format tidak saling mempengaruhi
+    import pandas as pd
+
+    from src.data import csv_path, read_bookings
+
+    before = _rss_mb()
+    start = time.perf_counter()
+    if fmt == "csv":
+        df = pd.read_csv(csv_path(name, data_dir))
+    else:
+        df = read_bookings(name, data_dir=data_dir)
+    elapsed = time.perf_counter() - start
+    return {
+        "format": fmt,
+        "rows": len(df),
+        "load_s": elapsed,
+        "rss_delta_mb": _rss_mb() - before,
+        "frame_mb": df.memory_usage(deep=True).sum() / 1e6,
+    }
+
+
+def run_isolated(fmt, name, data_dir):
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.dataset_load", "--measure", fmt, "--dataset", name, "--data-dir", str(data_dir)],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CSV vs Feather load")
+    parser.add_argument("--dataset", help="Nama dataset di data/ (default: data sintetis)")
+    parser.add_argument("--data-dir", type=Path)
+    parser.add_argument("--rows", type=int, default=500_000, help="Jumlah baris data sintetis")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--measure", choices=["csv", "feather"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.dataset, args.data_dir)))
+        return
+
+    from src.data import DATA_DIR, convert_to_columnar, csv_path
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.dataset:
+            name, data_dir = args.dataset, args.data_dir or DATA_DIR
+        else:
+            name, data_dir = "synthetic_bookings", Path(tmp)
+            synthetic_bookings(args.rows).to_csv(csv_path(name, data_dir), index=False)
+        convert_to_columnar(name, data_dir)
+
+        results = {}
+        for fmt in ("csv", "feather"):
+            runs = [run_isolated(fmt, name, data_dir) for _ in range(args.repeat)]
+            best = min(runs, key=lambda r: r["load_s"])
+            results[fmt] = best
+            print(
+                f"{fmt:<8} {best['rows']:>9,} rows | load {best['load_s'] * 1e3:8.1f} ms | "
+                f"RSS +{best['rss_delta_mb']:7.1f} MB | frame {best['frame_mb']:7.1f} MB"
+            )
+        print(f"\nspeedup load: {results['csv']['load_s'] / results['feather']['load_s']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
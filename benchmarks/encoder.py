@@ -0,0 +1,71 @@
+# Micro-benchmark: encode_frame (pd.get_dummies + reindex) vs FeatureEncoder
+#
+#   python -m benchmarks.encoder --rows 100000
+import argparse
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._common import print_row, synthetic_bookings, time_calls
+from src.features import FeatureEncoder, encode_frame
+from src.schema import TARGET
+
+
+def legacy_single_row(input_dict, training_columns):
+    # Persis seperti show_predict_page sebelum FeatureEncoder
+    input_df = pd.DataFrame([input_dict])
+    input_df = pd.get_dummies(input_df)
+    for col in set(training_columns) - set(input_df.columns):
+        input_df[col] = 0
+    return input_df[training_columns]
+
+
+def main():
+    # Path lama memang memicu PerformanceWarning (fragmented frame); cukup diukur, tidak perlu dicetak
+    warnings.simplefilter("ignore", pd.errors.PerformanceWarning)
+
+    parser = argparse.ArgumentParser(description="Benchmark feature encoding")
+    parser.add_argument("--rows", type=int, default=100_000, help="Jumlah baris untuk benchmark batch")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    df = synthetic_bookings(args.rows).drop(columns=[TARGET])
+    encoder = FeatureEncoder.fit(df)
+    training_columns = encoder.feature_names
+
+    # Satu baris dari form (field sama dengan input_dict di halaman Predict)
+    form_fields = [
+        "deposit_type", "market_segment", "required_car_parking_spaces", "country", "customer_type",
+        "previous_cancellations", "lead_time", "adults", "children", "babies", "adr",
+        "total_of_special_requests", "reserved_room_type", "booking_changes", "assigned_room_type",
+    ]
+    input_dict = {k: df[k].iloc[0] for k in form_fields}
+    input_dict = {k: (v.item() if hasattr(v, "item") else v) for k, v in input_dict.items()}
+
+    # Cek hasilnya identik sebelum mengukur
+    expected = legacy_single_row(input_dict, training_columns).to_numpy(np.float32)[0]
+    assert np.array_equal(encoder.transform_record(input_dict), expected), "single-row mismatch"
+    batch = df.head(min(args.rows, 10_000))
+    assert np.array_equal(encoder.transform_frame(batch), encode_frame(batch, training_columns).to_numpy(np.float32)), "batch mismatch"
+
+    print(f"{encoder.n_features} fitur, batch {args.rows:,} baris\n")
+    print("Single row (form Predict)")
+    legacy = time_calls(lambda: legacy_single_row(input_dict, training_columns), repeat=args.repeat)
+    row = np.zeros(encoder.n_features, dtype=np.float32)
+    fast = time_calls(lambda: encoder.transform_record(input_dict, out=row), repeat=args.repeat)
+    print_row("  get_dummies + set diff + reindex", legacy)
+    print_row("  FeatureEncoder.transform_record", fast)
+    print(f"  speedup: {legacy['mean_ms'] / fast['mean_ms']:.0f}x\n")
+
+    print(f"Batch ({args.rows:,} baris)")
+    repeat = max(3, args.repeat // 50)
+    legacy = time_calls(lambda: encode_frame(df, training_columns).to_numpy(np.float32), repeat=repeat, warmup=1)
+    fast = time_calls(lambda: encoder.transform_frame(df), repeat=repeat, warmup=1)
+    print_row("  encode_frame", legacy)
+    print_row("  FeatureEncoder.transform_frame", fast)
+    print(f"  speedup: {legacy['mean_ms'] / fast['mean_ms']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# Benchmark encoding training: one-hot dense (get_dummies lama) vs top-K bucketing (CSR / ordinal)
+#
+#   python -m benchmarks.encoding --rows 200000 --countries 300
+#   python -m benchmarks.encoding --dataset cleaned_hotel_data4 --encoding onehot sparse_topk
+#
+# Tiap encoding dijalankan di proses baru supaya peak RSS tidak tercampur dengan encoding lain.
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import roc_auc_score
+
+from benchmarks._common import synthetic_bookings
+from src.features import ENCODERS, TOP_K, fit_encoder
+from src.schema import TARGET
+
+
+def matrix_mb(X):
+    if hasattr(X, "indptr"):
+        return (X.data.nbytes + X.indices.nbytes + X.indptr.nbytes) / 1e6
+    return X.nbytes / 1e6
+
+
+def run_encoding(encoding, args):
+    from src.training import peak_rss_mb, split_holdout
+
+    if args.dataset:
+        from src.data import read_bookings
+
+        frame = read_bookings(args.dataset)
+    else:
+        frame = synthetic_bookings(args.rows, n_countries=args.countries)
+    train, test = split_holdout(frame, random_state=args.seed)
+    X = train.drop(columns=[TARGET])
+
+    start = time.perf_counter()
+    encoder = fit_encoder(X, encoding, top_k=args.top_k)
+    X_train = encoder.transform_training(X)
+    encode_s = time.perf_counter() - start
+
+    rf = RandomForestClassifier(n_estimators=args.n_estimators, max_depth=args.max_depth,
+                                random_state=args.seed, n_jobs=args.n_jobs)
+    start = time.perf_counter()
+    rf.fit(X_train, train[TARGET].to_numpy())
+    fit_s = time.perf_counter() - start
+
+    proba = rf.predict_proba(encoder.transform_frame(test.drop(columns=[TARGET])))[:, 1]
+    return {
+        "encoding": encoding,
+        "n_features": encoder.n_features,
+        "matrix_mb": matrix_mb(X_train),
+        "encode_s": encode_s,
+        "fit_s": fit_s,
+        "peak_rss_mb": peak_rss_mb(),
+        "auc": roc_auc_score(test[TARGET].to_numpy(), proba),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark encoding training (fit time, peak RSS, AUC)")
+    parser.add_argument("--rows", type=int, default=200_000, help="Jumlah baris data sintetis")
+    parser.add_argument("--countries", type=int, default=300, help="Kardinalitas country di data sintetis")
+    parser.add_argument("--dataset", default=None, help="Pakai dataset asli (src/data.py) alih-alih data sintetis")
+    parser.add_argument("--encoding", nargs="+", choices=list(ENCODERS), default=list(ENCODERS))
+    parser.add_argument("--top-k", type=int, default=TOP_K)
+    parser.add_argument("--n-estimators", type=int, default=50)
+    parser.add_argument("--max-depth", type=int, default=20)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    source = args.dataset or f"sintetis {args.rows:,} baris, {args.countries} country"
+    print(f"{source}, {args.n_estimators} tree, max_depth={args.max_depth}, top-K={args.top_k}\n")
+    print(f"{'encoding':<14}{'fitur':>7}{'matrix MB':>11}{'encode s':>10}{'fit s':>8}{'peak RSS MB':>13}{'AUC':>8}")
+    for encoding in args.encoding:
+        with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as pool:
+            r = pool.submit(run_encoding, encoding, args).result()
+        print(f"{r['encoding']:<14}{r['n_features']:>7}{r['matrix_mb']:>11.1f}{r['encode_s']:>10.2f}"
+              f"{r['fit_s']:>8.2f}{r['peak_rss_mb']:>13.0f}{r['auc']:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
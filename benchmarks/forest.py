@@ -0,0 +1,55 @@
+# Benchmark: RandomForestClassifier (sklearn) vs FlatForest, single row & batch
+#
+#   python -m benchmarks.forest                   # model sintetis (100 tree)
+#   python -m benchmarks.forest --use-artifact    # model dari artifact store models/
+import argparse
+
+import numpy as np
+
+from benchmarks._common import print_row, synthetic_bookings, synthetic_model, time_calls
+from src.forest import FlatForest
+from src.schema import TARGET
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inference RandomForest vs FlatForest")
+    parser.add_argument("--use-artifact", action="store_true", help="Pakai rf_model dari artifact store")
+    parser.add_argument("--n-estimators", type=int, default=100)
+    parser.add_argument("--max-depth", type=int, default=None)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.use_artifact:
+        from src.artifacts import load_artifact
+        from src.features import load_encoder
+
+        rf, encoder = load_artifact("rf_model"), load_encoder()
+    else:
+        rf, encoder = synthetic_model(n_estimators=args.n_estimators, max_depth=args.max_depth)
+
+    forest = FlatForest.from_sklearn(rf)
+    X_all = encoder.transform_frame(synthetic_bookings(max(args.batch_sizes), seed=7).drop(columns=[TARGET]))
+
+    # Bandingkan dengan sklearn single-thread (urutan penjumlahan tree sama)
+    rf.set_params(n_jobs=1)
+    check = X_all[:2_000]
+    assert np.array_equal(forest.predict_proba(check), rf.predict_proba(check)), "probabilitas tidak identik"
+    assert np.array_equal(forest.predict(check), rf.predict(check)), "label tidak identik"
+    print(f"{forest.n_trees} trees, {forest.n_nodes:,} nodes - probabilitas identik dengan sklearn\n")
+
+    for n_jobs in (1, -1):
+        rf.set_params(n_jobs=n_jobs)
+        for size in args.batch_sizes:
+            X = X_all[:size]
+            repeat = max(3, args.repeat if size <= 100 else args.repeat // 10)
+            # Cara lama di halaman Predict: predict + predict_proba (dua kali traversal)
+            sk = time_calls(lambda: (rf.predict(X), rf.predict_proba(X)), repeat=repeat, warmup=1)
+            flat = time_calls(lambda: forest.predict_with_proba(X), repeat=repeat, warmup=1)
+            print_row(f"sklearn n_jobs={n_jobs:<2} batch={size:<6}", sk)
+            print_row(f"FlatForest          batch={size:<6}", flat)
+            print(f"{'':<40} speedup {sk['mean_ms'] / flat['mean_ms']:.1f}x\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# Load generator untuk serve.py: throughput & tail latency, micro-batching on vs off
+#
+#   python -m benchmarks.server_load                          # model sintetis, server dijalankan otomatis
+#   python -m benchmarks.server_load --use-artifact --concurrency 128
+#   python -m benchmarks.server_load --url 127.0.0.1:8000     # server yang sudah jalan
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks._common import synthetic_bookings, synthetic_model
+from src.schema import FORM_FIELDS
+
+
+def make_bodies(n, seed=7):
+    frame = synthetic_bookings(n, seed=seed)[FORM_FIELDS]
+    return [json.dumps(record).encode() for record in frame.to_dict(orient="records")]
+
+
+async def _request(reader, writer, host, body):
+    writer.write(
+        f"POST /predict HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    status = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    await reader.readexactly(length)
+    if b" 200 " not in status:
+        raise RuntimeError(f"Server membalas {status.decode().strip()}")
+
+
+async def _client(host, port, bodies, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in bodies:
+            t0 = time.perf_counter()
+            await _request(reader, writer, host, body)
+            latencies.append(time.perf_counter() - t0)
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, bodies, concurrency):
+    # Tiap client punya koneksi keep-alive sendiri
+    latencies = []
+    per_client = [bodies[i::concurrency] for i in range(concurrency)]
+    start = time.perf_counter()
+    await asyncio.gather(*[_client(host, port, b, latencies) for b in per_client if b])
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    def pct(q):
+        return latencies[min(int(len(latencies) * q), len(latencies) - 1)] * 1e3
+
+    return {
+        "requests": len(latencies),
+        "elapsed_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed,
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "max_ms": latencies[-1] * 1e3,
+    }
+
+
+async def fetch_health(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET /health HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    return json.loads(raw.split(b"\r\n\r\n", 1)[1])
+
+
+def wait_until_ready(host, port, proc, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("Server berhenti sebelum siap.")
+        try:
+            return asyncio.run(fetch_health(host, port))
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError("Server tidak siap.")
+
+
+def print_result(label, r):
+    print(f"{label:<26} {r['throughput_rps']:9,.0f} req/s | p50 {r['p50_ms']:7.2f} ms | "
+          f"p95 {r['p95_ms']:7.2f} ms | p99 {r['p99_ms']:7.2f} ms | max {r['max_ms']:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test scoring server (batching on vs off)")
+    parser.add_argument("--url", help="host:port server yang sudah jalan (tanpa perbandingan on/off)")
+    parser.add_argument("--use-artifact", action="store_true", help="Jalankan server dengan model dari models/")
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--out", type=Path, help="Simpan hasil sebagai JSON")
+    args = parser.parse_args()
+
+    bodies = make_bodies(args.requests)
+    results = {}
+
+    if args.url:
+        host, port = args.url.rsplit(":", 1)
+        results["server"] = asyncio.run(run_load(host, int(port), bodies, args.concurrency))
+        print_result("server", results["server"])
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            models_dir = None
+            if not args.use_artifact:
+                from src.artifacts import publish_object
+
+                rf, encoder = synthetic_model()
+                models_dir = tmp
+                publish_object("training_columns", encoder.feature_names, models_dir=tmp)
+                publish_object("feature_encoder", encoder, models_dir=tmp)
+                publish_object("rf_model", rf, models_dir=tmp)
+
+            modes = {
+                "batching off": (1, 0.0),
+                f"batching on ({args.max_batch}, {args.max_wait_ms:g} ms)": (args.max_batch, args.max_wait_ms),
+            }
+            for label, (max_batch, max_wait) in modes.items():
+                cmd = [sys.executable, "serve.py", "--port", str(args.port),
+                       "--max-batch", str(max_batch), "--max-wait-ms", str(max_wait)]
+                if models_dir:
+                    cmd += ["--models-dir", models_dir]
+                proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL)
+                try:
+                    wait_until_ready("127.0.0.1", args.port, proc)
+                    asyncio.run(run_load("127.0.0.1", args.port, bodies[:200], args.concurrency))  # warm-up
+                    result = asyncio.run(run_load("127.0.0.1", args.port, bodies, args.concurrency))
+                    result["batching"] = asyncio.run(fetch_health("127.0.0.1", args.port))["batching"]
+                finally:
+                    proc.terminate()
+                    proc.wait()
+                results[label] = result
+                print_result(label, result)
+                print(f"{'':<26} rata-rata {result['batching']['avg_batch_rows']:.1f} baris per predict_proba")
+
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\n✅ Hasil disimpan di {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# Benchmark: memory model per worker - pickle biasa vs FlatForest di-mmap (rf_flat)
+#
+#   python -m benchmarks.shared_memory                       # model sintetis, 1/4/16 worker
+#   python -m benchmarks.shared_memory --use-artifact --workers 1 4 16
+#
+# RSS menghitung page bersama penuh di tiap proses; PSS membaginya dengan jumlah proses
+# yang memakai page itu, jadi total PSS (dikurangi baseline tanpa model) = memory fisik model.
+import argparse
+import json
+import multiprocessing as mp
+import resource
+import tempfile
+from pathlib import Path
+
+from benchmarks._common import synthetic_bookings, synthetic_model
+from src.schema import TARGET
+
+
+def _memory_mb():
+    # RSS & PSS proses ini (Linux, /proc/self/smaps_rollup)
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss"):
+                values[key.lower()] = int(rest.split()[0]) / 1024
+    return values
+
+
+def _worker(mode, models_dir, X, ready, done, results):
+    from src.forest import FlatForest, load_forest
+
+    base = _memory_mb()
+    forest = None
+    if mode == "pickle":
+        # Cara lama: tiap proses unpickle model sklearn sendiri lalu membangun FlatForest
+        from src.artifacts import load_artifact
+
+        forest = FlatForest.from_sklearn(load_artifact("rf_model", models_dir=models_dir))
+    elif mode == "mmap":
+        forest = load_forest(models_dir)   # rf_flat, di-mmap
+    if forest is not None:
+        forest.predict_proba(X)           # sentuh page model seperti request sungguhan
+    ready.wait()                          # ukur saat semua worker hidup bersamaan
+    mem = _memory_mb()
+    results.put({"rss_delta_mb": mem["rss"] - base["rss"], "pss_mb": mem["pss"],
+                 "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024})
+    done.wait()
+
+
+def measure(mode, n_workers, models_dir, X):
+    ctx = mp.get_context("spawn")
+    ready, done = ctx.Barrier(n_workers + 1), ctx.Barrier(n_workers + 1)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(mode, models_dir, X, ready, done, results)) for _ in range(n_workers)]
+    for p in procs:
+        p.start()
+    ready.wait()
+    rows = [results.get() for _ in procs]
+    done.wait()
+    for p in procs:
+        p.join()
+    return {
+        "mode": mode,
+        "workers": n_workers,
+        "model_rss_mb_per_worker": sum(r["rss_delta_mb"] for r in rows) / n_workers,
+        "pss_mb_total": sum(r["pss_mb"] for r in rows),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RSS/PSS model: pickle per proses vs mmap bersama")
+    parser.add_argument("--use-artifact", action="store_true", help="Pakai rf_model dari artifact store")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--n-estimators", type=int, default=100)
+    parser.add_argument("--out", type=Path, help="Simpan hasil sebagai JSON")
+    args = parser.parse_args()
+
+    from src.artifacts import publish_object
+    from src.forest import publish_flat_forest
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.use_artifact:
+            from src.features import load_encoder
+
+            models_dir, encoder = None, load_encoder()
+        else:
+            rf, encoder = synthetic_model(n_estimators=args.n_estimators)
+            models_dir = tmp
+            publish_object("training_columns", encoder.feature_names, models_dir=tmp)
+            publish_object("rf_model", rf, models_dir=tmp)
+        publish_flat_forest(models_dir)
+        X = encoder.transform_frame(synthetic_bookings(100, seed=7).drop(columns=[TARGET]))
+
+        results = []
+        for n in args.workers:
+            # Baseline: worker yang sama tanpa model, untuk mengurangi library bersama dari total PSS
+            baseline = measure("none", n, models_dir, X)["pss_mb_total"]
+            for mode in ("pickle", "mmap"):
+                r = measure(mode, n, models_dir, X)
+                r["model_pss_mb_total"] = r["pss_mb_total"] - baseline
+                results.append(r)
+                print(f"{mode:<7} {n:>3} worker | model RSS/worker {r['model_rss_mb_per_worker']:8.1f} MB | "
+                      f"model PSS total {r['model_pss_mb_total']:8.1f} MB")
+
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\n✅ Hasil disimpan di {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# compact_model.py
+# Export model aktif ke format array compact (src/compact.py) + laporan ukuran & AUC.
+#
+#   python compact_model.py                                  # 8-bit leaf, tanpa pruning
+#   python compact_model.py --bits 16 --prune-tol 0.01 --publish
+#
+# Setelah dipublish, serving bisa memakai model compact saja (tanpa memuat model sklearn):
+#   python serve.py --compact
+#   python score_bookings.py in.csv out.csv --compact
+import argparse
+import io
+import pickle
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.metrics import roc_auc_score
+
+from src.artifacts import MODELS_DIR, artifact_version, load_artifact, publish
+from src.compact import CompactForest
+from src.data import DEFAULT_DATASET, read_bookings
+from src.features import load_encoder
+from src.schema import TARGET
+from src.scoring import predict_proba
+
+
+def dumped_mb(obj, compress=0):
+    buf = io.BytesIO()
+    joblib.dump(obj, buf, compress=compress, protocol=pickle.HIGHEST_PROTOCOL)
+    return buf.tell() / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export RandomForest ke format compact (float32/int16/leaf terkuantisasi)")
+    parser.add_argument("--bits", type=int, choices=[8, 16], default=8, help="Bit per probabilitas leaf")
+    parser.add_argument("--prune-tol", type=float, default=None,
+                        help="Gabungkan dua leaf bersaudara kalau selisih probabilitasnya <= nilai ini")
+    parser.add_argument("--dataset", default=DEFAULT_DATASET, help="Dataset untuk evaluasi AUC")
+    parser.add_argument("--eval-rows", type=int, default=50_000)
+    parser.add_argument("--models-dir", help="Folder artifact store (default: models/)")
+    parser.add_argument("--out", type=Path, help="File output (default: rf_compact.pkl di --models-dir)")
+    parser.add_argument("--publish", action="store_true", help="Publish sebagai artifact 'rf_compact'")
+    args = parser.parse_args()
+    out = args.out or Path(args.models_dir or MODELS_DIR) / "rf_compact.pkl"
+
+    rf = load_artifact("rf_model", models_dir=args.models_dir)
+    encoder = load_encoder(args.models_dir)
+    compact = CompactForest.from_sklearn(rf, bits=args.bits, prune_tol=args.prune_tol)
+
+    frame = read_bookings(args.dataset)
+    frame = frame.sample(n=min(args.eval_rows, len(frame)), random_state=42)
+    X = encoder.transform_frame(frame.drop(columns=[TARGET]))
+    y = frame[TARGET].to_numpy()
+
+    p_orig = predict_proba(rf, X)[:, 1]
+    p_compact = compact.predict_proba(X)[:, 1]
+    auc_orig, auc_compact = roc_auc_score(y, p_orig), roc_auc_score(y, p_compact)
+    n_nodes = sum(est.tree_.node_count for est in rf.estimators_)
+
+    print(f"Nodes           : {n_nodes:,} -> {compact.n_nodes:,}")
+    print(f"Pickle sklearn  : {dumped_mb(rf):8.2f} MB (compress=3: {dumped_mb(rf, 3):.2f} MB)")
+    print(f"Compact         : {dumped_mb(compact):8.2f} MB (compress=3: {dumped_mb(compact, 3):.2f} MB), "
+          f"array in-memory {compact.nbytes() / 1e6:.2f} MB")
+    print(f"AUC             : {auc_orig:.5f} -> {auc_compact:.5f} ({auc_compact - auc_orig:+.5f})")
+    print(f"Max |Δ proba|   : {np.abs(p_orig - p_compact).max():.4f}")
+    print(f"Label sama      : {np.mean(rf.classes_.take((p_orig > 0.5).astype(int)) == compact.predict(X)):.4%}")
+
+    # Tanpa kompresi supaya array bisa di-mmap saat load
+    out.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(compact, out, compress=0)
+    print(f"✅ Disimpan di {out}")
+    if args.publish:
+        # Dipasangkan ke versi rf_model sumbernya (dicek load_compact_forest)
+        publish("rf_compact", out, models_dir=args.models_dir,
+                source=artifact_version("rf_model", args.models_dir))
+        print("✅ Dipublish sebagai 'rf_compact'")
+
+
+if __name__ == "__main__":
+    main()
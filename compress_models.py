@@ -1,17 +1,69 @@
-import joblib
+# compress_models.py
+# Compress ulang artifact di store (models/) dan publish hasilnya sebagai versi baru.
+# Pilih codec/level berdasarkan laporan `python -m benchmarks.artifacts`
+# (ukuran file vs waktu joblib.load saat app start).
+#
+#   python compress_models.py --codec zlib --level 3
+#   python compress_models.py --codec lz4 rf_model training_columns
+#
+# File versi lama tidak ditimpa (checksum di manifest.json tetap cocok). rf_flat & rf_compact
+# tidak dikompres: keduanya harus tanpa kompresi supaya bisa di-mmap.
+import argparse
+import tempfile
 from pathlib import Path
 
-# Folder models
-models_path = Path("models")
-
-# Compress semua .pkl di folder models dan overwrite
-for pkl_file in models_path.glob("*.pkl"):
-    print(f"Compressing {pkl_file.name}...")
-    
-    # Load model / object
-    obj = joblib.load(pkl_file)
-    
-    # Simpan lagi dengan compress level 3, overwrite
-    joblib.dump(obj, pkl_file, compress=3)
-    
-    print(f"{pkl_file.name} compressed and overwritten successfully!")
+import joblib
+
+from src.artifacts import MODELS_DIR, artifact_version, current_entry, load_artifact, publish, read_manifest
+from src.forest import publish_flat_forest
+
+MMAP_ARTIFACTS = {"rf_flat", "rf_compact"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compress ulang artifact di store sebagai versi baru")
+    parser.add_argument("--models-dir", type=Path, default=MODELS_DIR)
+    parser.add_argument("--codec", default="zlib", help="zlib, gzip, bz2, lzma, xz, lz4, atau none")
+    parser.add_argument("--level", type=int, default=3)
+    parser.add_argument("names", nargs="*", help="Nama artifact (default: semua kecuali rf_flat/rf_compact)")
+    args = parser.parse_args()
+
+    compress = 0 if args.codec == "none" else (args.codec, args.level)
+    names = args.names or [name for name in read_manifest(args.models_dir) if name not in MMAP_ARTIFACTS]
+    skipped = sorted(MMAP_ARTIFACTS & set(names))
+    if skipped:
+        print(f"⚠️ {', '.join(skipped)} dilewati (harus tanpa kompresi untuk mmap)")
+    # rf_model dulu: artifact turunan dipasangkan ulang ke versi barunya
+    names = sorted((n for n in names if n not in MMAP_ARTIFACTS), key=lambda n: n != "rf_model")
+
+    old_model = artifact_version("rf_model", args.models_dir) if "rf_model" in read_manifest(args.models_dir) else None
+    new_model = old_model
+    with tempfile.TemporaryDirectory(dir=args.models_dir) as tmp:
+        for name in names:
+            entry = current_entry(name, args.models_dir)
+            source = entry.get("source")
+            if old_model is not None and source == old_model:
+                source = new_model
+            path = Path(tmp) / Path(entry["file"]).name
+            joblib.dump(load_artifact(name, models_dir=args.models_dir), path, compress=compress)
+            record = publish(name, path, models_dir=args.models_dir, source=source)
+            print(f"✅ {name} v{record['version']}: {entry['size']:,} -> {record['size']:,} bytes")
+            if name == "rf_model":
+                new_model = artifact_version("rf_model", args.models_dir)
+
+        if new_model != old_model:
+            # rf_flat menyimpan versi rf_model di dalam file-nya: dibangun ulang
+            if "rf_flat" in read_manifest(args.models_dir):
+                record = publish_flat_forest(models_dir=args.models_dir)
+                print(f"✅ rf_flat v{record['version']} (dibangun ulang untuk {new_model})")
+            # Artifact turunan lain yang tidak ikut dikompres: dipasangkan ke versi rf_model baru
+            for name in read_manifest(args.models_dir):
+                entry = current_entry(name, args.models_dir)
+                if name != "rf_flat" and entry.get("source") == old_model:
+                    record = publish(name, args.models_dir / entry["file"], models_dir=args.models_dir,
+                                     source=new_model)
+                    print(f"✅ {name} v{record['version']} (dipasangkan ke {new_model})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+# convert_dataset.py
+# Konversi sekali dataset CSV -> Feather (tipe compact dari src/schema.py, bisa di-mmap).
+#
+#   python convert_dataset.py                                  # cleaned_hotel_data4
+#   python convert_dataset.py cleaned_hotel_data cleaned_hotel_data4
+import argparse
+
+from src.data import DEFAULT_DATASET, convert_to_columnar, csv_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Konversi dataset CSV di folder data/ ke Feather")
+    parser.add_argument("names", nargs="*", default=[DEFAULT_DATASET], help="Nama dataset (tanpa .csv)")
+    parser.add_argument("--report", action="store_true", help="Tampilkan penghematan memory per kolom")
+    args = parser.parse_args()
+
+    for name in args.names:
+        out, report = convert_to_columnar(name)
+        before = csv_path(name).stat().st_size / 1e6
+        after = out.stat().st_size / 1e6
+        print(f"✅ {name}.csv ({before:.1f} MB) -> {out.name} ({after:.1f} MB)")
+        if args.report:
+            print(report.to_string(float_format=lambda x: f"{x:.2f}"))
+        else:
+            total = report.loc["TOTAL"]
+            print(f"   memory: {total['before_mb']:.1f} MB -> {total['after_mb']:.1f} MB ({total['saving']:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,56 +2,18 @@
 import os
 import pickle
 
+from src.artifacts import ArtifactError, load_artifact, publish
+from src.features import FeatureEncoder
+from src.schema import CATEGORICAL_COLS, TRAINING_COLUMNS
+
 # --- Pastikan folder models ada ---
 os.makedirs("models", exist_ok=True)
 
 # --- Semua kolom fitur pipeline ---
-training_columns = [
-    "hotel",
-    "lead_time",
-    "arrival_date_year",
-    "arrival_date_month",
-    "arrival_date_week_number",
-    "arrival_date_day_of_month",
-    "stays_in_weekend_nights",
-    "stays_in_week_nights",
-    "adults",
-    "children",
-    "babies",
-    "meal",
-    "country",
-    "market_segment",
-    "distribution_channel",
-    "is_repeated_guest",
-    "previous_cancellations",
-    "previous_bookings_not_canceled",
-    "reserved_room_type",
-    "assigned_room_type",
-    "booking_changes",
-    "deposit_type",
-    "days_in_waiting_list",
-    "customer_type",
-    "adr",
-    "required_car_parking_spaces",
-    "total_of_special_requests",
-    "has_agent"
-]
+training_columns = list(TRAINING_COLUMNS)
 
 # --- Kolom kategorikal saja ---
-categorical_cols = [
-    "hotel",
-    "arrival_date_month",
-    "meal",
-    "country",
-    "market_segment",
-    "distribution_channel",
-    "reserved_room_type",
-    "assigned_room_type",
-    "deposit_type",
-    "customer_type",
-    "required_car_parking_spaces",
-    "has_agent"
-]
+categorical_cols = list(CATEGORICAL_COLS)
 
 # --- Simpan pickle ---
 with open("models/training_columns.pkl", "wb") as f:
@@ -61,3 +23,16 @@ with open("models/categorical_cols.pkl", "wb") as f:
     pickle.dump(categorical_cols, f)
 
 print("✅ training_columns.pkl & categorical_cols.pkl berhasil dibuat di folder models/")
+
+# --- Feature encoder untuk model yang sedang dipakai ---
+# Dibangun dari kolom one-hot model (artifact "training_columns") + categorical_cols
+try:
+    model_columns = load_artifact("training_columns")
+except ArtifactError as e:
+    print(f"⚠️ feature_encoder.pkl dilewati: {e}")
+else:
+    encoder = FeatureEncoder(model_columns, categorical_cols)
+    with open("models/feature_encoder.pkl", "wb") as f:
+        pickle.dump(encoder, f)
+    publish("feature_encoder", "models/feature_encoder.pkl")
+    print(f"✅ feature_encoder.pkl berhasil dibuat ({encoder.n_features} fitur)")
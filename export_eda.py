@@ -0,0 +1,39 @@
+# export_eda.py
+# Export halaman EDA sebagai snapshot HTML statis (chart dari figure cache, src/figcache.py).
+#
+#   python export_eda.py                                        # snapshots/eda.html, semua booking
+#   python export_eda.py --out snapshots/eda_city_2017.html --filter hotel="City Hotel" --filter arrival_date_year=2017
+import argparse
+from pathlib import Path
+
+from src.filters import FILTER_COLUMNS
+
+
+def filter_arg(value):
+    col, sep, item = value.partition("=")
+    if not sep or col not in FILTER_COLUMNS:
+        raise argparse.ArgumentTypeError(f"Format: kolom=nilai, kolom salah satu dari {', '.join(FILTER_COLUMNS)}")
+    return col, item
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export halaman EDA ke satu file HTML statis")
+    parser.add_argument("--out", type=Path, default=Path("snapshots/eda.html"))
+    parser.add_argument("--filter", type=filter_arg, action="append", default=[],
+                        help="Filter EDA (boleh diulang; nilai dalam kolom yang sama digabung OR)")
+    args = parser.parse_args()
+
+    from src.eda import export_snapshot
+    from src.figcache import figure_cache
+
+    filters = {}
+    for col, value in args.filter:
+        filters.setdefault(col, []).append(value)
+    path = export_snapshot(args.out, filters=filters)
+    stats = figure_cache.stats()
+    print(f"✅ Snapshot EDA disimpan di {path} ({path.stat().st_size / 1e6:.1f} MB, "
+          f"figure cache {stats['hits']} hit / {stats['misses']} miss)")
+
+
+if __name__ == "__main__":
+    main()
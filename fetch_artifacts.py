@@ -0,0 +1,52 @@
+# fetch_artifacts.py
+# Populate artifact store lokal (models/) dari Google Drive atau dari folder lokal.
+#
+#   python fetch_artifacts.py                      # download dari URL di src/artifacts.py
+#   python fetch_artifacts.py --from-dir backup/   # copy dari folder lokal (tanpa network)
+import argparse
+import tempfile
+from pathlib import Path
+
+from src.artifacts import ARTIFACTS, MODELS_DIR, publish
+from src.forest import publish_flat_forest
+
+
+def download(url, dest):
+    import requests
+
+    with requests.get(url, stream=True, timeout=60) as r:
+        r.raise_for_status()  # cek kalau ada error
+        with open(dest, "wb") as f:
+            for block in r.iter_content(chunk_size=1 << 20):
+                f.write(block)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Populate artifact store di folder models/")
+    parser.add_argument("--from-dir", type=Path, help="Folder lokal berisi file artifact (nama file sesuai ARTIFACTS)")
+    parser.add_argument("--models-dir", type=Path, default=MODELS_DIR)
+    parser.add_argument("names", nargs="*", help="Nama artifact (default: semua)")
+    args = parser.parse_args()
+
+    names = args.names or list(ARTIFACTS)
+    for name in names:
+        spec = ARTIFACTS[name]
+        if args.from_dir:
+            src = args.from_dir / spec["filename"]
+            record = publish(name, src, models_dir=args.models_dir, source=str(src))
+        else:
+            with tempfile.TemporaryDirectory() as tmp:
+                src = Path(tmp) / spec["filename"]
+                print(f"Downloading {name}...")
+                download(spec["url"], src)
+                record = publish(name, src, models_dir=args.models_dir, source=spec["url"])
+        print(f"✅ {name} v{record['version']} ({record['size']} bytes, sha256 {record['sha256'][:12]})")
+
+    if "rf_model" in names:
+        # Versi mmap-able untuk dibagi antar worker (FlatForest tanpa kompresi)
+        record = publish_flat_forest(models_dir=args.models_dir)
+        print(f"✅ rf_flat v{record['version']} ({record['size']} bytes, mmap)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+# ingest.py
+# Export booking mentah (format hotel_bookings.csv) -> dataset bersih terpartisi per
+# arrival_date_year/arrival_date_month di data/<nama>/ (src/ingest.py).
+#
+#   python ingest.py data/raw/hotel_bookings.csv                     # data/cleaned_hotel_data4/
+#   python ingest.py data/raw/hotel_bookings.csv --name cleaned_hotel_data --chunksize 50000
+#   python ingest.py data/raw/hotel_bookings.csv --rebuild           # proses ulang semua partisi
+#
+# Dijalankan ulang dengan export yang lebih baru: hanya partisi baru (atau yang jumlah baris
+# mentahnya berubah) yang dibersihkan & ditulis ulang.
+import argparse
+from pathlib import Path
+
+from src.data import DEFAULT_DATASET
+from src.ingest import ingest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest export booking mentah ke dataset terpartisi (tahun/bulan)")
+    parser.add_argument("raw", type=Path, help="CSV export mentah")
+    parser.add_argument("--name", default=DEFAULT_DATASET, help="Nama dataset di folder data/")
+    parser.add_argument("--data-dir", help="Folder data (default: data/ atau HOTEL_DATA_DIR)")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Baris per chunk saat membaca export")
+    parser.add_argument("--rebuild", action="store_true", help="Abaikan manifest lama, proses semua partisi")
+    parser.add_argument("--show", action="store_true", help="Tampilkan ringkasan per partisi")
+    args = parser.parse_args()
+
+    manifest = ingest(args.raw, args.name, data_dir=args.data_dir, chunksize=args.chunksize, rebuild=args.rebuild)
+    if args.show:
+        for key, part in manifest["partitions"].items():
+            rate = "-" if part["cancel_rate"] is None else f"{part['cancel_rate']:.1%}"
+            adr = "-" if part["adr_mean"] is None else f"{part['adr_mean']:.1f}"
+            print(f"  {key}  {part['rows']:>8,} baris  cancel {rate:>6}  ADR rata-rata {adr:>7}  (v{part['written_in']})")
+
+
+if __name__ == "__main__":
+    main()
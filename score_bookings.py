@@ -0,0 +1,50 @@
+# score_bookings.py
+# Batch scoring file CSV booking dengan model cancellation.
+#
+#   python score_bookings.py data/bookings.csv scores.csv --chunksize 100000 --workers 8
+#   python score_bookings.py data/bookings.csv scores.csv --drift-report drift.json
+#   python score_bookings.py data/bookings.csv scores.csv --compact      # rf_compact, tanpa model sklearn
+import argparse
+import json
+import os
+
+from src.scoring import score_csv
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score bookings CSV (per chunk, paralel) dengan model cancellation")
+    parser.add_argument("input", help="CSV booking (kolom sama dengan dataset training)")
+    parser.add_argument("output", help="CSV output: cancel_probability + prediction")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Jumlah baris per chunk")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Jumlah worker process")
+    parser.add_argument("--id-column", help="Kolom ID yang ikut ditulis ke output")
+    parser.add_argument("--models-dir", help="Folder artifact store (default: models/)")
+    parser.add_argument("--drift-report", help="Tulis skor drift (PSI/KS vs data training) ke file JSON ini")
+    parser.add_argument("--compact", action="store_true",
+                        help="Score dengan rf_compact (compact_model.py --publish), tanpa memuat model sklearn")
+    args = parser.parse_args()
+
+    rows, elapsed = score_csv(
+        args.input,
+        args.output,
+        chunksize=args.chunksize,
+        workers=args.workers,
+        id_column=args.id_column,
+        models_dir=args.models_dir,
+        drift_report=args.drift_report,
+        compact=args.compact,
+    )
+    rate = rows / elapsed if elapsed else 0.0
+    print(f"✅ {rows:,} rows scored in {elapsed:.1f}s ({rate:,.0f} rows/sec) -> {args.output}")
+    if args.drift_report and os.path.exists(args.drift_report):
+        with open(args.drift_report, encoding="utf-8") as f:
+            report = json.load(f)
+        if report.get("status") == "no_reference":
+            print(f"   drift: {report['detail']} ({report['model_version']})")
+        for col, entry in report["features"].items():
+            psi = "-" if entry["psi"] is None else f"{entry['psi']:.3f}"
+            print(f"   drift {col:<16} PSI {psi:>6}  {entry['status']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+# serve.py
+# Scoring server HTTP lokal untuk booking engine (model & training_columns dari artifact store).
+#
+#   python serve.py --port 8000 --max-batch 64 --max-wait-ms 2
+#   curl -X POST localhost:8000/predict -d '{"deposit_type": "No Deposit", "lead_time": 30, "adr": 100}'
+#
+# Body: satu booking (field sama dengan form Predict), list booking, atau {"bookings": [...]}.
+# --max-batch 1 mematikan micro-batching.
+import argparse
+import asyncio
+
+from src.server import Model, ScoringServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scoring server HTTP dengan micro-batching")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch", type=int, default=64, help="Maksimal baris per predict_proba")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="Waktu tunggu untuk mengumpulkan batch")
+    parser.add_argument("--models-dir", help="Folder artifact store (default: models/)")
+    parser.add_argument("--compact", action="store_true",
+                        help="Score dengan rf_compact saja (compact_model.py --publish), tanpa memuat model sklearn")
+    args = parser.parse_args()
+
+    server = ScoringServer(Model(args.models_dir, compact=args.compact), max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data import DEFAULT_DATASET, DATA_DIR, dataset_version, read_bookings
+from src.filters import filtered_rows, normalize_filters
+
+# -----------------------------
+# Aggregate cube untuk bagian "Insightful Questions" di EDA
+# -----------------------------
+# Per dimensi disimpan jumlah & total (bukan rata-rata), supaya booking baru
+# cukup ditambahkan (incremental) tanpa scan ulang seluruh tabel.
+DIMENSIONS = ["hotel", "market_segment", "deposit_type", "month_year"]
+MEASURES = ["rows", "canceled_n", "canceled_sum", "adr_n", "adr_sum", "requests_n"]
+
+
+def month_year_key(frame):
+    # "2016-July" -> "2016-07" (urut secara string = urut waktu).
+    # Parsing hanya untuk kombinasi unik (puluhan), lalu di-map balik ke semua baris.
+    raw = frame["arrival_date_year"].astype(str) + "-" + frame["arrival_date_month"].astype(str)
+    codes, uniques = pd.factorize(raw)
+    try:
+        parsed = pd.to_datetime(pd.Series(uniques), format="%Y-%B")
+    except ValueError:
+        parsed = pd.to_datetime(pd.Series(uniques), format="mixed")
+    labels = parsed.dt.strftime("%Y-%m").to_numpy()
+    return pd.Series(labels[codes], index=frame.index)
+
+
+def _fingerprint(frame, rows):
+    # Sidik jari baris pertama & terakhir prefix, untuk cek dataset hanya di-append
+    if rows == 0:
+        return ""
+    sample = frame.iloc[[0, rows - 1]].astype(str)
+    return str(int(pd.util.hash_pandas_object(sample, index=False).sum()))
+
+
+class AggregateCube:
+    def __init__(self, tables=None, rows=0, version=None, fingerprint=""):
+        # tables[dim][value] = [rows, canceled_n, canceled_sum, adr_n, adr_sum, requests_n]
+        self.tables = tables or {dim: {} for dim in DIMENSIONS}
+        self.rows = rows
+        self.version = version
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(cls, frame, version=None):
+        cube = cls(version=version)
+        cube.update(frame)
+        return cube
+
+    def update(self, frame):
+        if frame.empty:
+            return self
+        measures = pd.DataFrame({
+            "rows": np.ones(len(frame), dtype=np.int64),
+            "canceled_n": frame["is_canceled"].notna().astype(np.int64),
+            "canceled_sum": frame["is_canceled"].fillna(0).astype(np.float64),
+            "adr_n": frame["adr"].notna().astype(np.int64),
+            "adr_sum": frame["adr"].fillna(0).astype(np.float64),
+            "requests_n": frame["total_of_special_requests"].notna().astype(np.int64),
+        }, index=frame.index)
+        keys = {dim: frame[dim] for dim in DIMENSIONS if dim != "month_year"}
+        keys["month_year"] = month_year_key(frame)
+
+        for dim, key in keys.items():
+            grouped = measures.groupby(key.astype(str).to_numpy()).sum()
+            table = self.tables[dim]
+            for value, row in zip(grouped.index, grouped.to_numpy(dtype=np.float64)):
+                acc = table.setdefault(value, [0.0] * len(MEASURES))
+                for i, x in enumerate(row):
+                    acc[i] += x
+        self.rows += len(frame)
+        return self
+
+    # -----------------------------
+    # Query (ukuran hasil = jumlah nilai unik dimensi, bukan jumlah baris)
+    # -----------------------------
+    def _frame(self, dim):
+        table = self.tables[dim]
+        out = pd.DataFrame(list(table.values()), index=list(table.keys()), columns=MEASURES)
+        return out.sort_index().rename_axis(dim).reset_index()
+
+    def cancel_rate(self, dim):
+        t = self._frame(dim)
+        t["is_canceled"] = t["canceled_sum"] / t["canceled_n"]
+        return t[[dim, "is_canceled"]]
+
+    def monthly(self):
+        t = self._frame("month_year")
+        return pd.DataFrame({
+            "month_year": pd.to_datetime(t["month_year"], format="%Y-%m"),
+            "total_customers": t["requests_n"].astype(np.int64),
+            "total_bookings": t["canceled_n"].astype(np.int64),
+            "avg_cancellation": t["canceled_sum"] / t["canceled_n"],
+            "avg_adr": t["adr_sum"] / t["adr_n"],
+        })
+
+    # -----------------------------
+    # Simpan / muat
+    # -----------------------------
+    def to_dict(self):
+        return {"version": self.version, "rows": self.rows, "fingerprint": self.fingerprint, "tables": self.tables}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(tables=d["tables"], rows=d["rows"], version=d["version"], fingerprint=d.get("fingerprint", ""))
+
+
+# -----------------------------
+# Cube per versi dataset (disimpan di data/<nama>.cube.json)
+# -----------------------------
+_cubes = {}
+_lock = threading.Lock()
+CUBE_COLUMNS = ["hotel", "market_segment", "deposit_type", "arrival_date_year", "arrival_date_month",
+                "is_canceled", "adr", "total_of_special_requests"]
+# Cube untuk subset hasil filter EDA (tidak disimpan ke disk, hanya beberapa yang terakhir)
+MAX_FILTERED_CUBES = 16
+_filtered_cubes = OrderedDict()
+
+
+def cube_path(name=DEFAULT_DATASET, data_dir=None):
+    return Path(data_dir or DATA_DIR) / f"{name}.cube.json"
+
+
+def _read_cube(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return AggregateCube.from_dict(json.load(f))
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _write_cube(cube, path):
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cube.to_dict(), f)
+    os.replace(tmp, path)
+
+
+def load_cube(name=DEFAULT_DATASET, data_dir=None, filters=None):
+    if normalize_filters(filters):
+        return _load_filtered_cube(name, data_dir, filters)
+    version = dataset_version(name, data_dir)
+    key = (name, version)
+    cube = _cubes.get(key)
+    if cube is not None:
+        return cube
+
+    with _lock:
+        if key in _cubes:
+            return _cubes[key]
+        path = cube_path(name, data_dir)
+        cube = _read_cube(path)
+        if cube is None or cube.version != version:
+            frame = read_bookings(name, columns=CUBE_COLUMNS, data_dir=data_dir)
+            if cube is not None and cube.rows <= len(frame) and cube.fingerprint == _fingerprint(frame, cube.rows):
+                # Dataset hanya bertambah baris baru: update incremental dari ekor saja
+                cube.update(frame.iloc[cube.rows:])
+            else:
+                cube = AggregateCube.build(frame)
+            cube.version = version
+            cube.fingerprint = _fingerprint(frame, cube.rows)
+            try:
+                _write_cube(cube, path)
+            except OSError:
+                pass  # folder data read-only: cube tetap dipakai dari memory
+        _cubes[key] = cube
+        return cube
+
+
+def _load_filtered_cube(name, data_dir, filters):
+    key = (name, dataset_version(name, data_dir), normalize_filters(filters))
+    with _lock:
+        cube = _filtered_cubes.get(key)
+        if cube is not None:
+            _filtered_cubes.move_to_end(key)
+            return cube
+    rows = filtered_rows(filters, name, data_dir)
+    cube = AggregateCube.build(read_bookings(name, columns=CUBE_COLUMNS, data_dir=data_dir).take(rows), key[1])
+    with _lock:
+        _filtered_cubes[key] = cube
+        while len(_filtered_cubes) > MAX_FILTERED_CUBES:
+            _filtered_cubes.popitem(last=False)
+    return cube
+
+
+# -----------------------------
+# Ringkasan per kolom untuk histogram & box plot EDA
+# -----------------------------
+# Yang dikirim ke browser hanya jumlah per bin / per kategori dan statistik box plot,
+# jadi ukuran halaman tidak bertambah walaupun jumlah baris bertambah.
+def histogram(values, nbins=30):
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return {"counts": [], "edges": [], "n": 0}
+    counts, edges = np.histogram(values, bins=nbins)
+    return {"counts": counts.tolist(), "edges": edges.tolist(), "n": int(values.size)}
+
+
+def five_number_summary(values):
+    # Statistik box plot (Tukey): kuartil + whisker = data terjauh dalam 1.5 IQR
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return None
+    q1, med, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    return {
+        "min": float(values.min()),
+        "q1": float(q1),
+        "median": float(med),
+        "q3": float(q3),
+        "max": float(values.max()),
+        "whislo": float(inside.min()),
+        "whishi": float(inside.max()),
+        "mean": float(values.mean()),
+        "n": int(values.size),
+        "outliers": int(values.size - inside.size),
+    }
+
+
+def category_counts(values):
+    counts = pd.Series(values).value_counts(dropna=True).sort_index()
+    counts = counts[counts > 0]
+    return {"categories": [str(c) for c in counts.index], "counts": counts.astype(int).tolist()}
+
+
+# Dibatasi karena tiap kombinasi filter EDA punya ringkasannya sendiri
+MAX_SUMMARIES = 512
+_summaries = OrderedDict()
+_summary_lock = threading.Lock()
+
+
+def load_column_summary(column, kind, by=None, nbins=30, name=DEFAULT_DATASET, data_dir=None, filters=None):
+    # kind: "histogram", "box", atau "categories"; by = kolom pengelompokan (mis. is_canceled).
+    # filters: pilihan filter EDA (src/filters.py); hanya baris hasil irisan bitmap yang diringkas.
+    # Dihitung sekali per versi dataset (dan filter), hanya kolom yang dibutuhkan yang dibaca.
+    key = (name, dataset_version(name, data_dir), column, kind, by, nbins, normalize_filters(filters))
+    summary = _summaries.get(key)
+    if summary is not None:
+        return summary
+
+    with _summary_lock:
+        if key in _summaries:
+            _summaries.move_to_end(key)
+            return _summaries[key]
+        # Ringkasan dari versi dataset lama tidak dipakai lagi
+        for old in [k for k in _summaries if k[0] == name and k[1] != key[1]]:
+            del _summaries[old]
+        frame = read_bookings(name, columns=[column] + ([by] if by else []), data_dir=data_dir)
+        rows = filtered_rows(filters, name, data_dir)
+        if rows is not None:
+            frame = frame.take(rows)
+
+        def summarize(values):
+            if kind == "histogram":
+                return histogram(values, nbins)
+            if kind == "box":
+                return five_number_summary(values)
+            if kind == "categories":
+                return category_counts(values)
+            raise ValueError(f"kind '{kind}' tidak dikenal.")
+
+        if by is None:
+            summary = summarize(frame[column].to_numpy())
+        else:
+            summary = {str(group): summarize(part[column].to_numpy())
+                       for group, part in frame.groupby(by, observed=True, sort=True)}
+        _summaries[key] = summary
+        while len(_summaries) > MAX_SUMMARIES:
+            _summaries.popitem(last=False)
+        return summary
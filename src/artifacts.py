@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+import joblib
+
+from src import timing
+
+# -----------------------------
+# Lokasi artifact store
+# -----------------------------
+# Semua artifact (model, training columns, dst) disimpan lokal di folder models/,
+# dengan manifest.json yang mencatat versi + checksum untuk tiap artifact.
+MODELS_DIR = Path(os.environ.get("HOTEL_MODELS_DIR", Path(__file__).parent.parent / "models"))
+MANIFEST_NAME = "manifest.json"
+
+# -----------------------------
+# Artifact yang dikenal + sumber remote (opsional)
+# -----------------------------
+# Remote URL hanya dipakai saat populate (fetch_artifacts.py), tidak pernah saat app jalan.
+ARTIFACTS = {
+    "rf_model": {
+        "filename": "rf_model_20pct.pkl",
+        "url": "https://drive.google.com/uc?export=download&id=1HDViTPN6WkQpS5dDOHmaEYWCAGgwCJUU",
+    },
+    "training_columns": {
+        "filename": "training_columns_20pct.pkl",
+        "url": "https://drive.google.com/uc?export=download&id=14tmlc4z7ZHbYxePdV9cLyO5OHtqAO9cf",
+    },
+}
+
+
+class ArtifactError(RuntimeError):
+    pass
+
+
+class ArtifactNotFoundError(ArtifactError):
+    pass
+
+
+class ChecksumMismatchError(ArtifactError):
+    pass
+
+
+# -----------------------------
+# Manifest helpers
+# -----------------------------
+def _manifest_path(models_dir=None):
+    return Path(models_dir or MODELS_DIR) / MANIFEST_NAME
+
+
+def read_manifest(models_dir=None):
+    path = _manifest_path(models_dir)
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# Manifest terakhir per path, dipakai ulang selama file tidak berubah (cukup satu stat).
+# Hasilnya dibagi antar pemanggil, jadi jangan diubah; publish() selalu baca ulang.
+_manifests = {}
+
+
+def _cached_manifest(models_dir=None):
+    path = _manifest_path(models_dir)
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return {}
+    stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    cached = _manifests.get(path)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, read_manifest(models_dir))
+        _manifests[path] = cached
+    return cached[1]
+
+
+def _write_manifest(manifest, models_dir=None):
+    path = _manifest_path(models_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def current_entry(name, models_dir=None):
+    entry = _cached_manifest(models_dir).get(name)
+    if not entry:
+        raise ArtifactNotFoundError(
+            f"Artifact '{name}' belum ada di {Path(models_dir or MODELS_DIR)}. "
+            "Jalankan `python fetch_artifacts.py` (atau `--from-dir <folder>`) terlebih dahulu."
+        )
+    return entry["versions"][str(entry["current"])]
+
+
+def artifact_version(name, models_dir=None):
+    # Dipakai sebagai kunci invalidasi (mis. cache prediksi): berubah tiap publish
+    entry = current_entry(name, models_dir)
+    return f"{name}@v{entry['version']}:{entry['sha256'][:12]}"
+
+
+# -----------------------------
+# Publish: copy file ke store sebagai versi baru
+# -----------------------------
+def publish(name, src_path, models_dir=None, source=None):
+    models_dir = Path(models_dir or MODELS_DIR)
+    models_dir.mkdir(parents=True, exist_ok=True)
+    src_path = Path(src_path)
+
+    sha = file_sha256(src_path)
+    manifest = read_manifest(models_dir)
+    entry = manifest.setdefault(name, {"current": 0, "versions": {}})
+
+    # Kalau isinya (dan sumbernya, kalau diberikan) sama dengan versi sekarang, tidak perlu versi baru.
+    # Source ikut dibandingkan: artifact turunan (drift_reference, rf_compact) yang isinya tetap
+    # tapi dipasangkan ke versi rf_model lain tetap harus dicatat sebagai versi baru.
+    if entry["current"]:
+        cur = entry["versions"][str(entry["current"])]
+        if (cur["sha256"] == sha and (models_dir / cur["file"]).exists()
+                and (source is None or cur.get("source") == source)):
+            return cur
+
+    version = max([int(v) for v in entry["versions"]] + [0]) + 1
+    stem = Path(ARTIFACTS.get(name, {}).get("filename", src_path.name)).stem
+    filename = f"{stem}.v{version}{src_path.suffix or '.pkl'}"
+    dest = models_dir / filename
+    if src_path.resolve() != dest.resolve():
+        shutil.copyfile(src_path, dest)
+
+    record = {
+        "version": version,
+        "file": filename,
+        "sha256": sha,
+        "size": dest.stat().st_size,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "source": source or str(src_path),
+    }
+    entry["versions"][str(version)] = record
+    entry["current"] = version
+    _write_manifest(manifest, models_dir)
+    return record
+
+
+def publish_object(name, obj, models_dir=None, source=None, compress=3):
+    # Dump object ke file sementara lalu publish sebagai versi baru
+    models_dir = Path(models_dir or MODELS_DIR)
+    models_dir.mkdir(parents=True, exist_ok=True)
+    tmp = models_dir / f".{name}.tmp.pkl"
+    joblib.dump(obj, tmp, compress=compress)
+    try:
+        return publish(name, tmp, models_dir=models_dir, source=source or "publish_object")
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+# -----------------------------
+# Lazy load, sekali per proses
+# -----------------------------
+_loaded = {}
+_lock = threading.Lock()
+
+
+def load_artifact(name, models_dir=None, verify=True, mmap=False):
+    # mmap=True: array numpy di artifact tanpa kompresi di-memory-map read-only, jadi
+    # semua proses di host yang sama berbagi page yang sama (lihat forest.publish_flat_forest)
+    models_dir = Path(models_dir or MODELS_DIR)
+    entry = current_entry(name, models_dir)
+    key = (str(models_dir), name, entry["version"], mmap)
+
+    obj = _loaded.get(key)
+    if obj is not None:
+        return obj
+
+    with _lock:
+        obj = _loaded.get(key)
+        if obj is not None:
+            return obj
+
+        path = models_dir / entry["file"]
+        if not path.exists():
+            raise ArtifactNotFoundError(f"File artifact '{path}' tidak ditemukan.")
+        with timing.timed("artifact", f"{name} v{entry['version']}"):
+            if verify:
+                sha = file_sha256(path)
+                if sha != entry["sha256"]:
+                    raise ChecksumMismatchError(
+                        f"Checksum '{name}' v{entry['version']} tidak cocok "
+                        f"(manifest {entry['sha256'][:12]}, file {sha[:12]})."
+                    )
+            obj = joblib.load(path, mmap_mode="r" if mmap else None)
+        # Versi lama artifact yang sama dilepas (publish ulang di proses yang jalan lama)
+        for old in [k for k in _loaded if k[:2] == key[:2] and k[2] != key[2]]:
+            del _loaded[old]
+        _loaded[key] = obj
+        return obj
@@ -0,0 +1,214 @@
+import threading
+
+import numpy as np
+
+from src.artifacts import ArtifactError, artifact_version, current_entry, load_artifact
+from src.forest import FlatForest
+
+
+# -----------------------------
+# CompactForest: format model array yang lebih kecil dari pickle sklearn
+# -----------------------------
+# Per node hanya disimpan:
+#   feature   int16    (-1 untuk leaf)
+#   threshold float32  dibulatkan ke bawah, jadi x <= t tetap sama persis untuk X float32
+#   child     int16/32 index lokal per tree (kiri, kanan); leaf menunjuk ke dirinya sendiri
+#   value     uint8/16 probabilitas kelas yang dikuantisasi
+#   missing_left bool
+# Keputusan split identik dengan model asli; beda probabilitas hanya dari kuantisasi
+# (dan pruning, kalau dipakai). Atribut yang disimpan = array traversal, jadi bisa
+# dipakai langsung (termasuk lewat mmap) tanpa dibangun ulang saat load.
+class CompactForest:
+    BLOCK_PAIRS = FlatForest.BLOCK_PAIRS
+    COMPACT_EVERY = FlatForest.COMPACT_EVERY
+
+    def __init__(self, feature, threshold, child, value, missing_left, roots, classes, n_features):
+        self.feature = feature
+        self.threshold = threshold
+        self.child = child
+        self.value = value
+        self.missing_left = missing_left
+        self.roots = roots
+        self.classes = classes
+        self.n_features = n_features
+
+    @classmethod
+    def from_sklearn(cls, rf, bits=8, prune_tol=None):
+        scale = (1 << bits) - 1
+        value_dtype = np.uint8 if bits <= 8 else np.uint16
+        trees = []
+        for est in rf.estimators_:
+            tree = est.tree_
+            proba = tree.value[:, 0, : rf.n_classes_].astype(np.float64)
+            normalizer = proba.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            q = np.rint(proba / normalizer * scale).astype(value_dtype)
+            mgl = getattr(tree, "missing_go_to_left", None)
+            trees.append(_compact_tree(
+                tree.children_left, tree.children_right, tree.feature, tree.threshold, q,
+                np.zeros(tree.node_count, dtype=bool) if mgl is None else mgl.astype(bool),
+                prune_tol=None if prune_tol is None else prune_tol * scale,
+            ))
+
+        max_nodes = max(len(t[0]) for t in trees)
+        child_dtype = np.int16 if max_nodes <= np.iinfo(np.int16).max else np.int32
+        roots = np.cumsum([0] + [len(t[0]) for t in trees[:-1]]).astype(np.int32)
+        return cls(
+            feature=np.concatenate([t[0] for t in trees]).astype(np.int16),
+            threshold=np.concatenate([t[1] for t in trees]),
+            child=np.concatenate([t[2] for t in trees]).astype(child_dtype),
+            value=np.concatenate([t[3] for t in trees]),
+            missing_left=np.concatenate([t[4] for t in trees]),
+            roots=roots,
+            classes=np.asarray(rf.classes_),
+            n_features=rf.n_features_in_,
+        )
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    @property
+    def scale(self):
+        return np.iinfo(self.value.dtype).max
+
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.feature, self.threshold, self.child, self.value,
+                                      self.missing_left, self.roots))
+
+    _check_X = FlatForest._check_X
+    _blocks = FlatForest._blocks
+
+    # -----------------------------
+    # Traversal langsung dari array compact
+    # -----------------------------
+    def apply(self, X):
+        X = self._check_X(X)
+        leaves = np.empty((X.shape[0], self.n_trees), dtype=np.int32)
+        for start, stop in self._blocks(X.shape[0]):
+            leaves[start:stop] = self._apply_block(X[start:stop])
+        return leaves
+
+    def _apply_block(self, X):
+        child = self.child.reshape(-1)
+        n, n_trees = X.shape[0], self.n_trees
+        X_flat = X.reshape(-1)
+        out = np.empty(n * n_trees, dtype=np.int32)
+        root = np.tile(self.roots.astype(np.intp), n)
+        node = root.copy()
+        base = np.repeat(np.arange(n, dtype=np.intp) * X.shape[1], n_trees)
+        pos = np.arange(n * n_trees, dtype=np.intp)
+        has_nan = bool(np.isnan(X_flat).any())
+
+        step = 0
+        while node.size:
+            # Untuk leaf (feature -1) nilai x tidak dipakai: kedua anaknya adalah leaf itu sendiri
+            x = X_flat[base + self.feature[node]]
+            go_right = ~(x <= self.threshold[node])
+            if has_nan:
+                go_right &= ~(np.isnan(x) & self.missing_left[node])
+            node = root + child[2 * node + go_right]
+            step += 1
+            if step % self.COMPACT_EVERY == 0 or node.size <= n_trees:
+                done = self.feature[node] < 0
+                if done.any():
+                    out[pos[done]] = node[done]
+                    active = ~done
+                    node, root, base, pos = node[active], root[active], base[active], pos[active]
+        return out.reshape(n, n_trees)
+
+    def predict_proba(self, X):
+        X = self._check_X(X)
+        proba = np.empty((X.shape[0], len(self.classes)), dtype=np.float64)
+        for start, stop in self._blocks(X.shape[0]):
+            acc = self.value[self._apply_block(X[start:stop])].sum(axis=1, dtype=np.float64)
+            # Normalisasi per baris (pembulatan kuantisasi bisa membuat jumlahnya tidak pas 1)
+            proba[start:stop] = acc / acc.sum(axis=1, keepdims=True)
+        return proba
+
+    def predict_with_proba(self, X):
+        proba = self.predict_proba(X)
+        return self.classes.take(np.argmax(proba, axis=1)), proba
+
+    def predict(self, X):
+        return self.predict_with_proba(X)[0]
+
+
+def _round_down_float32(threshold):
+    # float32 terbesar yang <= threshold float64
+    t32 = threshold.astype(np.float32)
+    over = t32.astype(np.float64) > threshold
+    t32[over] = np.nextafter(t32[over], np.float32(-np.inf))
+    return t32
+
+
+def _compact_tree(left, right, feature, threshold, value, missing_left, prune_tol=None):
+    left, right = left.copy(), right.copy()
+    is_leaf = left == -1
+
+    if prune_tol is not None:
+        # Node yang kedua anaknya leaf dengan probabilitas hampir sama -> jadi leaf.
+        # Diulang dari bawah ke atas (node anak selalu punya index lebih besar dari parent).
+        for node in range(len(left) - 1, -1, -1):
+            if is_leaf[node]:
+                continue
+            l, r = left[node], right[node]
+            if is_leaf[l] and is_leaf[r] and np.abs(value[l].astype(np.int32) - value[r]).max() <= prune_tol:
+                is_leaf[node] = True
+                left[node] = right[node] = -1
+
+    # Nomori ulang node yang masih terjangkau (pre-order, root = 0)
+    order, stack = [], [0]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        if not is_leaf[node]:
+            stack.append(right[node])
+            stack.append(left[node])
+    order = np.asarray(order, dtype=np.intp)
+    new_id = np.full(len(left), -1, dtype=np.int64)
+    new_id[order] = np.arange(len(order))
+
+    leaf = is_leaf[order]
+    self_id = np.arange(len(order))
+    child = np.empty((len(order), 2), dtype=np.int64)
+    child[:, 0] = np.where(leaf, self_id, new_id[np.where(leaf, 0, left[order])])
+    child[:, 1] = np.where(leaf, self_id, new_id[np.where(leaf, 0, right[order])])
+    return (
+        np.where(leaf, -1, feature[order]),
+        np.where(leaf, np.float32(np.inf), _round_down_float32(threshold[order])).astype(np.float32),
+        child,
+        value[order],
+        missing_left[order] & ~leaf,
+    )
+
+
+# -----------------------------
+# CompactForest aktif (artifact "rf_compact"), sekali per versi per proses
+# -----------------------------
+# Dipakai serving kalau diminta (serve.py / score_bookings.py --compact): model sklearn tidak
+# dimuat sama sekali. Probabilitas sedikit berbeda karena kuantisasi, jadi bukan default.
+_forests = {}
+_lock = threading.Lock()
+
+
+def load_compact_forest(models_dir=None):
+    # rf_compact harus dibuat dari rf_model yang aktif (source di manifest), sama seperti rf_flat
+    model_version = artifact_version("rf_model", models_dir)
+    if current_entry("rf_compact", models_dir).get("source") != model_version:
+        raise ArtifactError(
+            f"rf_compact tidak dibuat dari {model_version}; jalankan ulang `python compact_model.py --publish`."
+        )
+    key = (str(models_dir), artifact_version("rf_compact", models_dir))
+    forest = _forests.get(key)
+    if forest is not None:
+        return forest
+    with _lock:
+        if key not in _forests:
+            # Disimpan tanpa kompresi (compact_model.py), jadi array-nya di-mmap dan dibagi antar proses
+            _forests[key] = load_artifact("rf_compact", models_dir=models_dir, mmap=True)
+        return _forests[key]
@@ -0,0 +1,317 @@
+import calendar
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src import timing
+from src.schema import DATASET_SCHEMA, TARGET
+
+# -----------------------------
+# Lokasi dataset
+# -----------------------------
+DATA_DIR = Path(os.environ.get("HOTEL_DATA_DIR", Path(__file__).parent.parent / "data"))
+DEFAULT_DATASET = "cleaned_hotel_data4"
+
+
+def csv_path(name=DEFAULT_DATASET, data_dir=None):
+    return Path(data_dir or DATA_DIR) / f"{name}.csv"
+
+
+def columnar_path(name=DEFAULT_DATASET, data_dir=None):
+    return Path(data_dir or DATA_DIR) / f"{name}.feather"
+
+
+def partitioned_path(name=DEFAULT_DATASET, data_dir=None):
+    # Dataset hasil ingest.py: folder per tahun/bulan kedatangan + manifest.json
+    return Path(data_dir or DATA_DIR) / name
+
+
+# -----------------------------
+# Schema: tipe kolom compact + validasi (src/schema.py)
+# -----------------------------
+class SchemaError(ValueError):
+    pass
+
+
+INT_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+
+
+def _smallest_int(values, col):
+    # Kolom yang sudah bertipe target (mis. hasil Feather/mmap) dikembalikan apa adanya, tanpa salinan
+    array = values.to_numpy()
+    if array.dtype.kind == "f":
+        if np.isnan(array).any():
+            # Integer dengan nilai kosong tidak bisa int numpy -> float32
+            return values if array.dtype == np.float32 else values.astype(np.float32)
+        if not np.array_equal(array, np.round(array)):
+            raise SchemaError(f"Kolom '{col}' harus bilangan bulat.")
+    if not len(array):
+        return values.astype(np.int8)
+    lo, hi = array.min(), array.max()
+    target = next((t for t in INT_DTYPES if np.iinfo(t).min <= lo and hi <= np.iinfo(t).max), np.int64)
+    return values if array.dtype == target else values.astype(target)
+
+
+def derive_has_agent(frame):
+    # Export mentah (kolom agent/company seperti di halaman Overview) -> flag punya agent atau tidak.
+    # ID agent sendiri tidak dipakai model.
+    agent = frame["agent"].astype(str).str.strip()
+    return (frame["agent"].notna() & ~agent.isin(["", "NULL", "nan"])).astype(np.int8)
+
+
+def apply_schema(frame, schema=DATASET_SCHEMA, require_all=False):
+    # Kolom yang dikenal diubah ke tipe compact; kolom lain dibiarkan
+    if "has_agent" in schema and "has_agent" not in frame.columns and "agent" in frame.columns:
+        frame = frame.assign(has_agent=derive_has_agent(frame))
+    if require_all:
+        missing = [col for col in schema if col not in frame.columns]
+        if missing:
+            raise SchemaError(f"Kolom tidak ditemukan: {', '.join(missing)}")
+
+    out = {}
+    for col in frame.columns:
+        kind = schema.get(col)
+        values = frame[col]
+        if kind == "category":
+            out[col] = values if isinstance(values.dtype, pd.CategoricalDtype) else values.astype("category")
+            continue
+        if kind is None:
+            out[col] = values
+            continue
+        if not pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+            try:
+                values = pd.to_numeric(values)
+            except (TypeError, ValueError) as e:
+                raise SchemaError(f"Kolom '{col}' harus numerik: {e}") from None
+        if kind == "float32":
+            out[col] = values if values.dtype == np.float32 else values.astype(np.float32)
+        else:
+            out[col] = _smallest_int(values, col)
+
+    if TARGET in out:
+        labels = pd.unique(out[TARGET].dropna())
+        if not set(labels.tolist()) <= {0, 1}:
+            raise SchemaError(f"Kolom '{TARGET}' harus 0/1.")
+    return pd.DataFrame(out, index=frame.index, copy=False)
+
+
+def memory_report(before, after):
+    # Memory per kolom (MB) sebelum & sesudah schema
+    b = before.memory_usage(deep=True, index=False)
+    a = after.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        "dtype_before": before.dtypes.astype(str),
+        "dtype_after": after.dtypes.astype(str),
+        "before_mb": b / 1e6,
+        "after_mb": a / 1e6,
+    })
+    report["saving"] = report["before_mb"] / report["after_mb"]
+    report.loc["TOTAL"] = ["", "", b.sum() / 1e6, a.sum() / 1e6, b.sum() / a.sum()]
+    return report.rename_axis("column")
+
+
+def read_csv_compact(path, columns=None, **kwargs):
+    # read_csv langsung ke categorical untuk kolom teks, lalu numerik di-downcast
+    usecols = set(columns) if columns else None
+    dtype = {col: "category" for col, kind in DATASET_SCHEMA.items()
+             if kind == "category" and (usecols is None or col in usecols)}
+    return pd.read_csv(path, usecols=columns, dtype=dtype, **kwargs)
+
+
+# -----------------------------
+# Konversi sekali: CSV -> Feather (Arrow IPC, tanpa kompresi supaya bisa di-mmap)
+# -----------------------------
+def convert_to_columnar(name=DEFAULT_DATASET, data_dir=None):
+    import pyarrow.feather as feather
+
+    raw = pd.read_csv(csv_path(name, data_dir))
+    # Tipe compact dari schema; kolom teks -> categorical (disimpan sebagai dictionary di Arrow)
+    df = apply_schema(raw, require_all=True)
+    for col in df.columns:
+        if not pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col]):
+            df[col] = df[col].astype("category")
+
+    out = columnar_path(name, data_dir)
+    feather.write_feather(df, out, compression="uncompressed")
+    return out, memory_report(raw, df)
+
+
+# -----------------------------
+# Dataset terpartisi (tahun/bulan kedatangan): partisi yang tidak diminta tidak dibaca
+# -----------------------------
+PARTITION_MANIFEST = "manifest.json"
+
+
+def read_partition_manifest(name=DEFAULT_DATASET, data_dir=None):
+    path = partitioned_path(name, data_dir) / PARTITION_MANIFEST
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def select_partitions(manifest, years=None, months=None):
+    # Key partisi "YYYY-MM"; months boleh angka (7) atau nama ("July")
+    years = {int(y) for y in years} if years is not None else None
+    if months is not None:
+        months = {m if isinstance(m, int) else list(calendar.month_name).index(m) for m in months}
+    return [
+        key for key in manifest["partitions"]
+        if (years is None or int(key[:4]) in years) and (months is None or int(key[5:]) in months)
+    ]
+
+
+def read_partitioned(name=DEFAULT_DATASET, columns=None, data_dir=None, years=None, months=None):
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    root = partitioned_path(name, data_dir)
+    manifest = read_partition_manifest(name, data_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"{root / PARTITION_MANIFEST} tidak ditemukan (jalankan `python ingest.py`)")
+    keys = select_partitions(manifest, years, months)
+    files = [root / rel for key in keys for rel in manifest["partitions"][key]["files"]]
+    with timing.timed("dataset", f"{name}/{len(keys)}of{len(manifest['partitions'])}"):
+        cols = list(columns) if columns else manifest["columns"]
+        if not files:
+            frame = pd.DataFrame({col: pd.Series(dtype=object) for col in cols})
+        else:
+            # Part dari ingest lama bisa punya lebar integer berbeda per bulan: samakan dulu
+            table = pa.concat_tables([feather.read_table(f, columns=cols, memory_map=True) for f in files],
+                                     promote_options="permissive")
+            frame = table.select(cols).to_pandas(split_blocks=True)
+        return apply_schema(frame, require_all=columns is None)
+
+
+# -----------------------------
+# Baca dataset (dipakai dashboard & training)
+# -----------------------------
+def read_bookings(name=DEFAULT_DATASET, columns=None, data_dir=None, years=None, months=None):
+    # years/months hanya memangkas file untuk dataset terpartisi; format lain difilter setelah dibaca
+    if (partitioned_path(name, data_dir) / PARTITION_MANIFEST).exists():
+        return read_partitioned(name, columns, data_dir, years, months)
+    if years is not None or months is not None:
+        extra = [c for c in ("arrival_date_year", "arrival_date_month") if columns and c not in columns]
+        frame = read_bookings(name, list(columns) + extra if columns else None, data_dir)
+        keep = pd.Series(True, index=frame.index)
+        if years is not None:
+            keep &= frame["arrival_date_year"].isin([int(y) for y in years])
+        if months is not None:
+            names = [m if isinstance(m, str) else calendar.month_name[m] for m in months]
+            keep &= frame["arrival_date_month"].isin(names)
+        return frame.loc[keep].drop(columns=extra).reset_index(drop=True)
+
+    path = columnar_path(name, data_dir)
+    if path.exists():
+        import pyarrow as pa
+        import pyarrow.feather as feather
+
+        with timing.timed("dataset", path.name):
+            source = _source_columns(columns, pa.ipc.open_file(path).schema.names)
+            table = feather.read_table(path, columns=source, memory_map=True)
+            # Sudah compact kalau dibuat convert_to_columnar; schema tetap divalidasi
+            frame = apply_schema(table.to_pandas(split_blocks=True), require_all=columns is None)
+            return frame if source == columns else frame[list(columns)]
+
+    # Fallback kalau belum dikonversi (jalankan `python convert_dataset.py`)
+    path = csv_path(name, data_dir)
+    with timing.timed("dataset", path.name):
+        source = _source_columns(columns, pd.read_csv(path, nrows=0).columns) if columns else columns
+        frame = apply_schema(read_csv_compact(path, source), require_all=columns is None)
+        return frame if source == columns else frame[list(columns)]
+
+
+def _source_columns(columns, available):
+    # has_agent diminta tapi file masih berisi kolom agent mentah: baca agent, has_agent diturunkan
+    # oleh apply_schema (sama dengan ingest.clean_chunk)
+    if columns and "has_agent" in columns and "has_agent" not in available and "agent" in available:
+        return [c for c in columns if c != "has_agent"] + ["agent"]
+    return columns
+
+
+def _dataset_file(name, data_dir):
+    # File yang menentukan isi dataset (urutan sama dengan read_bookings)
+    path = partitioned_path(name, data_dir) / PARTITION_MANIFEST
+    if not path.exists():
+        path = columnar_path(name, data_dir)
+    if not path.exists():
+        path = csv_path(name, data_dir)
+    return path
+
+
+def dataset_version(name=DEFAULT_DATASET, data_dir=None):
+    # Berubah tiap kali file dataset diganti; dipakai sebagai kunci cache
+    path = _dataset_file(name, data_dir)
+    stat = path.stat()
+    return f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+_content_hashes = {}
+
+
+def dataset_hash(name=DEFAULT_DATASET, data_dir=None):
+    # sha256 isi file dataset: sama walaupun file di-copy ulang / mtime berubah, jadi cocok
+    # untuk cache yang disimpan ke disk. Dihitung sekali per versi, disimpan di <file>.sha256.
+    from src.artifacts import file_sha256
+
+    version = dataset_version(name, data_dir)
+    key = (name, str(data_dir), version)
+    digest = _content_hashes.get(key)
+    if digest is not None:
+        return digest
+
+    path = _dataset_file(name, data_dir)
+    sidecar = path.with_name(path.name + ".sha256")
+    try:
+        saved_version, digest = sidecar.read_text(encoding="utf-8").split()
+        if saved_version != version:
+            digest = None
+    except (OSError, ValueError):
+        digest = None
+    if digest is None:
+        with timing.timed("dataset", f"sha256({path.name})"):
+            digest = file_sha256(path)
+        try:
+            sidecar.write_text(f"{version} {digest}\n", encoding="utf-8")
+        except OSError:
+            pass  # folder data read-only
+    _content_hashes[key] = digest
+    return digest
+
+
+# -----------------------------
+# Loader untuk halaman dashboard (Overview & EDA berbagi cache yang sama)
+# -----------------------------
+# Satu DataFrame per dataset per proses, dibagi semua session & rerun (bukan st.cache_data, yang
+# mem-pickle hasilnya dan memberi tiap rerun salinan baru; buffer Arrow hasil mmap jadi tidak
+# terpakai). Versi lama dibuang saat file dataset berubah. Pemanggil tidak boleh mengubah frame ini.
+_frames = {}
+_frames_lock = threading.Lock()
+
+
+def _shared_frame(name):
+    version = dataset_version(name)
+    cached = _frames.get(name)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    with _frames_lock:
+        cached = _frames.get(name)
+        if cached is None or cached[0] != version:
+            cached = _frames[name] = (version, read_bookings(name))
+        return cached[1]
+
+
+def load_data(name=DEFAULT_DATASET):
+    # streamlit di-import di sini saja, supaya training/CLI tidak ikut memuat streamlit
+    import streamlit as st
+
+    try:
+        with timing.timed("data", f"load_data({name})"):
+            return _shared_frame(name)
+    except Exception as e:
+        st.error(f"❌ Error loading dataset: {e}")
+        return pd.DataFrame()
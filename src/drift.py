@@ -0,0 +1,249 @@
+import bisect
+import json
+import math
+import threading
+
+import numpy as np
+import pandas as pd
+
+from src.artifacts import ArtifactNotFoundError, artifact_version, current_entry, load_artifact
+
+# -----------------------------
+# Drift monitor: sketch ukuran tetap untuk booking yang di-score vs data training
+# -----------------------------
+# Numerik  : histogram dengan edge tetap (kuantil data training) + bin untuk nilai kosong
+# Kategori : tabel frekuensi kategori training (dibatasi) + satu bin "lainnya"
+# Update per baris O(1) (bisect di ~10 edge / lookup dict), memory tidak bertambah
+# berapa pun jumlah booking yang masuk. Skor dihitung dari count per bin saja.
+DRIFT_NUMERIC = ["lead_time", "adr", "booking_changes"]
+DRIFT_CATEGORICAL = ["country", "market_segment", "deposit_type"]
+NUMERIC_BINS = 10
+MAX_CATEGORIES = 50
+OTHER = "__other__"
+
+# Batas PSI yang umum dipakai: < 0.1 stabil, 0.1-0.25 bergeser sedikit, > 0.25 bergeser
+PSI_WARN = 0.1
+PSI_ALERT = 0.25
+# Di bawah jumlah booking ini skor masih terlalu noisy untuk dijadikan status
+MIN_ROWS = 100
+# Proporsi minimum per bin (hindari log(0) untuk bin kosong)
+EPSILON = 1e-4
+
+
+class DriftSketch:
+    def __init__(self, edges, categories):
+        # edges[col]      = edge dalam (float64, urut); bin i = (edges[i-1], edges[i]], + bin NaN
+        # categories[col] = {nilai: index}; index terakhir = OTHER
+        self.edges = edges
+        self.categories = categories
+        self.counts = {col: np.zeros(len(e) + 2, dtype=np.int64) for col, e in edges.items()}
+        self.counts.update({col: np.zeros(len(c) + 1, dtype=np.int64) for col, c in categories.items()})
+        self.rows = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, frame, bins=NUMERIC_BINS, max_categories=MAX_CATEGORIES):
+        # Layout (edge & daftar kategori) diambil dari data training, lalu tetap
+        edges = {}
+        for col in DRIFT_NUMERIC:
+            values = pd.to_numeric(frame[col], errors="coerce").to_numpy(dtype=np.float64)
+            values = values[~np.isnan(values)]
+            qs = np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1]) if values.size else []
+            edges[col] = np.unique(np.asarray(qs, dtype=np.float64))
+        categories = {}
+        for col in DRIFT_CATEGORICAL:
+            top = frame[col].astype(str).value_counts().head(max_categories).index
+            categories[col] = {value: i for i, value in enumerate(sorted(top))}
+        return cls(edges, categories)
+
+    def empty_like(self):
+        return DriftSketch(self.edges, self.categories)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    # -----------------------------
+    # Update
+    # -----------------------------
+    def _numeric_bin(self, col, value):
+        try:
+            x = float(value)
+        except (TypeError, ValueError):
+            x = math.nan
+        if math.isnan(x):
+            return len(self.edges[col]) + 1
+        return bisect.bisect_left(self.edges[col], x)
+
+    def _category_bin(self, col, value):
+        table = self.categories[col]
+        return table.get(str(value), len(table))
+
+    def update_record(self, record):
+        # Satu booking (dict, field sama dengan form Predict / body /predict); kolom yang tidak ada dilewati
+        bins = [(col, self._numeric_bin(col, record[col])) for col in self.edges if col in record]
+        bins += [(col, self._category_bin(col, record[col])) for col in self.categories if col in record]
+        with self._lock:
+            for col, i in bins:
+                self.counts[col][i] += 1
+            self.rows += 1
+
+    def update_records(self, records):
+        for record in records:
+            self.update_record(record)
+
+    def update_frame(self, frame):
+        # Versi vektor untuk batch scoring (hasil sama dengan update_record per baris)
+        updates = {}
+        for col, edges in self.edges.items():
+            if col not in frame.columns:
+                continue
+            values = pd.to_numeric(frame[col], errors="coerce").to_numpy(dtype=np.float64)
+            idx = np.searchsorted(edges, values, side="left")
+            idx[np.isnan(values)] = len(edges) + 1
+            updates[col] = np.bincount(idx, minlength=len(edges) + 2)
+        for col, table in self.categories.items():
+            if col not in frame.columns:
+                continue
+            codes, uniques = pd.factorize(frame[col].astype(str))
+            mapped = np.array([table.get(u, len(table)) for u in uniques], dtype=np.intp)
+            updates[col] = np.bincount(mapped[codes[codes >= 0]], minlength=len(table) + 1)
+        with self._lock:
+            for col, counts in updates.items():
+                self.counts[col] += counts
+            self.rows += len(frame)
+
+    def reset(self):
+        with self._lock:
+            for counts in self.counts.values():
+                counts.fill(0)
+            self.rows = 0
+
+    # -----------------------------
+    # Skor drift vs referensi (O(jumlah bin), tidak tergantung jumlah baris)
+    # -----------------------------
+    def compare(self, reference):
+        with self._lock:
+            live = {col: counts.copy() for col, counts in self.counts.items()}
+            rows = self.rows
+        report = {}
+        for col, counts in live.items():
+            n, n_ref = counts.sum(), reference.counts[col].sum()
+            entry = {"rows": int(n), "psi": None, "ks": None, "status": "no data"}
+            if n and n_ref:
+                p = np.maximum(counts / n, EPSILON)
+                q = np.maximum(reference.counts[col] / n_ref, EPSILON)
+                psi = float(np.sum((p - q) * np.log(p / q)))
+                entry["psi"] = psi
+                if n < MIN_ROWS:
+                    entry["status"] = "too few rows"
+                else:
+                    entry["status"] = "drift" if psi > PSI_ALERT else "warning" if psi > PSI_WARN else "ok"
+                if col in self.edges:
+                    # KS dari CDF per bin (bin nilai kosong tidak ikut)
+                    cdf = np.cumsum(counts[:-1]) / max(counts[:-1].sum(), 1)
+                    cdf_ref = np.cumsum(reference.counts[col][:-1]) / max(reference.counts[col][:-1].sum(), 1)
+                    entry["ks"] = float(np.abs(cdf - cdf_ref).max())
+            report[col] = entry
+        return {"rows": rows, "reference_rows": reference.rows, "features": report}
+
+
+def build_reference(frames, bins=NUMERIC_BINS, max_categories=MAX_CATEGORIES):
+    # frames: satu DataFrame atau iterable chunk; layout dari chunk pertama, count dari semua chunk
+    if isinstance(frames, pd.DataFrame):
+        frames = [frames]
+    reference = None
+    for frame in frames:
+        if reference is None:
+            reference = DriftSketch.from_frame(frame, bins, max_categories)
+        reference.update_frame(frame)
+    if reference is None:
+        raise ValueError("Tidak ada data untuk referensi drift.")
+    return reference
+
+
+# -----------------------------
+# Monitor untuk model aktif: referensi dari artifact "drift_reference" + sketch live
+# -----------------------------
+class DriftMonitor:
+    def __init__(self, reference, version=None):
+        self.reference = reference
+        self.live = reference.empty_like()
+        self.version = version
+
+    def update_record(self, record):
+        self.live.update_record(record)
+
+    def update_records(self, records):
+        self.live.update_records(records)
+
+    def update_frame(self, frame):
+        self.live.update_frame(frame)
+
+    def report(self):
+        return dict(self.live.compare(self.reference), reference_version=self.version)
+
+    def reset(self):
+        self.live.reset()
+
+
+def prometheus_text(report, prefix="hotel"):
+    lines = [f"# HELP {prefix}_drift_psi Population stability index booking yang di-score vs data training.",
+             f"# TYPE {prefix}_drift_psi gauge"]
+    for col, entry in report["features"].items():
+        if entry["psi"] is not None:
+            lines.append(f'{prefix}_drift_psi{{feature="{col}"}} {entry["psi"]:.6f}')
+    lines += [f"# HELP {prefix}_drift_ks Statistik KS (per bin) untuk fitur numerik.",
+              f"# TYPE {prefix}_drift_ks gauge"]
+    for col, entry in report["features"].items():
+        if entry["ks"] is not None:
+            lines.append(f'{prefix}_drift_ks{{feature="{col}"}} {entry["ks"]:.6f}')
+    lines += [f"# HELP {prefix}_drift_rows Booking yang masuk ke sketch live.",
+              f"# TYPE {prefix}_drift_rows gauge",
+              f"{prefix}_drift_rows {report['rows']}"]
+    return "\n".join(lines) + "\n"
+
+
+def no_reference_report(models_dir=None):
+    # Pengganti report kalau load_monitor() -> None, supaya file report tetap ada dan jelas alasannya
+    try:
+        model_version = artifact_version("rf_model", models_dir)
+    except ArtifactNotFoundError:
+        model_version = None
+    return {"rows": 0, "reference_rows": 0, "features": {}, "reference_version": None,
+            "model_version": model_version, "status": "no_reference",
+            "detail": "Tidak ada drift_reference untuk versi rf_model aktif."}
+
+
+def export_report(report, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+
+_monitors = {}
+_lock = threading.Lock()
+
+
+def load_monitor(models_dir=None):
+    # None kalau model aktif tidak punya referensi drift: belum pernah dipublish, atau referensi
+    # yang ada dibuat untuk versi rf_model lain (mis. rf_model diganti lewat fetch_artifacts.py)
+    try:
+        version = artifact_version("drift_reference", models_dir)
+        model_version = artifact_version("rf_model", models_dir)
+    except ArtifactNotFoundError:
+        return None
+    if current_entry("drift_reference", models_dir).get("source") != model_version:
+        return None
+    key = (str(models_dir), version, model_version)
+    monitor = _monitors.get(key)
+    if monitor is not None:
+        return monitor
+    with _lock:
+        if key not in _monitors:
+            _monitors[key] = DriftMonitor(load_artifact("drift_reference", models_dir=models_dir), version)
+        return _monitors[key]
@@ -1,213 +1,306 @@
 import streamlit as st
+from pathlib import Path
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from src import timing
+from src.aggregates import load_column_summary, load_cube
+from src.data import dataset_hash, load_data
+from src.figcache import figure_cache
+from src.filters import FILTER_COLUMNS, filtered_rows, load_filter_index, normalize_filters
 
 # ---------------------------
-# Load Data
+# Chart dari ringkasan server-side (bin counts & statistik box plot)
 # ---------------------------
-@st.cache_data
-def load_data():
-    try:
-        df = pd.read_csv("data/cleaned_hotel_data4.csv")
-        return df
-    except Exception as e:
-        st.error(f"❌ Error loading dataset: {e}")
-        return pd.DataFrame()
+def histogram_figure(column, hist, box, title):
+    # Histogram + marginal box plot, setara px.histogram(..., marginal="box")
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.2, 0.8], vertical_spacing=0.02)
+    if box is not None:
+        fig.add_trace(go.Box(
+            q1=[box["q1"]], median=[box["median"]], q3=[box["q3"]],
+            lowerfence=[box["whislo"]], upperfence=[box["whishi"]], mean=[box["mean"]],
+            y=[column], orientation="h", name=column, marker_color="#636EFA", showlegend=False,
+        ), row=1, col=1)
+    edges = hist["edges"]
+    fig.add_trace(go.Bar(
+        x=[(lo + hi) / 2 for lo, hi in zip(edges[:-1], edges[1:])],
+        y=hist["counts"],
+        width=[hi - lo for lo, hi in zip(edges[:-1], edges[1:])],
+        customdata=list(zip(edges[:-1], edges[1:])),
+        hovertemplate="%{customdata[0]:.4g} – %{customdata[1]:.4g}<br>count %{y}<extra></extra>",
+        marker_color="#636EFA", showlegend=False,
+    ), row=2, col=1)
+    fig.update_yaxes(showticklabels=False, row=1, col=1)
+    fig.update_layout(title=title, xaxis2_title=column, yaxis2_title="count", bargap=0)
+    return fig
+
+
+def boxplot_from_summary(ax, groups):
+    # Sama seperti sns.boxplot, tapi dari statistik yang sudah dihitung (tanpa data mentah)
+    stats = [
+        {"label": label, "med": s["median"], "q1": s["q1"], "q3": s["q3"],
+         "whislo": s["whislo"], "whishi": s["whishi"], "fliers": []}
+        for label, s in groups.items() if s is not None
+    ]
+    colors = sns.color_palette(n_colors=len(stats))
+    boxes = ax.bxp(stats, showfliers=False, patch_artist=True)
+    for patch, color in zip(boxes["boxes"], colors):
+        patch.set_facecolor(color)
 
 
 # ---------------------------
-# EDA Page
+# Filter (hotel, tahun, market segment, deposit type) dari index bitmap
 # ---------------------------
-def show_eda():
-    st.title("🔍 Exploratory Data Analysis - Hotel Cancellation")
-    df = load_data()
+FILTER_LABELS = {
+    "hotel": "🏨 Hotel",
+    "arrival_date_year": "📅 Arrival Year",
+    "market_segment": "🧭 Market Segment",
+    "deposit_type": "💳 Deposit Type",
+}
 
-    if df.empty:
-        st.warning("❌ Dataset is empty after loading. Please check the CSV or path.")
-        return
 
-    # Section 1 - Preview
-    st.header("📋 Dataset Preview")
-    st.dataframe(df.head())
-    st.divider()
+def show_filters():
+    # Pilihan kosong = semua nilai
+    index = load_filter_index()
+    filters = {}
+    for col, box in zip(FILTER_COLUMNS, st.columns(len(FILTER_COLUMNS))):
+        with box:
+            filters[col] = st.multiselect(FILTER_LABELS[col], index.values(col), key=f"eda_filter_{col}")
+    with timing.timed("filters", "count"):
+        n = index.count(filters)
+    return filters, n, index.n_rows
 
-    # Section 2 - Numerical Feature Distribution
-    st.header("📈 Numerical Feature Distribution")
-    numerical_cols = [
-        'lead_time', 'stays_in_weekend_nights', 'stays_in_week_nights',
-        'adults', 'children', 'babies', 'previous_cancellations',
-        'booking_changes', 'total_of_special_requests'
-    ]
 
-    if numerical_cols:
-        selected_num = st.selectbox("Select a numerical column:", numerical_cols)
-        fig = px.histogram(
-            df,
-            x=selected_num,
-            nbins=30,
-            marginal="box",
-            title=f"Distribution of {selected_num}"
-        )
-        st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.info("🔎 No numerical columns found.")
+# ---------------------------
+# Chart EDA: satu fungsi per chart, input = pilihan widget + filter
+# ---------------------------
+# Dipakai halaman Streamlit (lewat figure cache) dan export snapshot statis (export_eda.py).
+NUMERICAL_COLS = [
+    'lead_time', 'stays_in_weekend_nights', 'stays_in_week_nights',
+    'adults', 'children', 'babies', 'previous_cancellations',
+    'booking_changes', 'total_of_special_requests'
+]
+CATEGORICAL_COLS = [
+    'hotel', 'market_segment', 'deposit_type', 'customer_type',
+    'reserved_room_type', 'assigned_room_type'
+]
 
-    st.subheader("📊 Categorical Feature Analysis")
-    cat_cols = [
-        'hotel', 'market_segment', 'deposit_type', 'customer_type',
-        'reserved_room_type', 'assigned_room_type'
-    ]
 
-    selected_cat = st.selectbox("🔎 Pilih kolom kategorikal untuk dieksplorasi:", cat_cols)
-    fig = px.histogram(
-        df,
-        x=selected_cat,
+def numerical_distribution_chart(column, filters=None):
+    return histogram_figure(
+        column,
+        load_column_summary(column, "histogram", nbins=30, filters=filters),
+        load_column_summary(column, "box", filters=filters),
+        title=f"Distribution of {column}"
+    )
+
+
+def categorical_distribution_chart(column, filters=None):
+    cat_counts = load_column_summary(column, "categories", filters=filters)
+    fig = px.bar(
+        x=cat_counts["categories"],
+        y=cat_counts["counts"],
         color_discrete_sequence=["#95DCE2"],
         text_auto=True,
-        category_orders={selected_cat: sorted(df[selected_cat].unique())},
-        labels={selected_cat: selected_cat},
+        labels={"x": column, "y": "Jumlah"},
     )
     fig.update_layout(
-        title=f"Distribusi dari '{selected_cat}'",
-        xaxis_title=selected_cat,
+        title=f"Distribusi dari '{column}'",
+        xaxis_title=column,
         yaxis_title="Jumlah",
         bargap=0.15
     )
     fig.update_traces(marker_line_width=1, opacity=0.85)
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
-    st.header("🤔 Insightful Questions")
-    st.divider()
 
-    # Section 3 - Cancellation Rate by Hotel Type
-    st.subheader("1️⃣ Cancellation Rate by Hotel Type")
-    if 'hotel' in df.columns and 'is_canceled' in df.columns:
-        cancel_rate = df.groupby('hotel')['is_canceled'].mean().reset_index()
-        # ambil top 10 hotel dengan cancel rate tertinggi
-        cancel_rate = cancel_rate.sort_values(by='is_canceled', ascending=False).head(10)
-        # format text 3 desimal
-        cancel_rate['is_canceled_text'] = cancel_rate['is_canceled'].apply(lambda x: f"{x:.3f}")
-        
-        fig = px.bar(
-            cancel_rate,
-            x='hotel',
-            y='is_canceled',
-            text='is_canceled_text',
-            title="Top 10 Hotels by Cancellation Rate",
-            labels={'is_canceled': 'Cancellation Rate'}
-        )
-        st.plotly_chart(fig, use_container_width=True)
-    st.divider()
+def cancel_rate_chart(dim, title, filters=None, top=None):
+    # Rollup dibaca dari aggregate cube (dihitung sekali per versi dataset, atau per filter)
+    rate = load_cube(filters=filters).cancel_rate(dim)
+    if top:
+        rate = rate.sort_values(by='is_canceled', ascending=False).head(top)
+    # format text 3 desimal
+    rate['is_canceled_text'] = rate['is_canceled'].apply(lambda x: f"{x:.3f}")
+    return px.bar(
+        rate,
+        x=dim,
+        y='is_canceled',
+        text='is_canceled_text',
+        title=title,
+        labels={'is_canceled': 'Cancellation Rate'}
+    )
 
-    # Section 4 - Market Segment vs Cancellation
-    st.subheader("2️⃣ Market Segment vs Cancellation")
-    if 'market_segment' in df.columns and 'is_canceled' in df.columns:
-        segment_cancel = df.groupby('market_segment')['is_canceled'].mean().reset_index()
-        # format 3 desimal untuk text
-        segment_cancel['is_canceled_text'] = segment_cancel['is_canceled'].apply(lambda x: f"{x:.3f}")
-        
-        fig = px.bar(
-            segment_cancel,
-            x='market_segment',
-            y='is_canceled',
-            text='is_canceled_text',
-            title="Cancellation Rate by Market Segment"
-        )
-        st.plotly_chart(fig, use_container_width=True)
-    st.divider()
 
-    # Section 5 - Deposit Type vs Cancellation
-    st.subheader("3️⃣ Deposit Type vs Cancellation")
-    if 'deposit_type' in df.columns and 'is_canceled' in df.columns:
-        deposit_cancel = df.groupby('deposit_type')['is_canceled'].mean().reset_index()
-        deposit_cancel['is_canceled_text'] = deposit_cancel['is_canceled'].apply(lambda x: f"{x:.3f}")
-        
-        fig = px.bar(
-            deposit_cancel,
-            x='deposit_type',
-            y='is_canceled',
-            text='is_canceled_text',
-            title="Cancellation Rate by Deposit Type"
-        )
-        st.plotly_chart(fig, use_container_width=True)
-    st.divider()
+def special_requests_chart(filters=None):
+    fig, ax = plt.subplots()
+    boxplot_from_summary(ax, load_column_summary('total_of_special_requests', "box", by='is_canceled', filters=filters))
+    ax.set_xlabel("Canceled")
+    ax.set_ylabel("Total Special Requests")
+    return fig
 
 
-    # Section 6 - Special Requests vs Cancellation
-    st.subheader("4️⃣ Special Requests vs Cancellation")
-    if 'total_of_special_requests' in df.columns and 'is_canceled' in df.columns:
-        fig, ax = plt.subplots()
-        sns.boxplot(data=df, x='is_canceled', y='total_of_special_requests', ax=ax)
-        ax.set_xlabel("Canceled")
-        ax.set_ylabel("Total Special Requests")
-        st.pyplot(fig)
-    st.divider()
-
-    # Section 7 - Monthly Customer & Booking Trend
-    # Bisa menggunakan arrival_date_year dan arrival_date_month
-    df['month_year'] = pd.to_datetime(df['arrival_date_year'].astype(str) + '-' + df['arrival_date_month'].astype(str))
-
-    # Lalu baru bisa groupby
-    monthly_summary = df.groupby('month_year').agg({
-        'hotel': 'count',                # jumlah booking
-        'is_canceled': 'mean'            # rata-rata cancellation
-    }).reset_index()
-
-    # Jika belum ada, buat kolom numeric
-    df['canceled_numeric'] = df['is_canceled'].astype(int)
-
-    # Atau langsung pakai 'is_canceled' untuk mean
-    monthly_summary = df.groupby('month_year').agg(
-        total_customers=('total_of_special_requests', 'count'),  # bisa diganti kolom customer unik jika ada
-        total_bookings=('is_canceled', 'count'),
-        avg_cancellation=('is_canceled', 'mean')  # pakai langsung is_canceled
-    ).reset_index()
-
-
-    st.subheader("5️⃣ Monthly Customer & Booking Trend")
-    monthly_summary = df.groupby('month_year').agg(
-        total_customers=('total_of_special_requests', 'count'),  # bisa diganti kolom customer unik jika ada
-        total_bookings=('is_canceled', 'count'),
-        avg_cancellation=('canceled_numeric', 'mean')
-    ).reset_index()
-    
-    # Plot area chart untuk customer & booking
-    fig = px.area(
-        monthly_summary, 
-        x='month_year', 
+def monthly_trend_chart(filters=None):
+    # Ringkasan bulanan (arrival_date_year + arrival_date_month) dari aggregate cube
+    return px.area(
+        load_cube(filters=filters).monthly(),
+        x='month_year',
         y=['total_customers','total_bookings'],
         labels={'value':'Jumlah','month_year':'Bulan'},
         title="Monthly Booking Trend Overview"
     )
-    st.plotly_chart(fig, use_container_width=True)
 
-    # Plot avg cancellation line
-    fig2 = px.line(
-        monthly_summary,
+
+def monthly_cancellation_chart(filters=None):
+    return px.line(
+        load_cube(filters=filters).monthly(),
         x='month_year',
         y='avg_cancellation',
         labels={'avg_cancellation':'Avg Cancellation'},
         title="Average Cancellation Rate per Month"
     )
-    st.plotly_chart(fig2, use_container_width=True)
-    st.divider()
-
 
-    # Section 8 - ADR vs Month & Customer Count
-    st.subheader("6️⃣ ADR vs Month & Customer Count")
-    adr_summary = df.groupby('month_year').agg(
-        avg_adr=('adr', 'mean'),
-        total_customers=('total_of_special_requests', 'count')  # bisa diganti sesuai kolom customer
-    ).reset_index()
 
-    fig = px.bar(
-        adr_summary, 
-        x='month_year', 
-        y='avg_adr', 
-        color='total_customers', 
+def monthly_adr_chart(filters=None):
+    adr_summary = load_cube(filters=filters).monthly()[['month_year', 'avg_adr', 'total_customers']]
+    return px.bar(
+        adr_summary,
+        x='month_year',
+        y='avg_adr',
+        color='total_customers',
         labels={'avg_adr':'Average Daily Rate','month_year':'Bulan','total_customers':'Jumlah Customer'},
         title="Monthly ADR Trend Overview"
     )
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+
+
+# (section, id chart, fungsi, input tambahan) - urutan halaman EDA, untuk snapshot statis
+INSIGHT_CHARTS = [
+    ("1️⃣ Cancellation Rate by Hotel Type", "cancel_rate_hotel", cancel_rate_chart,
+     {"dim": "hotel", "title": "Top 10 Hotels by Cancellation Rate", "top": 10}),
+    ("2️⃣ Market Segment vs Cancellation", "cancel_rate_market_segment", cancel_rate_chart,
+     {"dim": "market_segment", "title": "Cancellation Rate by Market Segment"}),
+    ("3️⃣ Deposit Type vs Cancellation", "cancel_rate_deposit_type", cancel_rate_chart,
+     {"dim": "deposit_type", "title": "Cancellation Rate by Deposit Type"}),
+    ("4️⃣ Special Requests vs Cancellation", "special_requests", special_requests_chart, {}),
+    ("5️⃣ Monthly Customer & Booking Trend", "monthly_trend", monthly_trend_chart, {}),
+    ("5️⃣ Monthly Customer & Booking Trend", "monthly_cancellation", monthly_cancellation_chart, {}),
+    ("6️⃣ ADR vs Month & Customer Count", "monthly_adr", monthly_adr_chart, {}),
+]
+MATPLOTLIB_CHARTS = {"special_requests"}
+
+
+def cached_chart(chart, build, inputs, filters, dataset):
+    # -> ("plotly", dict spec) atau ("png", bytes); hanya dibangun kalau input chart ini berubah
+    key_inputs = dict(inputs, filters=normalize_filters(filters))
+    if chart in MATPLOTLIB_CHARTS:
+        return "png", figure_cache.png(chart, key_inputs, dataset, lambda: build(filters=filters, **inputs))
+    return "plotly", figure_cache.plotly(chart, key_inputs, dataset, lambda: build(filters=filters, **inputs))
+
+
+def show_chart(chart, build, inputs, filters, dataset):
+    kind, figure = cached_chart(chart, build, inputs, filters, dataset)
+    if kind == "png":
+        st.image(figure)
+    else:
+        st.plotly_chart(figure, use_container_width=True)
+
+
+# ---------------------------
+# EDA Page
+# ---------------------------
+def show_eda():
+    st.title("🔍 Exploratory Data Analysis - Hotel Cancellation")
+    df = load_data()
+
+    if df.empty:
+        st.warning("❌ Dataset is empty after loading. Please check the CSV or path.")
+        return
+
+    filters, n_selected, n_total = show_filters()
+    st.caption(f"{n_selected:,} dari {n_total:,} booking ({n_selected / n_total:.1%})")
+    if n_selected == 0:
+        st.info("🔎 Tidak ada booking yang cocok dengan filter ini.")
+        return
+    # Kunci figure cache: isi dataset (bukan mtime), jadi cache di disk tetap berlaku setelah restart
+    dataset = dataset_hash()
+
+    # Section 1 - Preview
+    st.header("📋 Dataset Preview")
+    rows = filtered_rows(filters)
+    st.dataframe(df.head() if rows is None else df.take(rows[:5]))
+    st.divider()
+
+    # Section 2 - Numerical Feature Distribution
+    st.header("📈 Numerical Feature Distribution")
+    selected_num = st.selectbox("Select a numerical column:", NUMERICAL_COLS)
+    show_chart("numerical_distribution", numerical_distribution_chart, {"column": selected_num}, filters, dataset)
+
+    st.subheader("📊 Categorical Feature Analysis")
+    selected_cat = st.selectbox("🔎 Pilih kolom kategorikal untuk dieksplorasi:", CATEGORICAL_COLS)
+    show_chart("categorical_distribution", categorical_distribution_chart, {"column": selected_cat}, filters, dataset)
+
+    st.header("🤔 Insightful Questions")
+    st.divider()
+
+    # Section 3-8 - cancel rate per dimensi, special requests, tren bulanan, ADR
+    previous = None
+    for section, chart, build, inputs in INSIGHT_CHARTS:
+        if section != previous:
+            if previous is not None:
+                st.divider()
+            st.subheader(section)
+            previous = section
+        show_chart(chart, build, inputs, filters, dataset)
+    st.divider()
+
+    stats = figure_cache.stats()
+    st.caption(f"Figure cache: {stats['hits']} hit / {stats['misses']} miss "
+               f"({stats['entries']} entries, {stats['bytes'] / 1e6:.1f} MB)")
+
+
+# ---------------------------
+# Snapshot statis halaman EDA (HTML tunggal, tanpa server Streamlit)
+# ---------------------------
+def export_snapshot(path, filters=None, numerical=None, categorical=None):
+    # Semua pilihan selectbox ikut di-render; chart diambil dari figure cache yang sama
+    import base64
+    import html
+
+    import plotly.io as pio
+
+    dataset = dataset_hash()
+    sections = [("📈 Numerical Feature Distribution", "numerical_distribution", numerical_distribution_chart,
+                 [{"column": c} for c in (numerical or NUMERICAL_COLS)]),
+                ("📊 Categorical Feature Analysis", "categorical_distribution", categorical_distribution_chart,
+                 [{"column": c} for c in (categorical or CATEGORICAL_COLS)])]
+    sections += [(section, chart, build, [inputs]) for section, chart, build, inputs in INSIGHT_CHARTS]
+
+    body, previous, first_plotly = [], None, True
+    for section, chart, build, variants in sections:
+        if section != previous:
+            body.append(f"<h2>{html.escape(section)}</h2>")
+            previous = section
+        for inputs in variants:
+            kind, figure = cached_chart(chart, build, inputs, filters, dataset)
+            if kind == "png":
+                body.append(f'<img src="data:image/png;base64,{base64.b64encode(figure).decode()}">')
+            else:
+                # plotly.js dimuat sekali (CDN) untuk seluruh halaman
+                body.append(pio.to_html(figure, full_html=False, include_plotlyjs="cdn" if first_plotly else False))
+                first_plotly = False
+
+    title = "Exploratory Data Analysis - Hotel Cancellation"
+    active = ", ".join(f"{col} = {' / '.join(values)}" for col, values in normalize_filters(filters))
+    page = (
+        f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(title)}</title></head><body>"
+        f"<h1>🔍 {html.escape(title)}</h1>"
+        f"<p>Filter: {html.escape(active or 'semua booking')} | dataset sha256 {dataset[:12]}</p>\n"
+        + "\n".join(body) + "\n</body></html>\n"
+    )
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(page, encoding="utf-8")
+    return path
@@ -0,0 +1,333 @@
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from src.artifacts import ArtifactError, artifact_version, load_artifact
+from src.schema import CATEGORICAL_COLS
+
+
+# -----------------------------
+# Encoding fitur (cara lama: get_dummies + reindex)
+# -----------------------------
+def encode_frame(df, training_columns):
+    # One-Hot Encoding lalu samakan kolom dengan training (kolom yang tidak ada = 0)
+    encoded = pd.get_dummies(df)
+    return encoded.reindex(columns=training_columns, fill_value=0)
+
+
+def _is_categorical(series):
+    return not (pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series))
+
+
+# -----------------------------
+# Top-K bucketing untuk kolom kategorikal berkardinalitas tinggi (country, ...)
+# -----------------------------
+# Hanya K kategori paling sering yang dapat kolom/kode sendiri; sisanya (dan kategori baru saat
+# serving) masuk ke OTHER_CATEGORY. Sama dengan pilihan "Other" di form Predict.
+TOP_K = 20
+OTHER_CATEGORY = "Other"
+
+
+def top_categories(frame, top_k=TOP_K):
+    # -> {kolom: [kategori yang dipertahankan]} hanya untuk kolom dengan > top_k kategori
+    kept = {}
+    for col in frame.columns:
+        if not _is_categorical(frame[col]):
+            continue
+        counts = frame[col].dropna().astype(str).value_counts()
+        if len(counts) > top_k:
+            # Urut frekuensi, lalu nama (hasil stabil kalau frekuensi sama)
+            ranked = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+            kept[col] = sorted(value for value, _ in ranked[:top_k])
+    return kept
+
+
+def _categories(frame, col, kept):
+    if col in kept:
+        return sorted(set(kept[col]) | {OTHER_CATEGORY})
+    return sorted(str(v) for v in frame[col].dropna().unique())
+
+
+# -----------------------------
+# FeatureEncoder: (kolom, kategori) -> index fitur
+# -----------------------------
+# Hasilnya identik dengan encode_frame, tapi langsung menulis ke array NumPy
+# float32 tanpa membuat DataFrame. Dipakai oleh training, form Predict dan batch scoring.
+class FeatureEncoder:
+    # Default untuk encoder yang di-pickle sebelum ada bucketing
+    other = {}
+    sparse = False
+
+    def __init__(self, feature_names, categorical_cols=CATEGORICAL_COLS, bucketed=(), sparse=False):
+        self.feature_names = list(feature_names)
+        self.numeric = {}      # kolom numerik -> index
+        self.categories = {}   # kolom kategorikal -> {kategori: index}
+
+        # Prefix terpanjang dulu, supaya "arrival_date_month_July" tidak salah pecah
+        prefixes = sorted(categorical_cols, key=len, reverse=True)
+        for idx, name in enumerate(self.feature_names):
+            for col in prefixes:
+                if name.startswith(col + "_"):
+                    self.categories.setdefault(col, {})[name[len(col) + 1:]] = idx
+                    break
+            else:
+                self.numeric[name] = idx
+        # Kolom yang di-bucket: kategori di luar vocabulary -> index kolom OTHER_CATEGORY
+        self.other = {col: self.categories[col][OTHER_CATEGORY] for col in bucketed}
+        # sparse=True: training memakai transform_sparse (CSR), serving tetap dense
+        self.sparse = sparse
+
+    @classmethod
+    def fit(cls, frame, top_k=None, sparse=False):
+        # Urutan kolom sama dengan pd.get_dummies: numerik dulu, lalu dummy per kolom (kategori terurut)
+        numeric = [c for c in frame.columns if not _is_categorical(frame[c])]
+        categorical = [c for c in frame.columns if _is_categorical(frame[c])]
+        kept = top_categories(frame, top_k) if top_k else {}
+        names = list(numeric)
+        for col in categorical:
+            names += [f"{col}_{v}" for v in _categories(frame, col, kept)]
+        return cls(names, categorical, bucketed=list(kept), sparse=sparse)
+
+    @property
+    def n_features(self):
+        return len(self.feature_names)
+
+    def source_columns(self):
+        # index fitur -> kolom asal (untuk agregasi balik one-hot ke field form)
+        sources = [None] * self.n_features
+        for col, idx in self.numeric.items():
+            sources[idx] = col
+        for col, cats in self.categories.items():
+            for idx in cats.values():
+                sources[idx] = col
+        return sources
+
+    def numeric_index(self, col):
+        return self.numeric[col]
+
+    # -----------------------------
+    # Satu baris (form Predict)
+    # -----------------------------
+    def transform_record(self, record, out=None):
+        if out is None:
+            out = np.zeros(self.n_features, dtype=np.float32)
+        else:
+            out.fill(0)
+        for col, value in record.items():
+            idx = self.numeric.get(col)
+            if idx is not None:
+                out[idx] = np.nan if value is None else value
+                continue
+            cats = self.categories.get(col)
+            if cats is not None and value is not None:
+                idx = cats.get(value if isinstance(value, str) else str(value), self.other.get(col))
+                if idx is not None:
+                    out[idx] = 1
+        return out
+
+    def transform_records(self, records):
+        out = np.zeros((len(records), self.n_features), dtype=np.float32)
+        for i, record in enumerate(records):
+            self.transform_record(record, out=out[i])
+        return out
+
+    # -----------------------------
+    # Banyak baris (batch / training)
+    # -----------------------------
+    def transform_frame(self, frame, out=None):
+        n = len(frame)
+        if out is None:
+            out = np.zeros((n, self.n_features), dtype=np.float32)
+        else:
+            out.fill(0)
+        flat = out.reshape(-1)
+        row_start = np.arange(n, dtype=np.int64) * self.n_features
+
+        for col, idx in self.numeric.items():
+            if col in frame.columns:
+                out[:, idx] = frame[col].to_numpy(dtype=np.float32, na_value=np.nan)
+
+        for col, feat in self._category_features(frame):
+            hit = feat >= 0
+            flat[row_start[hit] + feat[hit]] = 1
+        return out
+
+    def _category_features(self, frame):
+        # -> (kolom, index fitur per baris); -1 = NaN / kategori tidak dikenal
+        for col, cats in self.categories.items():
+            if col not in frame.columns:
+                continue
+            # Map nilai unik (sedikit) ke index fitur, lalu scatter lewat codes
+            codes, uniques = pd.factorize(frame[col])
+            other = self.other.get(col, -1)
+            lookup = np.array([cats.get(str(v), other) for v in uniques] + [-1], dtype=np.int64)
+            yield col, lookup[codes]   # code -1 (NaN) -> -1
+
+    def transform_sparse(self, frame):
+        # CSR float32 langsung dari index (tanpa matrix dense n x n_features); hasil sama dengan transform_frame
+        n = len(frame)
+        rows, cols, data = [], [], []
+        for col, idx in self.numeric.items():
+            if col not in frame.columns:
+                continue
+            values = frame[col].to_numpy(dtype=np.float32, na_value=np.nan)
+            nz = np.flatnonzero(values != 0)   # NaN ikut disimpan
+            rows.append(nz)
+            cols.append(np.full(len(nz), idx, dtype=np.int64))
+            data.append(values[nz])
+        for col, feat in self._category_features(frame):
+            hit = np.flatnonzero(feat >= 0)
+            rows.append(hit)
+            cols.append(feat[hit])
+            data.append(np.ones(len(hit), dtype=np.float32))
+        if not rows:
+            return sparse.csr_matrix((n, self.n_features), dtype=np.float32)
+        return sparse.csr_matrix(
+            (np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(n, self.n_features), dtype=np.float32,
+        )
+
+    def transform_training(self, frame):
+        return self.transform_sparse(frame) if self.sparse else self.transform_frame(frame)
+
+
+# -----------------------------
+# OrdinalEncoder: satu kolom per fitur, kategori -> kode integer
+# -----------------------------
+# Interface sama dengan FeatureEncoder. Kategori tidak dikenal -> -1, NaN tetap NaN.
+class OrdinalEncoder:
+    other = {}
+
+    def __init__(self, feature_names, vocabulary, bucketed=()):
+        self.feature_names = list(feature_names)
+        self.index = {col: i for i, col in enumerate(self.feature_names)}
+        self.vocabulary = {col: list(cats) for col, cats in vocabulary.items()}
+        self.codes = {col: {c: i for i, c in enumerate(cats)} for col, cats in self.vocabulary.items()}
+        # Kolom yang di-bucket: kategori di luar vocabulary -> kode OTHER_CATEGORY (bukan -1)
+        self.other = {col: self.codes[col][OTHER_CATEGORY] for col in bucketed}
+
+    @classmethod
+    def fit(cls, frame, top_k=None):
+        kept = top_categories(frame, top_k) if top_k else {}
+        vocabulary = {col: _categories(frame, col, kept) for col in frame.columns if _is_categorical(frame[col])}
+        return cls(frame.columns, vocabulary, bucketed=list(kept))
+
+    @property
+    def n_features(self):
+        return len(self.feature_names)
+
+    def source_columns(self):
+        return list(self.feature_names)
+
+    def numeric_index(self, col):
+        if col in self.codes:
+            raise KeyError(col)
+        return self.index[col]
+
+    def transform_record(self, record, out=None):
+        if out is None:
+            out = np.zeros(self.n_features, dtype=np.float32)
+        else:
+            out.fill(0)
+        for col, value in record.items():
+            idx = self.index.get(col)
+            if idx is None:
+                continue
+            codes = self.codes.get(col)
+            if value is None:
+                out[idx] = np.nan
+            elif codes is None:
+                out[idx] = value
+            else:
+                out[idx] = codes.get(value if isinstance(value, str) else str(value), self.other.get(col, -1))
+        return out
+
+    def transform_records(self, records):
+        out = np.zeros((len(records), self.n_features), dtype=np.float32)
+        for i, record in enumerate(records):
+            self.transform_record(record, out=out[i])
+        return out
+
+    def transform_frame(self, frame, out=None):
+        if out is None:
+            out = np.zeros((len(frame), self.n_features), dtype=np.float32)
+        else:
+            out.fill(0)
+        for col, idx in self.index.items():
+            if col not in frame.columns:
+                continue
+            codes = self.codes.get(col)
+            if codes is None:
+                out[:, idx] = frame[col].to_numpy(dtype=np.float32, na_value=np.nan)
+                continue
+            raw, uniques = pd.factorize(frame[col])
+            other = self.other.get(col, -1)
+            lookup = np.array([codes.get(str(v), other) for v in uniques] + [np.nan], dtype=np.float32)
+            out[:, idx] = lookup[raw]   # code -1 (NaN) -> NaN
+        return out
+
+    def transform_training(self, frame):
+        return self.transform_frame(frame)
+
+
+# -----------------------------
+# Grid what-if: satu record, dua kolom numerik divariasikan
+# -----------------------------
+def transform_grid(encoder, record, row_col, row_values, col_col, col_values):
+    # Record di-encode sekali lalu di-broadcast; hanya dua kolom grid yang diisi ulang.
+    # Baris hasil berurutan row-major: (row_values[i], col_values[j]) -> i * len(col_values) + j
+    base = encoder.transform_record(record)
+    n_rows, n_cols = len(row_values), len(col_values)
+    X = np.broadcast_to(base, (n_rows * n_cols, encoder.n_features)).copy()
+    X[:, encoder.numeric_index(row_col)] = np.repeat(np.asarray(row_values, dtype=np.float32), n_cols)
+    X[:, encoder.numeric_index(col_col)] = np.tile(np.asarray(col_values, dtype=np.float32), n_rows)
+    return X
+
+
+# Nama encoding (dipakai train.py --encoding) -> (class, opsi fit)
+# sparse_topk: matrix paling kecil, tapi splitter sparse sklearn jauh lebih lambat untuk fit
+# (lihat benchmarks/encoding.py); ordinal_topk / onehot_topk biasanya pilihan yang lebih cepat.
+ENCODERS = {
+    "onehot": (FeatureEncoder, {}),
+    "ordinal": (OrdinalEncoder, {}),
+    "onehot_topk": (FeatureEncoder, {"top_k": TOP_K}),
+    "sparse_topk": (FeatureEncoder, {"top_k": TOP_K, "sparse": True}),
+    "ordinal_topk": (OrdinalEncoder, {"top_k": TOP_K}),
+}
+
+
+def fit_encoder(frame, encoding="onehot", top_k=None):
+    cls, options = ENCODERS[encoding]
+    options = dict(options)
+    if top_k is not None and "top_k" in options:
+        options["top_k"] = top_k
+    return cls.fit(frame, **options)
+
+
+# -----------------------------
+# Encoder yang konsisten dengan model aktif
+# -----------------------------
+_encoders = {}
+_lock = threading.Lock()
+
+
+def load_encoder(models_dir=None):
+    training_columns = load_artifact("training_columns", models_dir=models_dir)
+    key = (str(models_dir), artifact_version("training_columns", models_dir))
+    encoder = _encoders.get(key)
+    if encoder is not None:
+        return encoder
+
+    with _lock:
+        if key not in _encoders:
+            try:
+                encoder = load_artifact("feature_encoder", models_dir=models_dir)
+            except ArtifactError:
+                encoder = None
+            # Encoder harus cocok dengan kolom model; kalau tidak, bangun ulang dari training_columns
+            if encoder is None or encoder.feature_names != list(training_columns):
+                encoder = FeatureEncoder(training_columns)
+            _encoders[key] = encoder
+        return _encoders[key]
@@ -0,0 +1,158 @@
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from src import timing
+
+# -----------------------------
+# Cache figure EDA: spec Plotly (JSON) & PNG matplotlib, disimpan ke disk
+# -----------------------------
+# Kunci = hash isi dataset + id chart + input chart itu sendiri (kolom yang dipilih, filter, ...),
+# jadi rerun hanya membangun ulang chart yang inputnya berubah, dan cache tetap berlaku
+# setelah restart selama isi dataset sama. Dibatasi jumlah entry & total byte (LRU per mtime).
+CACHE_DIR = Path(os.environ.get("HOTEL_FIGURE_CACHE", Path(__file__).parent.parent / ".cache" / "figures"))
+MAX_ENTRIES = 512
+MAX_BYTES = 128 << 20
+# Naikkan kalau tampilan chart berubah, supaya entry lama tidak dipakai
+FIGURE_VERSION = 1
+
+
+def figure_key(kind, chart, inputs, dataset):
+    raw = json.dumps([FIGURE_VERSION, kind, chart, inputs, dataset], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+class FigureCache:
+    MEMORY_ENTRIES = 64
+
+    def __init__(self, cache_dir=CACHE_DIR, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._index = None          # nama file -> (mtime, size), urut dari yang paling lama
+        self._lock = threading.Lock()
+
+    def _load_index(self):
+        if self._index is None:
+            entries = []
+            if self.cache_dir.exists():
+                for path in self.cache_dir.iterdir():
+                    if path.suffix in (".json", ".png"):
+                        stat = path.stat()
+                        entries.append((stat.st_mtime, path.name, stat.st_size))
+            self._index = OrderedDict((name, size) for _, name, size in sorted(entries))
+        return self._index
+
+    def _remember(self, name, value):
+        self._memory[name] = value
+        self._memory.move_to_end(name)
+        while len(self._memory) > self.MEMORY_ENTRIES:
+            self._memory.popitem(last=False)
+
+    def _read(self, name):
+        with self._lock:
+            index = self._load_index()
+            if name in self._memory:
+                self._memory.move_to_end(name)
+                # Entry yang gagal ditulis (folder read-only) hanya ada di memory, tidak di index
+                if name in index:
+                    index.move_to_end(name)
+                return self._memory[name]
+            if name not in index:
+                return None
+            path = self.cache_dir / name
+            try:
+                data = path.read_bytes()
+                os.utime(path)   # LRU: entry yang dipakai jadi yang paling baru
+            except OSError:
+                del index[name]
+                return None
+            index.move_to_end(name)
+            value = json.loads(data) if name.endswith(".json") else data
+            self._remember(name, value)
+            return value
+
+    def _write(self, name, data, value):
+        with self._lock:
+            index = self._load_index()
+            self._remember(name, value)
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                tmp = self.cache_dir / f".{name}.tmp"
+                tmp.write_bytes(data)
+                os.replace(tmp, self.cache_dir / name)
+            except OSError:
+                return      # folder cache read-only: tetap dipakai dari memory
+            index[name] = len(data)
+            index.move_to_end(name)
+            total = sum(index.values())
+            while index and (len(index) > self.max_entries or total > self.max_bytes):
+                old, size = index.popitem(last=False)
+                total -= size
+                self._memory.pop(old, None)
+                try:
+                    (self.cache_dir / old).unlink()
+                except OSError:
+                    pass
+
+    def _get(self, kind, suffix, chart, inputs, dataset, build, encode):
+        name = figure_key(kind, chart, inputs, dataset) + suffix
+        value = self._read(name)
+        if value is not None:
+            self.hits += 1
+            timing.count("figure_cache", "hit")
+            return value
+        self.misses += 1
+        timing.count("figure_cache", "miss")
+        with timing.timed("figure", chart):
+            data, value = encode(build())
+        self._write(name, data, value)
+        return value
+
+    # -----------------------------
+    # API
+    # -----------------------------
+    def plotly(self, chart, inputs, dataset, build):
+        # -> dict spec Plotly (bisa langsung ke st.plotly_chart); build() -> go.Figure
+        def encode(fig):
+            text = fig.to_json()
+            return text.encode("utf-8"), json.loads(text)
+        return self._get("plotly", ".json", chart, inputs, dataset, build, encode)
+
+    def png(self, chart, inputs, dataset, build, dpi=100):
+        # -> bytes PNG; build() -> matplotlib Figure (ditutup setelah dirender)
+        def encode(fig):
+            import matplotlib.pyplot as plt
+
+            buf = io.BytesIO()
+            fig.savefig(buf, format="png", dpi=dpi, bbox_inches="tight")
+            plt.close(fig)
+            return buf.getvalue(), buf.getvalue()
+        return self._get("png", ".png", chart, inputs, dataset, build, encode)
+
+    def stats(self):
+        with self._lock:
+            index = self._load_index()
+            return {"hits": self.hits, "misses": self.misses, "entries": len(index),
+                    "bytes": sum(index.values()), "max_entries": self.max_entries, "max_bytes": self.max_bytes}
+
+    def clear(self):
+        with self._lock:
+            for name in list(self._load_index()):
+                try:
+                    (self.cache_dir / name).unlink()
+                except OSError:
+                    pass
+            self._index.clear()
+            self._memory.clear()
+
+
+# Satu cache per proses, dibagi semua session Streamlit
+figure_cache = FigureCache()
@@ -0,0 +1,166 @@
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src import timing
+from src.data import DATA_DIR, DEFAULT_DATASET, dataset_version, read_bookings
+
+# -----------------------------
+# Index filter EDA: satu bitmap (np.packbits) per nilai kolom filter
+# -----------------------------
+# Filter = OR bitmap nilai yang dipilih dalam satu kolom, lalu AND antar kolom.
+# Satu bitmap = n/8 byte, jadi 10 juta baris ~1.25 MB per nilai; operasi filter
+# hanya bitwise pada array byte, tanpa membandingkan string per baris.
+FILTER_COLUMNS = ["hotel", "arrival_date_year", "market_segment", "deposit_type"]
+
+# Jumlah bit 1 per byte (untuk menghitung baris tanpa unpack)
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def normalize_filters(filters):
+    # {"hotel": ["City Hotel"], "deposit_type": []} -> (("hotel", ("City Hotel",)),)
+    # Pilihan kosong = tidak difilter. Hasilnya hashable, dipakai sebagai kunci cache.
+    if not filters:
+        return ()
+    return tuple(sorted((col, tuple(sorted(str(v) for v in values))) for col, values in filters.items() if values))
+
+
+class FilterIndex:
+    def __init__(self, n_rows, bitmaps, version=None):
+        # bitmaps[col][value] = uint8 array (np.packbits dari mask baris)
+        self.n_rows = n_rows
+        self.bitmaps = bitmaps
+        self.version = version
+
+    @classmethod
+    def build(cls, frame, columns=FILTER_COLUMNS, version=None):
+        bitmaps = {}
+        for col in columns:
+            # factorize sekali, lalu satu mask per nilai unik (bukan per baris)
+            codes, uniques = pd.factorize(frame[col], sort=True)
+            bitmaps[col] = {str(value): np.packbits(codes == i) for i, value in enumerate(uniques)}
+        return cls(len(frame), bitmaps, version)
+
+    def values(self, col):
+        return list(self.bitmaps[col])
+
+    def bitmap(self, filters):
+        # None = semua baris
+        result = None
+        for col, values in normalize_filters(filters):
+            table = self.bitmaps[col]
+            selected = None
+            for value in values:
+                bits = table.get(value)
+                if bits is None:
+                    continue
+                selected = bits.copy() if selected is None else np.bitwise_or(selected, bits, out=selected)
+            if selected is None:
+                return np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+            result = selected if result is None else np.bitwise_and(result, selected, out=result)
+        return result
+
+    def count(self, filters):
+        bits = self.bitmap(filters)
+        return self.n_rows if bits is None else int(_POPCOUNT[bits].sum(dtype=np.int64))
+
+    def rows(self, filters):
+        # Index baris (int64, urut) yang lolos semua filter
+        bits = self.bitmap(filters)
+        if bits is None:
+            return np.arange(self.n_rows)
+        return np.flatnonzero(np.unpackbits(bits, count=self.n_rows))
+
+    # -----------------------------
+    # Simpan / muat (.npz: satu array per kolom/nilai)
+    # -----------------------------
+    def save(self, path):
+        arrays = {f"{i}:{j}": bits for i, col in enumerate(self.bitmaps)
+                  for j, bits in enumerate(self.bitmaps[col].values())}
+        labels = np.array([f"{i}:{j}\t{col}\t{value}" for i, col in enumerate(self.bitmaps)
+                           for j, value in enumerate(self.bitmaps[col])], dtype=object)
+        tmp = path.with_suffix(".tmp.npz")
+        np.savez(tmp, n_rows=self.n_rows, version=str(self.version), labels=labels.astype(str), **arrays)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            bitmaps = {}
+            for label in data["labels"]:
+                key, col, value = str(label).split("\t")
+                bitmaps.setdefault(col, {})[value] = data[key]
+            return cls(int(data["n_rows"]), bitmaps, str(data["version"]))
+
+
+# -----------------------------
+# Index per versi dataset (disimpan di data/<nama>.filters.npz)
+# -----------------------------
+_indexes = {}
+_lock = threading.Lock()
+
+
+def filter_index_path(name=DEFAULT_DATASET, data_dir=None):
+    return Path(data_dir or DATA_DIR) / f"{name}.filters.npz"
+
+
+def load_filter_index(name=DEFAULT_DATASET, data_dir=None):
+    version = dataset_version(name, data_dir)
+    key = (name, version)
+    index = _indexes.get(key)
+    if index is not None:
+        return index
+
+    with _lock:
+        if key in _indexes:
+            return _indexes[key]
+        path = filter_index_path(name, data_dir)
+        index = None
+        try:
+            index = FilterIndex.load(path)
+        except (OSError, ValueError, KeyError):
+            pass
+        if index is None or index.version != version or set(index.bitmaps) != set(FILTER_COLUMNS):
+            with timing.timed("filters", "build_index"):
+                index = FilterIndex.build(read_bookings(name, columns=FILTER_COLUMNS, data_dir=data_dir),
+                                          version=version)
+            try:
+                index.save(path)
+            except OSError:
+                pass  # folder data read-only: index tetap dipakai dari memory
+        for old in [k for k in _indexes if k[0] == name]:
+            del _indexes[old]
+        _indexes[key] = index
+        return index
+
+
+# -----------------------------
+# Subset baris hasil filter (dibatasi, supaya rerun dengan filter yang sama tidak dihitung ulang)
+# -----------------------------
+MAX_SUBSETS = 16
+_subsets = OrderedDict()
+
+
+def filtered_rows(filters, name=DEFAULT_DATASET, data_dir=None):
+    # None kalau tidak ada filter aktif (pakai cube/ringkasan seluruh tabel)
+    fkey = normalize_filters(filters)
+    if not fkey:
+        return None
+    index = load_filter_index(name, data_dir)
+    key = (name, index.version, fkey)
+    with _lock:
+        rows = _subsets.get(key)
+        if rows is not None:
+            _subsets.move_to_end(key)
+            return rows
+    with timing.timed("filters", "intersect"):
+        rows = index.rows(dict(fkey))
+    rows.setflags(write=False)
+    with _lock:
+        _subsets[key] = rows
+        while len(_subsets) > MAX_SUBSETS:
+            _subsets.popitem(last=False)
+    return rows
@@ -0,0 +1,405 @@
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from src import timing
+from src.artifacts import MODELS_DIR, ArtifactNotFoundError, artifact_version, load_artifact, publish
+
+
+# -----------------------------
+# FlatForest: RandomForest -> array node yang contiguous
+# -----------------------------
+# Semua tree digabung jadi satu set array (index node global). Traversal dilakukan
+# untuk semua (baris, tree) sekaligus, dan label + probabilitas keluar dari satu pass.
+# Probabilitas identik (bit-for-bit) dengan RandomForestClassifier.predict_proba:
+# nilai leaf dinormalisasi per tree, dijumlah berurutan per tree, lalu dibagi jumlah tree.
+class FlatForest:
+    # Batas jumlah pasangan (baris, tree) per blok supaya memory tetap kecil
+    BLOCK_PAIRS = 1 << 20
+    # Seberapa sering pasangan yang sudah di leaf dibuang dari active set
+    COMPACT_EVERY = 4
+
+    def __init__(self, feature, threshold, left, right, value, missing_left, roots, classes, n_features):
+        self.feature = feature            # int32, fitur yang di-split (0 untuk leaf)
+        self.threshold = threshold        # float64, sama dengan sklearn
+        self.left = left                  # int32, index global anak kiri (-1 untuk leaf)
+        self.right = right                # int32, index global anak kanan (-1 untuk leaf)
+        self.value = value                # float64 (n_nodes, n_classes), sudah dinormalisasi per node
+        self.missing_left = missing_left  # bool, arah nilai NaN
+        self.roots = roots                # int32, node root tiap tree
+        self.classes = classes
+        self.n_features = n_features
+        self._walk = self._prepare()
+
+    @classmethod
+    def from_sklearn(cls, rf):
+        feature, threshold, left, right, value, missing_left, roots = [], [], [], [], [], [], []
+        offset = 0
+        for est in rf.estimators_:
+            tree = est.tree_
+            n = tree.node_count
+            is_leaf = tree.children_left == -1
+            roots.append(offset)
+
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            left.append(np.where(is_leaf, -1, tree.children_left + offset))
+            right.append(np.where(is_leaf, -1, tree.children_right + offset))
+
+            # Sama seperti DecisionTreeClassifier.predict_proba
+            proba = tree.value[:, 0, : rf.n_classes_].astype(np.float64)
+            normalizer = proba.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            value.append(proba / normalizer)
+
+            mgl = getattr(tree, "missing_go_to_left", None)
+            missing_left.append(np.zeros(n, dtype=bool) if mgl is None else mgl.astype(bool))
+            offset += n
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(feature), dtype=np.int32),
+            threshold=np.ascontiguousarray(np.concatenate(threshold), dtype=np.float64),
+            left=np.ascontiguousarray(np.concatenate(left), dtype=np.int32),
+            right=np.ascontiguousarray(np.concatenate(right), dtype=np.int32),
+            value=np.ascontiguousarray(np.concatenate(value), dtype=np.float64),
+            missing_left=np.concatenate(missing_left),
+            roots=np.asarray(roots, dtype=np.int32),
+            classes=np.asarray(rf.classes_),
+            n_features=rf.n_features_in_,
+        )
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    def _check_X(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"X punya {X.shape[1]} fitur, model butuh {self.n_features}.")
+        return np.ascontiguousarray(X)
+
+    # -----------------------------
+    # Traversal: index leaf untuk tiap (baris, tree)
+    # -----------------------------
+    def apply(self, X):
+        X = self._check_X(X)
+        leaves = np.empty((X.shape[0], self.n_trees), dtype=np.int32)
+        for start, stop in self._blocks(X.shape[0]):
+            leaves[start:stop] = self._apply_block(X[start:stop])
+        return leaves
+
+    def _blocks(self, n):
+        step = max(1, self.BLOCK_PAIRS // self.n_trees)
+        for start in range(0, n, step):
+            yield start, min(start + step, n)
+
+    def _prepare(self):
+        # Array traversal: leaf menunjuk ke dirinya sendiri (threshold +inf), jadi
+        # pasangan yang sudah sampai leaf tetap diam tanpa perlu cek tiap langkah
+        is_leaf = self.left < 0
+        node_ids = np.arange(self.n_nodes, dtype=np.int32)
+        child = np.empty((self.n_nodes, 2), dtype=np.int32)
+        child[:, 0] = np.where(is_leaf, node_ids, self.left)
+        child[:, 1] = np.where(is_leaf, node_ids, self.right)
+        return (
+            is_leaf,
+            child.reshape(-1),
+            np.where(is_leaf, np.inf, self.threshold),
+            self.feature.astype(np.intp),
+            self.missing_left & ~is_leaf,
+        )
+
+    def _apply_block(self, X):
+        is_leaf, child, threshold, feature, missing_left = self._walk
+        n, n_trees = X.shape[0], self.n_trees
+        X_flat = X.reshape(-1)
+        out = np.empty(n * n_trees, dtype=np.int32)
+        node = np.tile(self.roots, n)
+        base = np.repeat(np.arange(n, dtype=np.intp) * X.shape[1], n_trees)
+        pos = np.arange(n * n_trees, dtype=np.intp)
+        has_nan = bool(np.isnan(X_flat).any())
+
+        step = 0
+        while node.size:
+            x = X_flat[base + feature[node]]
+            go_right = ~(x <= threshold[node])
+            if has_nan:
+                go_right &= ~(np.isnan(x) & missing_left[node])
+            node = child[2 * node.astype(np.intp) + go_right]
+            step += 1
+            if step % self.COMPACT_EVERY == 0 or node.size <= n_trees:
+                # Pasangan yang sudah sampai leaf dikeluarkan dari active set
+                done = is_leaf[node]
+                if done.any():
+                    out[pos[done]] = node[done]
+                    active = ~done
+                    node, base, pos = node[active], base[active], pos[active]
+        return out.reshape(n, n_trees)
+
+    # -----------------------------
+    # Prediksi: label + probabilitas dari satu traversal
+    # -----------------------------
+    def predict_proba(self, X):
+        X = self._check_X(X)
+        proba = np.empty((X.shape[0], len(self.classes)), dtype=np.float64)
+        for start, stop in self._blocks(X.shape[0]):
+            leaf_value = self.value[self._apply_block(X[start:stop])]   # (n, n_trees, n_classes)
+            acc = np.zeros(proba[start:stop].shape, dtype=np.float64)
+            # Jumlah berurutan per tree (urutan sama dengan sklearn, n_jobs=1)
+            for t in range(self.n_trees):
+                acc += leaf_value[:, t]
+            acc /= self.n_trees
+            proba[start:stop] = acc
+        return proba
+
+    def predict_with_proba(self, X):
+        proba = self.predict_proba(X)
+        return self.classes.take(np.argmax(proba, axis=1)), proba
+
+    def predict(self, X):
+        return self.predict_with_proba(X)[0]
+
+    # -----------------------------
+    # Grid what-if: satu record, dua fitur numerik divariasikan
+    # -----------------------------
+    # Dengan fitur lain tetap, tiap tree membagi bidang (row, col) jadi persegi panjang per leaf.
+    # Tree cukup ditelusuri sekali per persegi (bukan sekali per sel), lalu nilai leaf diisikan ke
+    # potongan grid. Biaya tergantung jumlah leaf yang terjangkau, hampir tidak tergantung ukuran grid.
+    # Hasil identik (bit-for-bit) dengan predict_proba(transform_grid(...))[:, class_index].
+    def predict_grid(self, x, row_feature, row_values, col_feature, col_values, class_index=1):
+        x = self._check_X(x)[0].astype(np.float64)
+        rows = np.asarray(row_values, dtype=np.float32).astype(np.float64)
+        cols = np.asarray(col_values, dtype=np.float32).astype(np.float64)
+        if row_feature == col_feature or np.any(np.diff(rows) < 0) or np.any(np.diff(cols) < 0):
+            raise ValueError("row_feature & col_feature harus berbeda, nilai grid harus urut naik.")
+        is_leaf = self.left < 0
+
+        # Frontier: (node, tree, range baris [r0, r1), range kolom [c0, c1))
+        node = self.roots.astype(np.intp)
+        tree = np.arange(self.n_trees, dtype=np.intp)
+        r0, r1 = np.zeros_like(node), np.full_like(node, len(rows))
+        c0, c1 = np.zeros_like(node), np.full_like(node, len(cols))
+        leaves = []
+        while node.size:
+            done = is_leaf[node]
+            if done.any():
+                leaves.append((node[done], tree[done], r0[done], r1[done], c0[done], c1[done]))
+                keep = ~done
+                node, tree, r0, r1, c0, c1 = node[keep], tree[keep], r0[keep], r1[keep], c0[keep], c1[keep]
+                if not node.size:
+                    break
+            feature, threshold = self.feature[node], self.threshold[node]
+            on_row, on_col = feature == row_feature, feature == col_feature
+            # Fitur tetap: arah sama untuk seluruh persegi (aturan NaN sama dengan _apply_block)
+            value = x[feature]
+            go_right = ~(value <= threshold) & ~(np.isnan(value) & self.missing_left[node])
+            # Fitur grid: persegi dipotong di jumlah nilai <= threshold
+            cut_r = np.clip(np.searchsorted(rows, threshold, side="right"), r0, r1)
+            cut_c = np.clip(np.searchsorted(cols, threshold, side="right"), c0, c1)
+            fixed = ~(on_row | on_col)
+            split_l = ~fixed
+            node = np.concatenate([np.where(go_right[fixed], self.right[node[fixed]], self.left[node[fixed]]),
+                                   self.left[node[split_l]], self.right[node[split_l]]]).astype(np.intp)
+            tree = np.concatenate([tree[fixed], tree[split_l], tree[split_l]])
+            lr1 = np.where(on_row, cut_r, r1)[split_l]
+            rr0 = np.where(on_row, cut_r, r0)[split_l]
+            lc1 = np.where(on_col, cut_c, c1)[split_l]
+            rc0 = np.where(on_col, cut_c, c0)[split_l]
+            r0, r1 = np.concatenate([r0[fixed], r0[split_l], rr0]), np.concatenate([r1[fixed], lr1, r1[split_l]])
+            c0, c1 = np.concatenate([c0[fixed], c0[split_l], rc0]), np.concatenate([c1[fixed], lc1, c1[split_l]])
+            # Persegi kosong tidak perlu ditelusuri lagi
+            keep = (r0 < r1) & (c0 < c1)
+            node, tree, r0, r1, c0, c1 = node[keep], tree[keep], r0[keep], r1[keep], c0[keep], c1[keep]
+
+        grid = np.zeros((len(rows), len(cols)), dtype=np.float64)
+        if leaves:
+            node, tree, r0, r1, c0, c1 = (np.concatenate(parts) for parts in zip(*leaves))
+            # Urut per tree: tiap sel dijumlah dengan urutan yang sama seperti predict_proba
+            for i in np.argsort(tree, kind="stable"):
+                grid[r0[i]:r1[i], c0[i]:c1[i]] += self.value[node[i], class_index]
+        return grid / self.n_trees
+
+    # -----------------------------
+    # Kontribusi per fitur (gaya treeinterpreter), satu traversal per tree
+    # -----------------------------
+    # P(kelas) = bias + sum(kontribusi): bias = rata-rata nilai root, dan tiap split di jalur
+    # menyumbang (nilai node anak - nilai node parent) ke fitur yang di-split.
+    def prepare_explain(self, class_index=1):
+        # Dihitung sekali per kelas (saat warm-up): selisih nilai node terhadap parent + fitur split parent
+        cached = getattr(self, "_explain_cache", None)
+        if cached is None:
+            cached = self._explain_cache = {}
+        if class_index not in cached:
+            internal = np.flatnonzero(self.left >= 0)
+            parent = np.full(self.n_nodes, -1, dtype=np.intp)
+            parent[self.left[internal]] = internal
+            parent[self.right[internal]] = internal
+            has_parent = parent >= 0
+            gain = np.zeros(self.n_nodes, dtype=np.float64)
+            gain[has_parent] = self.value[has_parent, class_index] - self.value[parent[has_parent], class_index]
+            split_feature = np.zeros(self.n_nodes, dtype=np.intp)
+            split_feature[has_parent] = self.feature[parent[has_parent]]
+            cached[class_index] = (gain, split_feature)
+        return cached[class_index]
+
+    def explain(self, X, class_index=1):
+        # -> bias (n,), kontribusi (n, n_features) untuk kelas ke-class_index
+        X = self._check_X(X)
+        is_leaf, child, threshold, feature, missing_left = self._walk
+        gain, split_feature = self.prepare_explain(class_index)
+        n, n_features = X.shape
+        X_flat = X.reshape(-1)
+        contrib = np.zeros(n * n_features, dtype=np.float64)
+        node = np.tile(self.roots, n).astype(np.intp)
+        row = np.repeat(np.arange(n, dtype=np.intp), self.n_trees)
+        has_nan = bool(np.isnan(X_flat).any())
+
+        while node.size:
+            x = X_flat[row * n_features + feature[node]]
+            go_right = ~(x <= threshold[node])
+            if has_nan:
+                go_right &= ~(np.isnan(x) & missing_left[node])
+            node = child[2 * node + go_right]
+            contrib += np.bincount(row * n_features + split_feature[node], weights=gain[node],
+                                   minlength=contrib.size)
+            active = ~is_leaf[node]
+            node, row = node[active], row[active]
+
+        bias = np.full(n, self.value[self.roots, class_index].mean())
+        return bias, contrib.reshape(n, n_features) / self.n_trees
+
+
+# -----------------------------
+# FlatForest untuk model aktif (sekali per versi model, per proses)
+# -----------------------------
+_forests = {}
+_lock = threading.Lock()
+
+
+def publish_flat_forest(models_dir=None, rf=None):
+    # Simpan FlatForest (termasuk array traversal) tanpa kompresi sebagai artifact "rf_flat",
+    # supaya bisa di-mmap: semua worker di satu host berbagi page read-only yang sama
+    # (RandomForestClassifier sendiri selalu menyalin array tree saat unpickle).
+    import joblib
+
+    models_dir = Path(models_dir or MODELS_DIR)
+    source_version = artifact_version("rf_model", models_dir)
+    forest = FlatForest.from_sklearn(rf if rf is not None else load_artifact("rf_model", models_dir=models_dir))
+    forest.source_version = source_version
+    models_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=models_dir) as tmp:
+        path = Path(tmp) / "rf_flat.pkl"
+        joblib.dump(forest, path, compress=0)
+        return publish("rf_flat", path, models_dir=models_dir, source=source_version)
+
+
+def _load_shared(models_dir, source_version):
+    try:
+        forest = load_artifact("rf_flat", models_dir=models_dir, mmap=True)
+    except ArtifactNotFoundError:
+        return None
+    # rf_flat yang dibuat dari versi rf_model lain tidak dipakai
+    return forest if getattr(forest, "source_version", None) == source_version else None
+
+
+def load_forest(models_dir=None):
+    key = (str(models_dir), artifact_version("rf_model", models_dir))
+    forest = _forests.get(key)
+    if forest is not None:
+        return forest
+    with _lock:
+        if key not in _forests:
+            forest = _load_shared(models_dir, key[1])
+            if forest is None:
+                forest = FlatForest.from_sklearn(load_artifact("rf_model", models_dir=models_dir))
+            _forests[key] = forest
+        return _forests[key]
+
+
+# -----------------------------
+# Cache prediksi (LRU, per proses, dibagi semua session Streamlit)
+# -----------------------------
+# Kunci = vektor fitur hasil encoder (float32, -0.0 dan NaN dinormalisasi).
+# Isi cache otomatis dibuang saat versi artifact rf_model berubah.
+class PredictionCache:
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(x):
+        x = np.array(x, dtype=np.float32).reshape(-1)
+        x[x == 0] = 0.0
+        x[np.isnan(x)] = np.nan
+        return x.tobytes()
+
+    def get(self, key, version):
+        with self._lock:
+            if version != self.version:
+                self._entries.clear()
+                self.version = version
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, version, value):
+        with self._lock:
+            if version != self.version:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "version": self.version,
+            }
+
+
+prediction_cache = PredictionCache()
+
+
+def predict_cached(x, models_dir=None):
+    # Satu baris: (label, probabilitas per kelas); forest hanya dipanggil saat cache miss
+    version = artifact_version("rf_model", models_dir)
+    key = PredictionCache.key(x)
+    value = prediction_cache.get(key, version)
+    timing.count("prediction_cache", "miss" if value is None else "hit")
+    if value is None:
+        forest = load_forest(models_dir)
+        with timing.timed("inference", "flat_forest"):
+            labels, proba = forest.predict_with_proba(np.frombuffer(key, dtype=np.float32))
+        value = (labels[0], proba[0])
+        value[1].setflags(write=False)
+        prediction_cache.put(key, version, value)
+    return value
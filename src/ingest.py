@@ -0,0 +1,215 @@
+import calendar
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from src.artifacts import file_sha256
+from src.data import PARTITION_MANIFEST, apply_schema, derive_has_agent, partitioned_path, read_partition_manifest
+from src.schema import DATASET_SCHEMA, TARGET
+
+# -----------------------------
+# Ingestion: export booking mentah -> dataset bersih, dipartisi per tahun/bulan kedatangan
+# -----------------------------
+# data/<nama>/manifest.json
+# data/<nama>/arrival_date_year=2016/arrival_date_month=07/part-v3-0001.feather
+#
+# Naikkan CLEANING_VERSION setiap kali langkah cleaning berubah: semua partisi diproses ulang.
+CLEANING_VERSION = 1
+MONTH_NUMBER = {name: i for i, name in enumerate(calendar.month_name) if name}
+
+# Kolom export mentah yang tidak dipakai (atau bocor dari target: reservation_status*)
+DROP_COLUMNS = ["agent", "company", "reservation_status", "reservation_status_date"]
+
+
+def _write_manifest(manifest, name, data_dir=None):
+    path = partitioned_path(name, data_dir) / PARTITION_MANIFEST
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def partition_key(year, month):
+    # "2016-07": urut secara string = urut waktu
+    return f"{int(year):04d}-{MONTH_NUMBER[month]:02d}"
+
+
+def _partition_keys(frame):
+    # Key per baris; parsing hanya untuk kombinasi unik
+    raw = frame["arrival_date_year"].astype(str) + "|" + frame["arrival_date_month"].astype(str)
+    codes, uniques = pd.factorize(raw)
+    keys = np.array([partition_key(*u.split("|")) for u in uniques], dtype=object)
+    return pd.Series(keys[codes], index=frame.index)
+
+
+# -----------------------------
+# Langkah cleaning (per chunk, tidak butuh baris dari chunk lain)
+# -----------------------------
+def clean_chunk(chunk):
+    df = chunk.copy()
+    # Agent -> flag punya agent atau tidak
+    if "agent" in df.columns:
+        df["has_agent"] = derive_has_agent(df)
+    # Nilai kosong
+    if "children" in df.columns:
+        df["children"] = pd.to_numeric(df["children"], errors="coerce").fillna(0)
+    if "country" in df.columns:
+        df["country"] = df["country"].replace("NULL", np.nan).fillna("Unknown")
+    if "meal" in df.columns:
+        df["meal"] = df["meal"].replace("Undefined", "SC")   # Undefined = SC (self catering)
+    # Booking tanpa tamu & ADR negatif dibuang
+    guests = df[["adults", "children", "babies"]].sum(axis=1)
+    df = df[(guests > 0) & (df["adr"] >= 0)]
+    df = df.drop(columns=[c for c in DROP_COLUMNS if c in df.columns])
+    # Urutan & tipe kolom sesuai schema (divalidasi)
+    return apply_schema(df[list(DATASET_SCHEMA)], require_all=True)
+
+
+def _stats(frame):
+    return {
+        "rows": len(frame),
+        "canceled": int(frame[TARGET].sum()),
+        "adr_sum": float(frame["adr"].astype(np.float64).sum()),
+        "adr_min": float(frame["adr"].min()),
+        "adr_max": float(frame["adr"].max()),
+        "lead_time_sum": float(frame["lead_time"].astype(np.float64).sum()),
+        "lead_time_max": int(frame["lead_time"].max()),
+    }
+
+
+def _merge_stats(a, b):
+    if a is None:
+        return b
+    return {
+        "rows": a["rows"] + b["rows"],
+        "canceled": a["canceled"] + b["canceled"],
+        "adr_sum": a["adr_sum"] + b["adr_sum"],
+        "adr_min": min(a["adr_min"], b["adr_min"]),
+        "adr_max": max(a["adr_max"], b["adr_max"]),
+        "lead_time_sum": a["lead_time_sum"] + b["lead_time_sum"],
+        "lead_time_max": max(a["lead_time_max"], b["lead_time_max"]),
+    }
+
+
+def _summary(stats):
+    rows = stats["rows"]
+    return {
+        "rows": rows,
+        "cancel_rate": stats["canceled"] / rows if rows else None,
+        "adr_mean": stats["adr_sum"] / rows if rows else None,
+        "adr_min": stats["adr_min"],
+        "adr_max": stats["adr_max"],
+        "lead_time_mean": stats["lead_time_sum"] / rows if rows else None,
+        "lead_time_max": stats["lead_time_max"],
+    }
+
+
+def part_schema():
+    import pyarrow as pa
+
+    # Lebar tipe tetap untuk semua part: apply_schema men-downcast per chunk (int8 di satu bulan,
+    # int16 di bulan lain), padahal semua part harus bisa digabung jadi satu tabel.
+    # Kolom kategori disimpan sebagai string biasa: kategori tiap part boleh berbeda.
+    types = {"category": pa.string(), "int": pa.int32(), "float32": pa.float32()}
+    return pa.schema([(col, types[kind]) for col, kind in DATASET_SCHEMA.items()])
+
+
+def _write_part(frame, path):
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    table = pa.Table.from_pandas(
+        frame.astype({c: str for c, kind in DATASET_SCHEMA.items() if kind == "category"}),
+        schema=part_schema(),
+        preserve_index=False,
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    feather.write_feather(table, path, compression="uncompressed")
+
+
+def _raw_counts(raw_path, chunksize):
+    # Pass 1: hitung baris mentah per partisi (dua kolom saja, murah)
+    counts = {}
+    for chunk in pd.read_csv(raw_path, usecols=["arrival_date_year", "arrival_date_month"], chunksize=chunksize):
+        for key, n in _partition_keys(chunk).value_counts().items():
+            counts[key] = counts.get(key, 0) + int(n)
+    return counts
+
+
+def ingest(raw_path, name, data_dir=None, chunksize=100_000, rebuild=False, log=print):
+    start = time.perf_counter()
+    root = partitioned_path(name, data_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    manifest = read_partition_manifest(name, data_dir)
+    stale = []
+    if manifest is None or rebuild or manifest.get("cleaning_version") != CLEANING_VERSION:
+        # Semua partisi diproses ulang; file versi lama dicatat dulu supaya ikut dihapus nanti
+        if manifest is not None:
+            stale = [f for part in manifest["partitions"].values() for f in part["files"]]
+        manifest = {"version": manifest["version"] if manifest else 0, "partitions": {}}
+
+    # Partisi yang perlu diproses: baru, atau jumlah baris mentahnya berubah
+    raw_counts = _raw_counts(raw_path, chunksize)
+    existing = manifest["partitions"]
+    dirty = {key for key, n in raw_counts.items() if key not in existing or existing[key]["raw_rows"] != n}
+    removed = set(existing) - set(raw_counts)
+    if not dirty and not removed:
+        log(f"Tidak ada partisi baru ({len(existing)} partisi, versi {manifest['version']}).")
+        return manifest
+
+    version = manifest["version"] + 1
+    log(f"Versi {version}: {len(dirty)} partisi diproses, {len(existing) - len(dirty & set(existing)) - len(removed)} dipakai ulang")
+
+    # Pass 2: stream export mentah, hanya baris partisi yang dirty yang dibersihkan & ditulis
+    files, stats = {}, {}
+    for i, chunk in enumerate(pd.read_csv(raw_path, chunksize=chunksize), 1):
+        keys = _partition_keys(chunk)
+        keep = keys.isin(dirty)
+        if not keep.any():
+            continue
+        cleaned = clean_chunk(chunk[keep])
+        for key, part in cleaned.groupby(keys[cleaned.index], sort=True):
+            year, month = key.split("-")
+            path = root / f"arrival_date_year={year}" / f"arrival_date_month={month}" / f"part-v{version}-{i:04d}.feather"
+            _write_part(part, path)
+            files.setdefault(key, []).append(str(path.relative_to(root)))
+            stats[key] = _merge_stats(stats.get(key), _stats(part))
+        log(f"chunk {i}: {int(keep.sum()):,} baris mentah -> {len(cleaned):,} baris bersih")
+
+    old_files = stale + [f for key in dirty | removed if key in existing for f in existing[key]["files"]]
+    for key in removed:
+        del existing[key]
+    for key in sorted(dirty):
+        s = stats.get(key) or {"rows": 0, "canceled": 0, "adr_sum": 0.0, "adr_min": None, "adr_max": None,
+                               "lead_time_sum": 0.0, "lead_time_max": None}
+        existing[key] = {
+            "raw_rows": raw_counts[key],
+            "files": files.get(key, []),
+            "written_in": version,
+            **_summary(s),
+        }
+
+    manifest.update({
+        "version": version,
+        "cleaning_version": CLEANING_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "source": {"path": str(raw_path), "sha256": file_sha256(raw_path)},
+        "rows": sum(p["rows"] for p in existing.values()),
+        "columns": list(DATASET_SCHEMA),
+        "partitions": dict(sorted(existing.items())),
+    })
+    _write_manifest(manifest, name, data_dir)
+
+    # File lama dihapus setelah manifest baru tertulis
+    for rel in old_files:
+        (root / rel).unlink(missing_ok=True)
+    for d in sorted(root.glob("arrival_date_year=*/arrival_date_month=*"), reverse=True):
+        if not any(d.iterdir()):
+            shutil.rmtree(d)
+    log(f"✅ {manifest['rows']:,} baris, {len(existing)} partisi ({time.perf_counter() - start:.1f}s)")
+    return manifest
@@ -6,6 +6,8 @@ import scipy.stats as stats
 import os
 from PIL import Image
 
+from src.data import load_data
+
 
 def show_overview():
     st.title("🏨 Get to Know The Data - Hotel Cancellation")
@@ -28,7 +30,7 @@ def show_overview():
     st.markdown("### 📦 Dataset Preview")
     st.markdown("Below is a quick glimpse into the hotel booking dataset:")
 
-    df = pd.read_csv("data/cleaned_hotel_data4.csv")
+    df = load_data()
     st.dataframe(df.head(10), use_container_width=True)
 
     st.markdown("---")
@@ -1,30 +1,98 @@
-import pandas as pd
+import time
+
+import numpy as np
+import plotly.graph_objects as go
 import streamlit as st
-import joblib
-import requests
-from io import BytesIO
 from pathlib import Path
 
-# -----------------------------
-# LINK GOOGLE DRIVE
-# -----------------------------
-MODEL_URL = "https://drive.google.com/uc?export=download&id=1HDViTPN6WkQpS5dDOHmaEYWCAGgwCJUU"
-TRAIN_COLS_URL = "https://drive.google.com/uc?export=download&id=14tmlc4z7ZHbYxePdV9cLyO5OHtqAO9cf"
+from src import drift, timing
+from src.artifacts import ArtifactError, artifact_version
+from src.features import load_encoder
+from src.forest import load_forest, prediction_cache, predict_cached
+from src.schema import FORM_FIELDS
+
+# Field form yang pilihannya di-bucket (country: 8 kode + "Other", referensi drift: 50 negara teratas)
+# tidak ikut sketch drift, karena distribusinya berbeda dengan data training by construction
+DRIFT_SKIP_FIELDS = ("country",)
+
 
 # -----------------------------
-# Fungsi untuk load model dari Drive
+# Sensitivity map: Lead Time x ADR
 # -----------------------------
-@st.cache_data
-def load_model_from_gdrive(url):
-    r = requests.get(url)
-    r.raise_for_status()  # cek kalau ada error
-    return joblib.load(BytesIO(r.content))
+# 251 x 251 = 63.001 skenario; dihitung per persegi leaf (FlatForest.predict_grid), jauh di bawah 500 ms
+LEAD_TIMES = np.arange(0, 501, 2)
+ADRS = np.arange(0, 1001, 4)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def sensitivity_map(base_key, model_version, encoder_version):
+    # base_key = input lain (tanpa lead_time & ADR), jadi geser slider tidak menghitung ulang grid.
+    # Versi artifact ikut jadi kunci supaya grid dibuang saat model di-publish ulang.
+    record = dict(base_key)
+    encoder = load_encoder()
+    with timing.timed("encode", "sensitivity_grid"):
+        x = encoder.transform_record(record)
+    # FlatForest yang sama dengan tombol Predict (di-mmap & dibagi antar worker), bukan salinan sklearn
+    forest = load_forest()
+    start = time.perf_counter()
+    grid = forest.predict_grid(x, encoder.numeric_index("lead_time"), LEAD_TIMES, encoder.numeric_index("adr"), ADRS)
+    elapsed = time.perf_counter() - start
+    timing.record("inference", "sensitivity_grid", elapsed)
+    return grid, elapsed
+
+
+def show_sensitivity_map(input_dict):
+    base_key = tuple(sorted((k, v) for k, v in input_dict.items() if k not in ("lead_time", "adr")))
+    grid, score_s = sensitivity_map(base_key, artifact_version("rf_model"), artifact_version("training_columns"))
+
+    fig = go.Figure(go.Heatmap(
+        z=grid, x=ADRS, y=LEAD_TIMES, zmin=0, zmax=1, colorscale="RdYlGn_r",
+        colorbar=dict(title="P(cancel)"),
+        hovertemplate="ADR %{x}<br>Lead Time %{y}<br>P(cancel) %{z:.2f}<extra></extra>",
+    ))
+    # Posisi input saat ini
+    fig.add_trace(go.Scatter(
+        x=[input_dict["adr"]], y=[input_dict["lead_time"]], mode="markers",
+        marker=dict(symbol="x", size=12, color="black"), name="Input", hoverinfo="skip",
+    ))
+    fig.update_layout(xaxis_title="ADR", yaxis_title="Lead Time (days)", height=450, showlegend=False,
+                      margin=dict(l=10, r=10, t=30, b=10))
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"{grid.size:,} skenario di-score ({score_s * 1e3:.0f} ms)")
 
 # -----------------------------
-# Load model & training columns
+# Penjelasan prediksi: kontribusi per field form
 # -----------------------------
-rf = load_model_from_gdrive(MODEL_URL)
-training_columns = load_model_from_gdrive(TRAIN_COLS_URL)
+OTHER_FIELDS = "(fitur lain, tidak ada di form)"
+
+
+def explain_prediction(X, encoder):
+    # Kontribusi per kolom one-hot dijumlah balik ke kolom asalnya (encoder.source_columns)
+    with timing.timed("inference", "explain"):
+        bias, contrib = load_forest().explain(X)
+    totals = {}
+    for source, value in zip(encoder.source_columns(), contrib[0]):
+        field = source if source in FORM_FIELDS else OTHER_FIELDS
+        totals[field] = totals.get(field, 0.0) + value
+    return float(bias[0]), totals
+
+
+def show_explanation(X, encoder, proba):
+    start = time.perf_counter()
+    bias, totals = explain_prediction(X, encoder)
+    elapsed = time.perf_counter() - start
+    items = sorted(totals.items(), key=lambda kv: abs(kv[1]))
+    fig = go.Figure(go.Bar(
+        x=[v for _, v in items], y=[k for k, _ in items], orientation="h",
+        marker_color=["#EF553B" if v > 0 else "#00CC96" for _, v in items],
+        hovertemplate="%{y}: %{x:+.3f}<extra></extra>",
+    ))
+    fig.update_layout(xaxis_title="Kontribusi ke P(cancel)", height=60 + 28 * len(items),
+                      margin=dict(l=10, r=10, t=10, b=10))
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"Rata-rata model {bias:.2f} + total kontribusi {sum(totals.values()):+.2f} = {proba:.2f} "
+               f"(merah menaikkan, hijau menurunkan kemungkinan cancel; {elapsed * 1e3:.1f} ms)")
+
 
 # -----------------------------
 # Halaman Predict
@@ -82,7 +150,7 @@ def show_predict_page():
             babies = st.number_input("Babies", 0, 5, 0)
 
     # -----------------------------
-    # Buat DataFrame untuk prediksi
+    # Input untuk prediksi
     # -----------------------------
     input_dict = {
         "deposit_type": deposit_type,
@@ -101,22 +169,32 @@ def show_predict_page():
         "booking_changes": booking_changes,
         "assigned_room_type": reserved_room_type  # default sama reserved
     }
-    input_df = pd.DataFrame([input_dict])
+    try:
+        load_forest()
+        encoder = load_encoder()
+    except ArtifactError as e:
+        st.error(f"❌ Model belum tersedia: {e}")
+        return
 
-    # One-Hot Encoding
-    input_df = pd.get_dummies(input_df)
-    for col in set(training_columns) - set(input_df.columns):
-        input_df[col] = 0
-    input_df = input_df[training_columns]
+    # One-Hot Encoding langsung ke array (sama dengan training & batch scoring)
+    with timing.timed("encode", "transform_record"):
+        X = encoder.transform_record(input_dict).reshape(1, -1)
 
     # -----------------------------
     # Tombol Predict
     # -----------------------------
     if st.button("Predict", key="predict_button"):
-        prediction = rf.predict(input_df)[0]
-        proba = rf.predict_proba(input_df)[0][1]
+        # Label + probabilitas dari satu traversal forest (skenario yang sama diambil dari cache)
+        prediction, proba_row = predict_cached(X)
+        proba = proba_row[1]
+        # Booking yang di-score masuk ke sketch drift (panel "Drift" di sidebar)
+        monitor = drift.load_monitor()
+        if monitor is not None:
+            monitor.update_record({k: v for k, v in input_dict.items() if k not in DRIFT_SKIP_FIELDS})
         st.success(f"Prediction: {'Canceled' if prediction==1 else 'Not Canceled'}")
         st.info(f"Probability of cancellation: {proba:.2f}")
+        cache = prediction_cache.stats()
+        st.caption(f"Prediction cache: {cache['hits']} hit / {cache['misses']} miss ({cache['size']}/{cache['maxsize']} entries)")
 
         # 🔍 Input Summary
         st.markdown("### 🧾 Input Summary")
@@ -134,5 +212,16 @@ def show_predict_page():
             st.markdown(f"**👨‍👩‍👧‍👦 Adults:** {adults}, Children: {children}, Babies: {babies}")
             st.markdown(f"**🛏️ Reserved Room Type:** {reserved_room_type}, Assigned Room Type:** {reserved_room_type}")
 
+        # 💡 Kenapa hasilnya begini?
+        st.markdown("### 💡 Why this prediction?")
+        show_explanation(X, encoder, proba)
+
+    # -----------------------------
+    # Sensitivity map Lead Time x ADR (input lain tetap)
+    # -----------------------------
+    # Opt-in: isi st.expander tetap dijalankan saat tertutup, toggle tidak
+    if st.toggle("🗺️ Sensitivity Map: Lead Time × ADR", key="show_sensitivity_map"):
+        show_sensitivity_map(input_dict)
+
 
 
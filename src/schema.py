@@ -0,0 +1,91 @@
+# -----------------------------
+# Kolom dataset hotel booking
+# -----------------------------
+TARGET = "is_canceled"
+
+# Semua kolom fitur pipeline
+TRAINING_COLUMNS = [
+    "hotel",
+    "lead_time",
+    "arrival_date_year",
+    "arrival_date_month",
+    "arrival_date_week_number",
+    "arrival_date_day_of_month",
+    "stays_in_weekend_nights",
+    "stays_in_week_nights",
+    "adults",
+    "children",
+    "babies",
+    "meal",
+    "country",
+    "market_segment",
+    "distribution_channel",
+    "is_repeated_guest",
+    "previous_cancellations",
+    "previous_bookings_not_canceled",
+    "reserved_room_type",
+    "assigned_room_type",
+    "booking_changes",
+    "deposit_type",
+    "days_in_waiting_list",
+    "customer_type",
+    "adr",
+    "required_car_parking_spaces",
+    "total_of_special_requests",
+    "has_agent"
+]
+
+# Kolom kategorikal saja
+CATEGORICAL_COLS = [
+    "hotel",
+    "arrival_date_month",
+    "meal",
+    "country",
+    "market_segment",
+    "distribution_channel",
+    "reserved_room_type",
+    "assigned_room_type",
+    "deposit_type",
+    "customer_type",
+    "required_car_parking_spaces",
+    "has_agent"
+]
+
+# Field yang diisi di form Predict (input_dict) dan diterima scoring server
+FORM_FIELDS = [
+    "deposit_type",
+    "market_segment",
+    "required_car_parking_spaces",
+    "country",
+    "customer_type",
+    "previous_cancellations",
+    "lead_time",
+    "adults",
+    "children",
+    "babies",
+    "adr",
+    "total_of_special_requests",
+    "reserved_room_type",
+    "booking_changes",
+    "assigned_room_type"
+]
+
+# -----------------------------
+# Tipe kolom dataset (dipakai semua loader, lihat src/data.py)
+# -----------------------------
+# "category" = teks -> pandas Categorical
+# "int"      = integer terkecil yang muat (int8/int16/...), float32 kalau ada nilai kosong
+# "float32"  = nilai pecahan
+# required_car_parking_spaces & has_agent ada di CATEGORICAL_COLS tapi isinya angka,
+# jadi tetap disimpan sebagai integer (encoding model tidak berubah).
+NUMERIC_CODED_COLS = ["required_car_parking_spaces", "has_agent"]
+FLOAT_COLS = ["adr"]
+
+
+def _column_kind(col):
+    if col in CATEGORICAL_COLS and col not in NUMERIC_CODED_COLS:
+        return "category"
+    return "float32" if col in FLOAT_COLS else "int"
+
+
+DATASET_SCHEMA = {TARGET: "int", **{col: _column_kind(col) for col in TRAINING_COLUMNS}}
@@ -0,0 +1,121 @@
+import os
+import sys
+import time
+import warnings
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src import drift, timing
+from src.artifacts import load_artifact
+from src.data import apply_schema, read_csv_compact
+from src.features import load_encoder
+
+TARGET = "is_canceled"
+
+
+# -----------------------------
+# Predict dari matrix hasil FeatureEncoder
+# -----------------------------
+def predict_proba(rf, X):
+    # Model lama di-fit dengan DataFrame; urutan kolom X sudah dijamin oleh encoder
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message="X does not have valid feature names")
+        return rf.predict_proba(X)
+
+
+# -----------------------------
+# Worker: model dimuat sekali per proses
+# -----------------------------
+_worker = {}
+
+
+def init_worker(models_dir=None, compact=False):
+    if compact:
+        # CompactForest di-mmap: semua worker berbagi page yang sama, model sklearn tidak dimuat
+        from src.compact import load_compact_forest
+
+        _worker["rf"] = load_compact_forest(models_dir)
+    else:
+        rf = load_artifact("rf_model", models_dir=models_dir)
+        # Paralelisme sudah di level proses, jadi tiap worker cukup 1 thread
+        rf.set_params(n_jobs=1)
+        _worker["rf"] = rf
+    _worker["encoder"] = load_encoder(models_dir)
+
+
+def score_chunk(chunk):
+    chunk = apply_schema(chunk)
+    rf = _worker["rf"]
+    with timing.timed("encode", "transform_frame"):
+        X = _worker["encoder"].transform_frame(chunk)
+    if not hasattr(rf, "estimators_"):
+        with timing.timed("inference", "compact_forest"):
+            labels, proba = rf.predict_with_proba(X)
+        return proba[:, 1], labels
+    with timing.timed("inference", "sklearn_batch"):
+        proba = predict_proba(rf, X)
+    labels = rf.classes_.take(np.argmax(proba, axis=1))
+    return proba[:, 1], labels
+
+
+# -----------------------------
+# Batch scoring CSV -> CSV, per chunk, paralel
+# -----------------------------
+def score_csv(input_path, output_path, chunksize=100_000, workers=None, id_column=None,
+              models_dir=None, drift_report=None, compact=False, log=sys.stderr):
+    workers = workers or os.cpu_count() or 1
+    # Sketch drift di-update di proses utama (ukuran tetap, tidak tergantung jumlah baris)
+    monitor = drift.load_monitor(models_dir)
+    # Maksimal chunk yang "in flight" dibatasi supaya memory tetap bounded
+    max_pending = workers * 2
+
+    # Kolom dataset dibaca dengan tipe compact + divalidasi per chunk (src/schema.py)
+    reader = read_csv_compact(input_path, chunksize=chunksize)
+    pending = deque()
+    total_rows = 0
+    first = True
+    start = time.perf_counter()
+
+    def write(ids, result):
+        nonlocal total_rows, first
+        proba, labels = result
+        out = pd.DataFrame({"cancel_probability": proba, "prediction": labels})
+        if ids is not None:
+            out.insert(0, id_column, ids)
+        out.to_csv(output_path, mode="w" if first else "a", header=first, index=False)
+        first = False
+        total_rows += len(out)
+        elapsed = time.perf_counter() - start
+        print(f"{total_rows:,} rows scored ({total_rows / elapsed:,.0f} rows/sec)", file=log)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(models_dir, compact)) as pool:
+        for chunk in reader:
+            ids = chunk[id_column].to_numpy() if id_column else None
+            if id_column:
+                chunk = chunk.drop(columns=[id_column])
+            if monitor is not None:
+                monitor.update_frame(chunk)
+            pending.append((ids, pool.submit(score_chunk, chunk)))
+            # Tulis hasil sesuai urutan input
+            while len(pending) >= max_pending:
+                ids_done, fut = pending.popleft()
+                write(ids_done, fut.result())
+        while pending:
+            ids_done, fut = pending.popleft()
+            write(ids_done, fut.result())
+
+    elapsed = time.perf_counter() - start
+    if first:
+        # Input kosong: tetap tulis header
+        pd.DataFrame(columns=([id_column] if id_column else []) + ["cancel_probability", "prediction"]).to_csv(
+            output_path, index=False
+        )
+    if drift_report:
+        if monitor is None:
+            print("⚠️ Tidak ada drift_reference untuk rf_model aktif; drift report tanpa skor.", file=log)
+        report = monitor.report() if monitor is not None else drift.no_reference_report(models_dir)
+        drift.export_report(report, drift_report)
+    return total_rows, elapsed
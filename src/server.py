@@ -0,0 +1,315 @@
+import asyncio
+import json
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import numpy as np
+
+from src import drift, timing
+from src.artifacts import artifact_version, load_artifact
+from src.compact import load_compact_forest
+from src.features import load_encoder
+from src.forest import load_forest
+from src.schema import DATASET_SCHEMA, FORM_FIELDS
+from src.scoring import predict_proba
+
+
+# -----------------------------
+# Model untuk server (dimuat sekali saat start)
+# -----------------------------
+class Model:
+    # Batch kecil lebih cepat lewat FlatForest, batch besar lewat sklearn (lihat benchmarks/artifacts.py)
+    FLAT_MAX_ROWS = 256
+
+    def __init__(self, models_dir=None, compact=False):
+        if compact:
+            # Hanya CompactForest (di-mmap, dibagi antar proses); model sklearn tidak dimuat
+            self.rf = None
+            self.forest = load_compact_forest(models_dir)
+        else:
+            self.rf = load_artifact("rf_model", models_dir=models_dir)
+            self.rf.set_params(n_jobs=1)
+            self.forest = load_forest(models_dir)
+        self.encoder = load_encoder(models_dir)
+        self.version = artifact_version("rf_model", models_dir)
+        # None kalau model belum punya drift_reference
+        self.monitor = drift.load_monitor(models_dir)
+
+    def encode(self, bookings):
+        with timing.timed("encode", "transform_records"):
+            return self.encoder.transform_records(bookings)
+
+    def score(self, X):
+        if self.rf is None:
+            with timing.timed("inference", "compact_forest"):
+                return self.forest.predict_with_proba(X)
+        if len(X) <= self.FLAT_MAX_ROWS:
+            with timing.timed("inference", "flat_forest"):
+                return self.forest.predict_with_proba(X)
+        with timing.timed("inference", "sklearn_batch"):
+            proba = predict_proba(self.rf, X)
+        return self.rf.classes_.take(np.argmax(proba, axis=1)), proba
+
+
+# -----------------------------
+# Micro-batching: request yang datang bersamaan digabung jadi satu predict_proba
+# -----------------------------
+class MicroBatcher:
+    def __init__(self, score_fn, max_batch=64, max_wait_ms=2.0):
+        self.score_fn = score_fn
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1e3
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self._queue = None
+        self._task = None
+        # Scoring di thread terpisah supaya event loop tetap menerima request baru
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scorer")
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._executor.shutdown(wait=True)
+
+    async def score(self, X):
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((X, fut))
+        return await fut
+
+    async def _collect(self):
+        items = [await self._queue.get()]
+        rows = len(items[0][0])
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while rows < self.max_batch:
+            if not self._queue.empty():
+                item = self._queue.get_nowait()
+            else:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            items.append(item)
+            rows += len(item[0])
+        return items
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = await self._collect()
+            X = items[0][0] if len(items) == 1 else np.concatenate([X for X, _ in items])
+            try:
+                labels, proba = await loop.run_in_executor(self._executor, self.score_fn, X)
+            except Exception as e:
+                for _, fut in items:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+
+            self.requests += len(items)
+            self.rows += len(X)
+            self.batches += 1
+            start = 0
+            for X_item, fut in items:
+                stop = start + len(X_item)
+                if not fut.done():
+                    fut.set_result((labels[start:stop], proba[start:stop, 1]))
+                start = stop
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "rows": self.rows,
+            "batches": self.batches,
+            "avg_batch_rows": self.rows / self.batches if self.batches else 0.0,
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1e3,
+        }
+
+
+# -----------------------------
+# Validasi input JSON (field sama dengan input_dict di form Predict)
+# -----------------------------
+class BadRequest(ValueError):
+    pass
+
+
+# Batas nilai numerik: kolom "int" disimpan int32, "float32" harus muat di float32 (tidak jadi inf)
+INT_RANGE = (int(np.iinfo(np.int32).min), int(np.iinfo(np.int32).max))
+FLOAT_MAX = float(np.finfo(np.float32).max)
+
+
+def check_value(col, value):
+    # -> pesan error, atau None kalau nilai valid untuk kolom ini
+    kind = DATASET_SCHEMA[col]
+    if kind == "category":
+        return None if isinstance(value, str) else "harus string"
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return "harus angka"
+    if not math.isfinite(value):
+        return "harus angka berhingga"
+    if kind == "int":
+        if value != int(value):
+            return "harus bilangan bulat"
+        if not INT_RANGE[0] <= value <= INT_RANGE[1]:
+            return f"di luar rentang {INT_RANGE[0]}..{INT_RANGE[1]}"
+    elif abs(value) > FLOAT_MAX:
+        return "di luar rentang float32"
+    return None
+
+
+def parse_bookings(payload):
+    # Satu booking (object), list booking, atau {"bookings": [...]}
+    if isinstance(payload, dict) and "bookings" in payload:
+        payload = payload["bookings"]
+    single = isinstance(payload, dict)
+    bookings = [payload] if single else payload
+    if not isinstance(bookings, list) or not bookings:
+        raise BadRequest("Body harus berupa object booking atau list booking.")
+    for i, booking in enumerate(bookings):
+        if not isinstance(booking, dict):
+            raise BadRequest(f"Booking #{i} bukan object.")
+        # Field yang hilang/tidak dikenal tidak boleh diam-diam jadi 0/NaN di encoder
+        missing = [col for col in FORM_FIELDS if booking.get(col) is None]
+        unknown = sorted(str(key) for key in booking if key not in FORM_FIELDS)
+        problems = []
+        if missing:
+            problems.append(f"field hilang: {', '.join(missing)}")
+        if unknown:
+            problems.append(f"field tidak dikenal: {', '.join(unknown)}")
+        if problems:
+            raise BadRequest(f"Booking #{i}: {'; '.join(problems)}.")
+        for col in FORM_FIELDS:
+            error = check_value(col, booking[col])
+            if error:
+                raise BadRequest(f"Booking #{i}: nilai '{col}' {error}.")
+    return bookings, single
+
+
+# -----------------------------
+# HTTP server minimal (asyncio streams, keep-alive)
+# -----------------------------
+class ScoringServer:
+    MAX_BODY = 10 << 20
+
+    def __init__(self, model, max_batch=64, max_wait_ms=2.0):
+        self.model = model
+        self.batcher = MicroBatcher(model.score, max_batch=max_batch, max_wait_ms=max_wait_ms)
+        self.started = time.time()
+
+    async def handle_predict(self, body):
+        try:
+            bookings, single = parse_bookings(json.loads(body or b"null"))
+            X = self.model.encode(bookings)
+        except (ValueError, TypeError) as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        if self.model.monitor is not None:
+            self.model.monitor.update_records(bookings)
+
+        labels, proba = await self.batcher.score(X)
+        results = [{"prediction": int(label), "cancel_probability": float(p)} for label, p in zip(labels, proba)]
+        if single:
+            return HTTPStatus.OK, dict(results[0], model_version=self.model.version)
+        return HTTPStatus.OK, {"results": results, "model_version": self.model.version}
+
+    async def route(self, method, path, body):
+        if path == "/predict":
+            if method != "POST":
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Gunakan POST."}
+            return await self.handle_predict(body)
+        if path == "/metrics" and method == "GET":
+            text = timing.prometheus_text()
+            if self.model.monitor is not None:
+                text += drift.prometheus_text(self.model.monitor.report())
+            return HTTPStatus.OK, text
+        if path == "/drift" and method == "GET":
+            if self.model.monitor is None:
+                return HTTPStatus.NOT_FOUND, {"error": "Model ini belum punya drift_reference."}
+            return HTTPStatus.OK, self.model.monitor.report()
+        if path == "/health" and method == "GET":
+            return HTTPStatus.OK, {"status": "ok", "model_version": self.model.version,
+                                   "uptime_s": time.time() - self.started, "batching": self.batcher.stats()}
+        return HTTPStatus.NOT_FOUND, {"error": f"{method} {path} tidak dikenal."}
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "Request line tidak valid."}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                raw_length = headers.get("content-length", "") or "0"
+                if not (raw_length.isascii() and raw_length.isdigit()):
+                    # Bukan angka / negatif: panjang body tidak diketahui, koneksi tidak bisa dipakai lagi
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "Content-Length tidak valid."}, False)
+                    break
+                length = int(raw_length)
+                if length > self.MAX_BODY:
+                    await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Body terlalu besar."}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                try:
+                    status, payload = await self.route(method, path.split("?", 1)[0], body)
+                except Exception as e:
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        if isinstance(payload, str):
+            body, content_type = payload.encode(), "text/plain; version=0.0.4"
+        else:
+            body, content_type = json.dumps(payload).encode(), "application/json"
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def serve(self, host="127.0.0.1", port=8000, log=print):
+        await self.batcher.start()
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        log(f"Scoring server {self.model.version} di http://{host}:{port} "
+            f"(max_batch={self.batcher.max_batch}, max_wait_ms={self.batcher.max_wait * 1e3:g})")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
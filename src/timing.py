@@ -0,0 +1,214 @@
+import cProfile
+import importlib
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# -----------------------------
+# Catatan waktu startup (import modul, load artifact, render pertama)
+# -----------------------------
+PROCESS_START = time.perf_counter()
+
+# Log kejadian terakhir (dibatasi supaya proses yang jalan lama tidak terus membesar)
+MAX_RECORDS = 1_000
+# Kejadian sekali-per-proses (import modul, load artifact & baca dataset per versi, mark_once)
+# disimpan terpisah, supaya tidak tergeser dari log rolling setelah banyak rerun
+STARTUP_CATEGORIES = ("import", "artifact", "dataset", "startup")
+# Jumlah sampel terakhir per metrik untuk histogram rolling (p50/p95/p99)
+WINDOW = 1_000
+# Batas bucket histogram (ms), sama untuk semua metrik
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1_000, 2_500, 5_000, 10_000)
+
+_records = deque(maxlen=MAX_RECORDS)
+_startup = []
+_marked = set()
+_imported = set()
+_series = {}
+_counters = {}
+_lock = threading.Lock()
+
+
+class _Series:
+    # Satu metrik waktu: histogram kumulatif (untuk Prometheus) + window sampel terakhir
+    __slots__ = ("buckets", "count", "total_ms", "window")
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.window = deque(maxlen=WINDOW)
+
+    def add(self, ms):
+        i = 0
+        while i < len(BUCKETS_MS) and ms > BUCKETS_MS[i]:
+            i += 1
+        self.buckets[i] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.window.append(ms)
+
+
+def record(category, name, seconds):
+    ms = seconds * 1e3
+    entry = {
+        "category": category,
+        "name": name,
+        "ms": ms,
+        "at_ms": (time.perf_counter() - PROCESS_START) * 1e3,
+        "thread": threading.current_thread().name,
+    }
+    with _lock:
+        _records.append(entry)
+        if category in STARTUP_CATEGORIES:
+            _startup.append(entry)
+        series = _series.get((category, name))
+        if series is None:
+            series = _series[(category, name)] = _Series()
+        series.add(ms)
+
+
+@contextmanager
+def timed(category, name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(category, name, time.perf_counter() - start)
+
+
+def count(category, name, n=1):
+    with _lock:
+        _counters[(category, name)] = _counters.get((category, name), 0) + n
+
+
+def import_module(name):
+    # Selalu lewat importlib: kalau thread warm-up sedang meng-import modul yang sama, panggilan ini
+    # menunggu import lock modul itu (sys.modules bisa berisi modul yang belum selesai diinisialisasi).
+    # Waktu hanya dicatat untuk import pertama yang benar-benar memuat modul.
+    if name in sys.modules:
+        return importlib.import_module(name)
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    with _lock:
+        first = name not in _imported
+        _imported.add(name)
+    if first:
+        record("import", name, time.perf_counter() - start)
+    return module
+
+
+def mark_once(category, name):
+    # Catat waktu sejak proses start, sekali saja (mis. time-to-first-render)
+    with _lock:
+        if (category, name) in _marked:
+            return
+        _marked.add((category, name))
+    record(category, name, time.perf_counter() - PROCESS_START)
+
+
+def report():
+    with _lock:
+        return list(_records)
+
+
+def startup_report():
+    # Import, load artifact, baca dataset & mark_once (tidak ikut tergeser dari log rolling)
+    with _lock:
+        return list(_startup)
+
+
+# -----------------------------
+# Ringkasan metrik (panel admin) & export
+# -----------------------------
+def summary():
+    with _lock:
+        items = [(key, s.count, s.total_ms, np.array(s.window)) for key, s in _series.items()]
+        counters = dict(_counters)
+    rows = []
+    for (category, name), n, total_ms, window in sorted(items, key=lambda it: it[0]):
+        p50, p95, p99 = np.percentile(window, [50, 95, 99]) if window.size else (0.0, 0.0, 0.0)
+        rows.append({
+            "category": category,
+            "name": name,
+            "count": n,
+            "total_ms": total_ms,
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "max_ms": float(window.max()) if window.size else 0.0,
+        })
+    counter_rows = [{"category": c, "name": k, "value": v} for (c, k), v in sorted(counters.items())]
+    return rows, counter_rows
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def prometheus_text(prefix="hotel"):
+    # Format text exposition Prometheus (histogram dalam detik + counter)
+    with _lock:
+        items = [(key, list(s.buckets), s.count, s.total_ms) for key, s in sorted(_series.items())]
+        counters = sorted(_counters.items())
+
+    lines = [f"# HELP {prefix}_duration_seconds Durasi operasi (render halaman, load data, encoding, inference).",
+             f"# TYPE {prefix}_duration_seconds histogram"]
+    for (category, name), buckets, n, total_ms in items:
+        labels = f'category="{_label(category)}",name="{_label(name)}"'
+        cumulative = 0
+        for bound, c in zip(BUCKETS_MS + (float("inf"),), buckets):
+            cumulative += c
+            le = "+Inf" if bound == float("inf") else f"{bound / 1e3:g}"
+            lines.append(f'{prefix}_duration_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f"{prefix}_duration_seconds_sum{{{labels}}} {total_ms / 1e3:.6f}")
+        lines.append(f"{prefix}_duration_seconds_count{{{labels}}} {n}")
+
+    lines += [f"# HELP {prefix}_events_total Counter kejadian (mis. cache hit/miss).",
+              f"# TYPE {prefix}_events_total counter"]
+    for (category, name), value in counters:
+        lines.append(f'{prefix}_events_total{{category="{_label(category)}",name="{_label(name)}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+def export_prometheus(path, prefix="hotel"):
+    # Tulis atomik supaya node_exporter (textfile collector) tidak membaca file setengah jadi
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(prometheus_text(prefix))
+    os.replace(tmp, path)
+
+
+def json_snapshot():
+    rows, counters = summary()
+    return {"ts": time.time(), "uptime_s": time.perf_counter() - PROCESS_START, "timers": rows, "counters": counters}
+
+
+def export_json(path):
+    # Satu baris JSON per snapshot (append)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(json_snapshot()) + "\n")
+
+
+# -----------------------------
+# cProfile opsional untuk satu rerun
+# -----------------------------
+@contextmanager
+def profiled(result, sort="cumulative", limit=40):
+    # result["stats"] diisi teks pstats setelah blok selesai
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats(sort).print_stats(limit)
+        result["stats"] = out.getvalue()
@@ -0,0 +1,360 @@
+import itertools
+import math
+import os
+import pickle
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score, roc_auc_score
+from sklearn.model_selection import train_test_split
+
+from src.data import SchemaError, apply_schema, read_bookings, read_csv_compact
+from src.features import FeatureEncoder, fit_encoder
+from src.forest import FlatForest
+from src.schema import DATASET_SCHEMA, TARGET
+
+
+def peak_rss_mb():
+    # VmHWM di-reset saat exec; ru_maxrss ikut terbawa dari parent (worker spawn jadi ikut "besar")
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss di Linux dalam KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# -----------------------------
+# Pass 1: deteksi tipe kolom + kumpulkan vocabulary kategori (memory kecil)
+# -----------------------------
+# Chunk dibaca lewat schema yang sama dengan read_bookings (src/data.py): tipe kolom dari
+# DATASET_SCHEMA dan has_agent diturunkan dari agent kalau belum ada. Kolom di luar schema
+# (agent/company mentah, reservation_status, ...) tidak ikut jadi fitur.
+def read_chunks(csv_path, chunksize, columns=None, **kwargs):
+    for chunk in read_csv_compact(csv_path, columns, chunksize=chunksize, **kwargs):
+        chunk = apply_schema(chunk)
+        yield chunk[[c for c in chunk.columns if c in DATASET_SCHEMA]]
+
+
+def scan_vocabulary(csv_path, chunksize=200_000, target=TARGET):
+    sample = next(read_chunks(csv_path, chunksize, nrows=chunksize))
+    if target not in sample.columns:
+        raise SchemaError(f"Kolom '{target}' tidak ditemukan.")
+    features = [c for c in sample.columns if c != target]
+    categorical = [c for c in features if DATASET_SCHEMA[c] == "category"]
+    numeric = [c for c in features if c not in categorical]
+
+    vocab = {col: set() for col in categorical}
+    rows = 0
+    for chunk in read_csv_compact(csv_path, categorical or [target], chunksize=chunksize):
+        for col in categorical:
+            vocab[col].update(chunk[col].dropna().unique())
+        rows += len(chunk)
+    return numeric, {col: sorted(values) for col, values in vocab.items()}, rows
+
+
+def encoder_from_vocabulary(numeric, vocab):
+    # Urutan kolom sama dengan pd.get_dummies pada seluruh dataset
+    names = list(numeric)
+    for col, categories in vocab.items():
+        names += [f"{col}_{v}" for v in categories]
+    return FeatureEncoder(names, list(vocab))
+
+
+# -----------------------------
+# Pass 2: training per chunk, forest bertambah tree tiap chunk (warm_start)
+# -----------------------------
+def train_streaming(csv_path, chunksize=100_000, trees_per_chunk=10, max_depth=None,
+                    holdout_frac=0.05, max_holdout=200_000, random_state=42, n_jobs=-1, log=print):
+    start = time.perf_counter()
+    numeric, vocab, total_rows = scan_vocabulary(csv_path, chunksize=chunksize)
+    encoder = encoder_from_vocabulary(numeric, vocab)
+    log(f"Vocabulary: {total_rows:,} rows, {encoder.n_features} fitur ({len(vocab)} kolom kategorikal)")
+
+    rf = RandomForestClassifier(
+        n_estimators=0,
+        max_depth=max_depth,
+        warm_start=True,
+        random_state=random_state,
+        n_jobs=n_jobs,
+    )
+    rng = np.random.default_rng(random_state)
+    holdout_X, holdout_y, n_holdout = [], [], 0
+    X_buf = None
+    seen = 0
+
+    for i, chunk in enumerate(read_chunks(csv_path, chunksize), 1):
+        y = chunk[TARGET].to_numpy()
+        # Buffer encoding dipakai ulang antar chunk (ukuran tetap)
+        if X_buf is None or X_buf.shape[0] != len(chunk):
+            X_buf = np.empty((len(chunk), encoder.n_features), dtype=np.float32)
+        X = encoder.transform_frame(chunk, out=X_buf)
+
+        # Sebagian kecil tiap chunk disisihkan untuk evaluasi (dibatasi max_holdout)
+        held = rng.random(len(chunk)) < holdout_frac
+        if n_holdout < max_holdout and held.any():
+            take = np.flatnonzero(held)[: max_holdout - n_holdout]
+            holdout_X.append(X[take].copy())
+            holdout_y.append(y[take])
+            n_holdout += len(take)
+        train = ~held
+
+        if len(np.unique(y[train])) < 2:
+            log(f"chunk {i}: dilewati (hanya satu kelas)")
+            continue
+        rf.set_params(n_estimators=rf.n_estimators + trees_per_chunk)
+        rf.fit(X[train], y[train])
+        seen += int(train.sum())
+        log(f"chunk {i}: {seen:,}/{total_rows:,} rows, {rf.n_estimators} trees, peak RSS {peak_rss_mb():.0f} MB")
+
+    if rf.n_estimators == 0:
+        raise ValueError("Tidak ada chunk yang bisa dipakai untuk training.")
+
+    # Warm start tidak dipakai lagi setelah training selesai
+    rf.set_params(warm_start=False)
+    metrics = {"rows_trained": seen, "n_estimators": rf.n_estimators, "fit_s": time.perf_counter() - start,
+               "peak_rss_mb": peak_rss_mb()}
+    if n_holdout:
+        Xh, yh = np.concatenate(holdout_X), np.concatenate(holdout_y)
+        proba = rf.predict_proba(Xh)
+        metrics["holdout_rows"] = n_holdout
+        metrics["accuracy"] = accuracy_score(yh, rf.classes_.take(np.argmax(proba, axis=1)))
+        if len(np.unique(yh)) == 2:
+            metrics["auc"] = roc_auc_score(yh, proba[:, 1])
+    return rf, encoder, metrics
+
+
+# -----------------------------
+# Training in-memory: satu kandidat (dipakai `train.py fit` dan grid)
+# -----------------------------
+def split_holdout(frame, test_size=0.2, random_state=42):
+    # Test set tetap untuk semua kandidat supaya metriknya bisa dibandingkan
+    return train_test_split(frame, test_size=test_size, random_state=random_state, stratify=frame[TARGET])
+
+
+def training_sample(train_frame, sample_frac=0.2, random_state=42):
+    # Dipakai fit_model dan untuk referensi drift (sample yang sama persis)
+    if sample_frac < 1.0:
+        return train_frame.sample(frac=sample_frac, random_state=random_state)
+    return train_frame
+
+
+def fit_model(train_frame, n_estimators=100, max_depth=None, sample_frac=0.2, encoding="onehot",
+              random_state=42, n_jobs=-1, top_k=None):
+    train_frame = training_sample(train_frame, sample_frac, random_state)
+    X = train_frame.drop(columns=[TARGET])
+    encoder = fit_encoder(X, encoding, top_k=top_k)
+    rf = RandomForestClassifier(
+        n_estimators=n_estimators,
+        max_depth=max_depth,
+        random_state=random_state,
+        n_jobs=n_jobs,
+    )
+    start = time.perf_counter()
+    # *_topk: kolom berkardinalitas tinggi di-bucket; sparse_topk -> matrix CSR
+    rf.fit(encoder.transform_training(X), train_frame[TARGET].to_numpy())
+    return rf, encoder, time.perf_counter() - start
+
+
+def _latency_ms(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def evaluate_model(rf, encoder, test_frame, batch_size=1_000):
+    X = encoder.transform_frame(test_frame.drop(columns=[TARGET]))
+    y = test_frame[TARGET].to_numpy()
+    proba = rf.predict_proba(X)
+    forest = FlatForest.from_sklearn(rf)
+    row, batch = X[:1], X[:batch_size]
+    return {
+        "accuracy": accuracy_score(y, rf.classes_.take(np.argmax(proba, axis=1))),
+        "auc": roc_auc_score(y, proba[:, 1]),
+        "pickled_mb": len(pickle.dumps(rf, protocol=pickle.HIGHEST_PROTOCOL)) / 1e6,
+        # Single row = jalur form Predict (FlatForest), batch = jalur batch scoring (sklearn)
+        "single_row_ms": _latency_ms(lambda: forest.predict_with_proba(row), repeat=50),
+        f"batch{len(batch)}_ms": _latency_ms(lambda: rf.predict_proba(batch), repeat=3),
+    }
+
+
+# -----------------------------
+# Grid search paralel (kandidat disebar ke process pool)
+# -----------------------------
+_grid = {}
+
+
+def _init_grid_worker(dataset, data_dir, random_state):
+    frame = read_bookings(dataset, data_dir=data_dir)
+    _grid["train"], _grid["test"] = split_holdout(frame, random_state=random_state)
+
+
+def _run_candidate(params):
+    rf, encoder, fit_s = fit_model(_grid["train"], n_jobs=1, **params)
+    result = dict(params)
+    result["n_features"] = encoder.n_features
+    result["fit_s"] = fit_s
+    result.update(evaluate_model(rf, encoder, _grid["test"]))
+    return result
+
+
+def grid_candidates(n_estimators, max_depth, sample_frac, encoding, random_state=42):
+    for n, depth, frac, enc in itertools.product(n_estimators, max_depth, sample_frac, encoding):
+        yield {"n_estimators": n, "max_depth": depth, "sample_frac": frac, "encoding": enc,
+               "random_state": random_state}
+
+
+def run_grid(candidates, dataset, data_dir=None, workers=None, random_state=42, log=print):
+    candidates = list(candidates)
+    workers = min(workers or os.cpu_count() or 1, len(candidates))
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_grid_worker,
+                             initargs=(dataset, data_dir, random_state)) as pool:
+        futures = [pool.submit(_run_candidate, params) for params in candidates]
+        for i, fut in enumerate(as_completed(futures), 1):
+            res = fut.result()
+            results.append(res)
+            log(f"[{i}/{len(candidates)}] n_estimators={res['n_estimators']} max_depth={res['max_depth']} "
+                f"sample_frac={res['sample_frac']} encoding={res['encoding']} -> "
+                f"AUC {res['auc']:.4f}, fit {res['fit_s']:.1f}s, {res['pickled_mb']:.1f} MB, "
+                f"single row {res['single_row_ms']:.2f} ms")
+    return pd.DataFrame(results)
+
+
+def pareto_front(results, maximize="auc", minimize=("single_row_ms", "pickled_mb")):
+    # Kandidat yang tidak kalah di semua sisi (akurasi vs latency vs ukuran)
+    keep = []
+    for i, row in results.iterrows():
+        dominated = False
+        for j, other in results.iterrows():
+            if i == j:
+                continue
+            no_worse = other[maximize] >= row[maximize] and all(other[m] <= row[m] for m in minimize)
+            better = other[maximize] > row[maximize] or any(other[m] < row[m] for m in minimize)
+            if no_worse and better:
+                dominated = True
+                break
+        keep.append(not dominated)
+    return results[keep].sort_values(maximize, ascending=False)
+
+
+# -----------------------------
+# Backtest rolling-origin per bulan kedatangan
+# -----------------------------
+# Train di bulan <= T, score bulan T+1..T+horizon, lalu T maju `step` bulan. Dataset di-encode
+# sekali, diurutkan per bulan, dan disimpan sebagai .npy: tiap fold cukup memmap file yang sama
+# dan ambil slice baris (tanpa get_dummies / transform ulang). Satu fold = satu proses baru
+# (max_tasks_per_child=1), jadi peak RSS yang dilaporkan memang milik fold itu sendiri.
+BACKTEST_FILES = ("X.npy", "y.npy")
+
+
+def prepare_backtest(dataset, work_dir, data_dir=None, encoding="onehot"):
+    from src.ingest import partition_key
+
+    frame = read_bookings(dataset, data_dir=data_dir)
+    keys = pd.Series([partition_key(y, m) for y, m in zip(frame["arrival_date_year"], frame["arrival_date_month"])],
+                     index=frame.index)
+    order = np.argsort(keys.to_numpy(), kind="stable")
+    frame, keys = frame.iloc[order], keys.iloc[order].to_numpy()
+
+    # Vocabulary dari seluruh dataset hanya menentukan layout kolom (tanpa label), supaya
+    # semua fold bisa memakai matrix yang sama; kategori yang belum muncul di train = kolom nol
+    X = frame.drop(columns=[TARGET])
+    encoder = fit_encoder(X, encoding)
+    work_dir = os.fspath(work_dir)
+    os.makedirs(work_dir, exist_ok=True)
+    out = np.lib.format.open_memmap(os.path.join(work_dir, "X.npy"), mode="w+", dtype=np.float32,
+                                    shape=(len(frame), encoder.n_features))
+    encoder.transform_frame(X, out=out)
+    out.flush()
+    del out
+    np.save(os.path.join(work_dir, "y.npy"), frame[TARGET].to_numpy(dtype=np.int8))
+
+    # Bulan -> range baris [start, stop) di matrix
+    periods, starts = np.unique(keys, return_index=True)
+    stops = np.append(starts[1:], len(keys))
+    return {str(p): (int(a), int(b)) for p, a, b in zip(periods, starts, stops)}, encoder
+
+
+def backtest_folds(periods, min_train=12, horizon=1, step=1, window=None):
+    # periods: {"YYYY-MM": (start, stop)} urut waktu; window=None -> expanding, angka -> sliding (bulan)
+    names = sorted(periods)
+    folds = []
+    for t in range(min_train - 1, len(names) - horizon, step):
+        train = names[max(0, t - window + 1) if window else 0: t + 1]
+        test = names[t + 1: t + 1 + horizon]
+        folds.append({
+            "train_start": train[0], "train_end": train[-1],
+            "test_start": test[0], "test_end": test[-1],
+            "train_rows": (periods[train[0]][0], periods[train[-1]][1]),
+            "test_rows": (periods[test[0]][0], periods[test[-1]][1]),
+        })
+    return folds
+
+
+def _run_fold(work_dir, fold, n_estimators=100, max_depth=None, sample_frac=1.0, random_state=42, n_jobs=1):
+    start = time.perf_counter()
+    X = np.load(os.path.join(work_dir, "X.npy"), mmap_mode="r")
+    y = np.load(os.path.join(work_dir, "y.npy"), mmap_mode="r")
+    (a, b), (c, d) = fold["train_rows"], fold["test_rows"]
+
+    # Tanpa sampling, train = slice memmap (tidak disalin ke memory proses sebelum fit)
+    train = slice(a, b)
+    if sample_frac < 1.0:
+        rng = np.random.default_rng(random_state)
+        train = np.sort(rng.choice(np.arange(a, b), size=max(1, int((b - a) * sample_frac)), replace=False))
+    X_train, y_train = X[train], y[train]
+    rf = RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth, random_state=random_state,
+                                n_jobs=n_jobs)
+    fit_start = time.perf_counter()
+    rf.fit(X_train, y_train)
+    fit_s = time.perf_counter() - fit_start
+
+    y_test = np.asarray(y[c:d])
+    proba = rf.predict_proba(X[c:d])
+    result = {key: fold[key] for key in ("train_start", "train_end", "test_start", "test_end")}
+    result.update({
+        "train_rows": len(y_train),
+        "test_rows": d - c,
+        "test_cancel_rate": float(y_test.mean()) if len(y_test) else math.nan,
+        "auc": roc_auc_score(y_test, proba[:, 1]) if len(np.unique(y_test)) == 2 else math.nan,
+        "accuracy": accuracy_score(y_test, rf.classes_.take(np.argmax(proba, axis=1))),
+        "fit_s": fit_s,
+        "wall_s": time.perf_counter() - start,
+        "peak_rss_mb": peak_rss_mb(),
+    })
+    return result
+
+
+def run_backtest(dataset, work_dir, data_dir=None, encoding="onehot", min_train=12, horizon=1, step=1,
+                 window=None, workers=None, log=print, **params):
+    start = time.perf_counter()
+    periods, encoder = prepare_backtest(dataset, work_dir, data_dir=data_dir, encoding=encoding)
+    folds = backtest_folds(periods, min_train=min_train, horizon=horizon, step=step, window=window)
+    if not folds:
+        raise ValueError(f"Hanya {len(periods)} bulan data: tidak cukup untuk min_train={min_train}, "
+                         f"horizon={horizon}.")
+    log(f"Encoded {sum(b - a for a, b in periods.values()):,} rows x {encoder.n_features} fitur "
+        f"({len(periods)} bulan) dalam {time.perf_counter() - start:.1f}s, {len(folds)} fold")
+
+    workers = min(workers or os.cpu_count() or 1, len(folds))
+    results = []
+    # max_tasks_per_child=1: proses baru per fold (memory fold sebelumnya tidak terbawa)
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+        futures = [pool.submit(_run_fold, os.fspath(work_dir), fold, **params) for fold in folds]
+        for i, fut in enumerate(as_completed(futures), 1):
+            res = fut.result()
+            results.append(res)
+            log(f"[{i}/{len(folds)}] train {res['train_start']}..{res['train_end']} -> "
+                f"test {res['test_start']}..{res['test_end']}: AUC {res['auc']:.4f}, "
+                f"wall {res['wall_s']:.1f}s, peak RSS {res['peak_rss_mb']:.0f} MB")
+    return pd.DataFrame(results).sort_values("test_start", ignore_index=True)
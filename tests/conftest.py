@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Test dijalankan dari root repo: `python -m pytest -q`
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+MONTHS = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+]
+
+
+def make_raw_export(n=3_000, seed=0):
+    # Export mentah seperti hotel_bookings.csv: urut tanggal kedatangan, agent/company/reservation_status*
+    rng = np.random.default_rng(seed)
+    year = np.sort(rng.choice([2015, 2016, 2017], n))
+    month = np.array([MONTHS[i] for i in np.sort(rng.integers(0, 12, n))])
+    order = np.lexsort((np.array([MONTHS.index(m) for m in month]), year))
+    year, month = year[order], month[order]
+    # Rentang nilai berbeda per tahun: downcast per chunk akan memberi tipe integer berbeda
+    lead_time = np.where(year == 2015, rng.integers(0, 100, n), rng.integers(0, 700, n))
+    df = pd.DataFrame({
+        "hotel": rng.choice(["City Hotel", "Resort Hotel"], n),
+        "is_canceled": rng.integers(0, 2, n),
+        "lead_time": lead_time,
+        "arrival_date_year": year,
+        "arrival_date_month": month,
+        "arrival_date_week_number": rng.integers(1, 54, n),
+        "arrival_date_day_of_month": rng.integers(1, 29, n),
+        "stays_in_weekend_nights": rng.integers(0, 5, n),
+        "stays_in_week_nights": rng.integers(0, 11, n),
+        "adults": rng.integers(1, 4, n),
+        "children": rng.choice([0.0, 1.0, np.nan], n),
+        "babies": rng.integers(0, 2, n),
+        "meal": rng.choice(["BB", "HB", "FB", "SC", "Undefined"], n),
+        "country": rng.choice(["PRT", "GBR", "FRA", "ESP", "NULL"], n),
+        "market_segment": rng.choice(["Online TA", "Direct", "Groups"], n),
+        "distribution_channel": rng.choice(["TA/TO", "Direct"], n),
+        "is_repeated_guest": rng.integers(0, 2, n),
+        "previous_cancellations": rng.integers(0, 3, n),
+        "previous_bookings_not_canceled": rng.integers(0, 3, n),
+        "reserved_room_type": rng.choice(list("ABCD"), n),
+        "assigned_room_type": rng.choice(list("ABCDE"), n),
+        "booking_changes": rng.integers(0, 5, n),
+        "deposit_type": rng.choice(["No Deposit", "Non Refund"], n),
+        "agent": rng.choice(["9", "240", "NULL"], n),
+        "company": "NULL",
+        "days_in_waiting_list": rng.integers(0, 20, n),
+        "customer_type": rng.choice(["Transient", "Group"], n),
+        "adr": rng.gamma(4.0, 25.0, n).round(2),
+        "required_car_parking_spaces": rng.integers(0, 2, n),
+        "total_of_special_requests": rng.integers(0, 4, n),
+        "reservation_status": "Check-Out",
+        "reservation_status_date": "2016-01-01",
+    })
+    return df
+
+
+@pytest.fixture
+def raw_export(tmp_path):
+    path = tmp_path / "hotel_bookings.csv"
+    make_raw_export().to_csv(path, index=False)
+    return path
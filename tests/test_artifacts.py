@@ -0,0 +1,47 @@
+import pytest
+
+from src import artifacts
+from src.artifacts import (
+    ArtifactNotFoundError,
+    ChecksumMismatchError,
+    artifact_version,
+    current_entry,
+    load_artifact,
+    publish,
+    publish_object,
+)
+
+
+def test_publish_and_load(tmp_path):
+    publish_object("rf_model", {"trees": 1}, models_dir=tmp_path)
+    assert load_artifact("rf_model", models_dir=tmp_path) == {"trees": 1}
+    assert artifact_version("rf_model", tmp_path).startswith("rf_model@v1:")
+
+
+def test_missing_artifact(tmp_path):
+    with pytest.raises(ArtifactNotFoundError):
+        load_artifact("rf_model", models_dir=tmp_path)
+
+
+def test_same_content_is_not_a_new_version_unless_source_changes(tmp_path):
+    path = tmp_path / "columns.pkl"
+    path.write_bytes(b"columns")
+    assert publish("training_columns", path, models_dir=tmp_path)["version"] == 1
+    assert publish("training_columns", path, models_dir=tmp_path)["version"] == 1
+    assert publish("training_columns", path, models_dir=tmp_path, source="rf_model@v2")["version"] == 2
+
+
+def test_checksum_mismatch(tmp_path):
+    publish_object("rf_model", {"trees": 1}, models_dir=tmp_path)
+    (tmp_path / current_entry("rf_model", tmp_path)["file"]).write_bytes(b"corrupt")
+    with pytest.raises(ChecksumMismatchError):
+        load_artifact("rf_model", models_dir=tmp_path)
+
+
+def test_republish_releases_previous_version(tmp_path):
+    publish_object("rf_model", {"trees": 1}, models_dir=tmp_path)
+    load_artifact("rf_model", models_dir=tmp_path)
+    publish_object("rf_model", {"trees": 2}, models_dir=tmp_path)
+    assert load_artifact("rf_model", models_dir=tmp_path) == {"trees": 2}
+    loaded = [key for key in artifacts._loaded if key[:2] == (str(tmp_path), "rf_model")]
+    assert [key[2] for key in loaded] == [2]
@@ -0,0 +1,70 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from src import data
+from src.ingest import clean_chunk
+from tests.conftest import make_raw_export
+
+
+def _write_dataset(data_dir, name, n):
+    path = data_dir / f"{name}.csv"
+    clean_chunk(make_raw_export(n)).to_csv(path, index=False)
+    return path
+
+
+def test_load_data_shares_one_frame_per_version(tmp_path, monkeypatch):
+    monkeypatch.setattr(data, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(data, "_frames", {})
+    path = _write_dataset(tmp_path, "bookings", 500)
+
+    first = data.load_data("bookings")
+    assert data.load_data("bookings") is first
+
+    # File diganti -> dibaca ulang, versi lama dibuang
+    _write_dataset(tmp_path, "bookings", 800)
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+    second = data.load_data("bookings")
+    assert second is not first
+    assert len(second) > len(first)
+    assert len(data._frames) == 1
+
+
+def test_read_bookings_column_subset(tmp_path):
+    _write_dataset(tmp_path, "bookings", 300)
+    frame = data.read_bookings("bookings", columns=["lead_time", "adr"], data_dir=tmp_path)
+    assert list(frame.columns) == ["lead_time", "adr"]
+    assert isinstance(frame, pd.DataFrame)
+
+
+def test_dataset_with_raw_agent_column(tmp_path):
+    # Dataset lama: kolom agent/company, belum ada has_agent
+    frame = clean_chunk(make_raw_export(300)).drop(columns=["has_agent"])
+    frame["agent"] = ["NULL", "9", "240"] * 100
+    frame["company"] = "NULL"
+    frame.to_csv(tmp_path / "bookings.csv", index=False)
+
+    full = data.read_bookings("bookings", data_dir=tmp_path)
+    assert full["has_agent"].tolist() == [0, 1, 1] * 100
+    subset = data.read_bookings("bookings", columns=["lead_time", "has_agent"], data_dir=tmp_path)
+    assert list(subset.columns) == ["lead_time", "has_agent"]
+    assert subset["has_agent"].sum() == 200
+
+    data.convert_to_columnar("bookings", tmp_path)
+    subset = data.read_bookings("bookings", columns=["has_agent"], data_dir=tmp_path)
+    assert subset["has_agent"].sum() == 200
+
+
+def test_apply_schema_keeps_typed_columns_without_copy():
+    typed = data.apply_schema(clean_chunk(make_raw_export(500)), require_all=True)
+    again = data.apply_schema(typed, require_all=True)
+    for col in typed.columns:
+        assert again[col].dtype == typed[col].dtype
+        if not isinstance(typed[col].dtype, pd.CategoricalDtype):
+            assert np.shares_memory(again[col].to_numpy(), typed[col].to_numpy()), col
+
+    # Masih di-downcast kalau belum compact
+    wide = typed.astype({"lead_time": np.int64, "adults": np.float64})
+    assert data.apply_schema(wide)["lead_time"].dtype == typed["lead_time"].dtype
+    assert data.apply_schema(wide)["adults"].dtype == typed["adults"].dtype
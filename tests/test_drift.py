@@ -0,0 +1,94 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from src.artifacts import publish_object
+from src.drift import DRIFT_CATEGORICAL, DRIFT_NUMERIC, build_reference, load_monitor
+
+
+def _bookings(n=5_000, seed=0, lead_scale=1.0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "lead_time": rng.integers(0, 300, n) * lead_scale,
+        "adr": rng.gamma(4.0, 25.0, n),
+        "booking_changes": rng.integers(0, 4, n),
+        "country": rng.choice(["PRT", "GBR", "FRA", "ESP"], n),
+        "market_segment": rng.choice(["Online TA", "Direct", "Groups"], n),
+        "deposit_type": rng.choice(["No Deposit", "Non Refund"], n),
+    })
+
+
+def test_same_distribution_is_stable_and_shift_is_detected():
+    reference = build_reference(_bookings(seed=0))
+    live = reference.empty_like()
+    live.update_frame(_bookings(seed=1))
+    report = live.compare(reference)["features"]
+    assert all(report[col]["status"] == "ok" for col in DRIFT_NUMERIC + DRIFT_CATEGORICAL)
+
+    shifted = reference.empty_like()
+    shifted.update_frame(_bookings(seed=1, lead_scale=3.0))
+    assert shifted.compare(reference)["features"]["lead_time"]["status"] == "drift"
+
+
+def test_record_and_frame_updates_agree():
+    reference = build_reference(_bookings(seed=0))
+    frame = _bookings(n=300, seed=2)
+    by_frame, by_record = reference.empty_like(), reference.empty_like()
+    by_frame.update_frame(frame)
+    by_record.update_records(frame.to_dict("records"))
+    for col in by_frame.counts:
+        assert np.array_equal(by_frame.counts[col], by_record.counts[col])
+
+
+def test_missing_field_is_not_counted():
+    reference = build_reference(_bookings(seed=0))
+    live = reference.empty_like()
+    record = _bookings(n=1, seed=3).to_dict("records")[0]
+    del record["country"]
+    live.update_record(record)
+    assert live.counts["country"].sum() == 0
+    assert live.counts["lead_time"].sum() == 1
+
+
+def test_monitor_requires_reference_for_active_model(tmp_path):
+    from src.artifacts import artifact_version
+
+    assert load_monitor(tmp_path) is None
+    publish_object("rf_model", {"model": 1}, models_dir=tmp_path)
+    publish_object("drift_reference", build_reference(_bookings()), models_dir=tmp_path,
+                   source=artifact_version("rf_model", tmp_path))
+    assert load_monitor(tmp_path) is not None
+
+    # rf_model diganti tanpa referensi baru (mis. fetch_artifacts.py): tidak dimonitor
+    publish_object("rf_model", {"model": 2}, models_dir=tmp_path)
+    assert load_monitor(tmp_path) is None
+
+
+def test_score_csv_writes_report_without_reference(tmp_path):
+    import json
+
+    from sklearn.ensemble import RandomForestClassifier
+
+    from src.features import FeatureEncoder
+    from src.ingest import clean_chunk
+    from src.schema import TARGET
+    from src.scoring import score_csv
+    from tests.conftest import make_raw_export
+
+    frame = clean_chunk(make_raw_export(500))
+    X = frame.drop(columns=[TARGET])
+    encoder = FeatureEncoder.fit(X)
+    rf = RandomForestClassifier(n_estimators=3, max_depth=4, random_state=0).fit(encoder.transform_frame(X),
+                                                                                 frame[TARGET].to_numpy())
+    publish_object("rf_model", rf, models_dir=tmp_path)
+    publish_object("training_columns", encoder.feature_names, models_dir=tmp_path)
+    frame.to_csv(tmp_path / "bookings.csv", index=False)
+
+    # Tanpa drift_reference: scoring tetap jalan dan report berisi stub, bukan file yang hilang
+    rows, _ = score_csv(tmp_path / "bookings.csv", tmp_path / "scores.csv", workers=1, models_dir=tmp_path,
+                        drift_report=tmp_path / "drift.json", log=io.StringIO())
+    assert rows == len(frame)
+    report = json.loads((tmp_path / "drift.json").read_text(encoding="utf-8"))
+    assert report["status"] == "no_reference"
+    assert report["features"] == {}
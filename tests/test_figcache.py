@@ -0,0 +1,60 @@
+import json
+
+from src.figcache import FigureCache
+
+
+class _Figure:
+    # Cukup untuk FigureCache.plotly: to_json()
+    def __init__(self, value):
+        self.value = value
+
+    def to_json(self):
+        return json.dumps({"data": [], "layout": {"title": self.value}})
+
+
+def test_plotly_hit_after_miss(tmp_path):
+    cache = FigureCache(tmp_path / "figures")
+    builds = []
+
+    def build():
+        builds.append(1)
+        return _Figure("a")
+
+    first = cache.plotly("chart", {"col": "adr"}, "dataset-hash", build)
+    second = cache.plotly("chart", {"col": "adr"}, "dataset-hash", build)
+    assert first == second
+    assert len(builds) == 1
+    assert cache.stats()["entries"] == 1
+
+    # Instance baru (restart) membaca dari disk
+    assert FigureCache(tmp_path / "figures").plotly("chart", {"col": "adr"}, "dataset-hash", build) == first
+    assert len(builds) == 1
+
+
+def test_inputs_and_dataset_change_key(tmp_path):
+    cache = FigureCache(tmp_path / "figures")
+    cache.plotly("chart", {"col": "adr"}, "v1", lambda: _Figure("a"))
+    cache.plotly("chart", {"col": "lead_time"}, "v1", lambda: _Figure("b"))
+    cache.plotly("chart", {"col": "adr"}, "v2", lambda: _Figure("c"))
+    assert cache.misses == 3
+
+
+def test_read_only_cache_dir_serves_from_memory(tmp_path):
+    # Parent berupa file: mkdir gagal (OSError), sama seperti folder cache read-only
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    cache = FigureCache(blocker / "figures")
+
+    first = cache.plotly("chart", {}, "v1", lambda: _Figure("a"))
+    second = cache.plotly("chart", {}, "v1", lambda: _Figure("a"))
+    assert first == second
+    assert cache.hits == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_eviction_by_entries(tmp_path):
+    cache = FigureCache(tmp_path / "figures", max_entries=2)
+    for i in range(4):
+        cache.plotly("chart", {"i": i}, "v1", lambda: _Figure(str(i)))
+    assert cache.stats()["entries"] == 2
+    assert len(list((tmp_path / "figures").iterdir())) == 2
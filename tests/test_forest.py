@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.features import FeatureEncoder, transform_grid
+from src.forest import FlatForest
+from src.ingest import clean_chunk
+from src.schema import TARGET
+from tests.conftest import make_raw_export
+
+
+@pytest.fixture(scope="module")
+def model():
+    frame = clean_chunk(make_raw_export(2_000))
+    X = frame.drop(columns=[TARGET])
+    encoder = FeatureEncoder.fit(X)
+    rf = RandomForestClassifier(n_estimators=15, max_depth=12, random_state=0, n_jobs=1)
+    rf.fit(encoder.transform_frame(X), frame[TARGET].to_numpy())
+    return rf, encoder, X
+
+
+def test_flat_forest_matches_sklearn(model):
+    rf, encoder, X = model
+    forest = FlatForest.from_sklearn(rf)
+    forest.BLOCK_PAIRS = 1_000  # beberapa blok, bukan satu blok besar
+    X_t = encoder.transform_frame(X)
+    X_t[::7, encoder.numeric_index("adr")] = np.nan
+
+    assert np.array_equal(forest.predict_proba(X_t), rf.predict_proba(X_t))
+    assert np.array_equal(forest.predict(X_t), rf.predict(X_t))
+    assert np.array_equal(forest.apply(X_t) - forest.roots, rf.apply(X_t))
+
+
+def test_explain_sums_to_proba(model):
+    rf, encoder, X = model
+    forest = FlatForest.from_sklearn(rf)
+    X_t = encoder.transform_frame(X.head(100))
+    bias, contrib = forest.explain(X_t)
+    np.testing.assert_allclose(bias + contrib.sum(axis=1), rf.predict_proba(X_t)[:, 1], atol=1e-12)
+
+
+def test_predict_grid_matches_predict_proba(model):
+    rf, encoder, X = model
+    forest = FlatForest.from_sklearn(rf)
+    record = {k: (v.item() if hasattr(v, "item") else v) for k, v in X.iloc[0].items()}
+    lead_times, adrs = np.arange(0, 501, 7), np.arange(0, 1001, 13)
+
+    grid = forest.predict_grid(encoder.transform_record(record), encoder.numeric_index("lead_time"), lead_times,
+                               encoder.numeric_index("adr"), adrs)
+    expected = forest.predict_proba(transform_grid(encoder, record, "lead_time", lead_times, "adr", adrs))
+    assert np.array_equal(grid, expected[:, 1].reshape(len(lead_times), len(adrs)))
+
+
+def test_predict_grid_rejects_unsorted_values(model):
+    rf, encoder, X = model
+    forest = FlatForest.from_sklearn(rf)
+    x = encoder.transform_frame(X.head(1))[0]
+    with pytest.raises(ValueError):
+        forest.predict_grid(x, encoder.numeric_index("lead_time"), [10, 0], encoder.numeric_index("adr"), [0, 1])
+
+
+def test_compact_forest_follows_active_model(model, tmp_path):
+    from src.artifacts import ArtifactError, artifact_version, publish_object
+    from src.compact import CompactForest, load_compact_forest
+
+    rf, encoder, X = model
+    publish_object("rf_model", rf, models_dir=tmp_path)
+    publish_object("rf_compact", CompactForest.from_sklearn(rf), models_dir=tmp_path, compress=0,
+                   source=artifact_version("rf_model", tmp_path))
+    compact = load_compact_forest(tmp_path)
+    labels, proba = compact.predict_with_proba(encoder.transform_frame(X.head(50)))
+    assert proba.shape == (50, 2)
+    assert np.abs(proba - rf.predict_proba(encoder.transform_frame(X.head(50)))).max() < 0.01
+
+    # rf_model diganti: rf_compact lama tidak boleh dipakai
+    publish_object("rf_model", {"retrained": True}, models_dir=tmp_path)
+    with pytest.raises(ArtifactError):
+        load_compact_forest(tmp_path)
@@ -0,0 +1,57 @@
+import pandas as pd
+
+from src.data import read_bookings, read_partition_manifest
+from src.ingest import clean_chunk, ingest
+from tests.conftest import make_raw_export
+
+
+def _quiet(*args):
+    pass
+
+
+def test_sorted_export_round_trip(raw_export, tmp_path):
+    data_dir = tmp_path / "data"
+    manifest = ingest(raw_export, "bookings", data_dir=data_dir, chunksize=500, log=_quiet)
+
+    frame = read_bookings("bookings", data_dir=data_dir)
+    expected = clean_chunk(pd.read_csv(raw_export))
+    assert len(frame) == manifest["rows"] == len(expected)
+    assert list(frame.columns) == list(expected.columns)
+    assert frame["lead_time"].sum() == expected["lead_time"].sum()
+    assert frame["is_canceled"].sum() == expected["is_canceled"].sum()
+
+
+def test_partition_pruning(raw_export, tmp_path):
+    data_dir = tmp_path / "data"
+    ingest(raw_export, "bookings", data_dir=data_dir, chunksize=500, log=_quiet)
+
+    frame = read_bookings("bookings", data_dir=data_dir, years=[2016], months=["July"])
+    assert len(frame)
+    assert set(frame["arrival_date_year"]) == {2016}
+    assert set(frame["arrival_date_month"].astype(str)) == {"July"}
+
+
+def test_incremental_run_reads_new_months(tmp_path):
+    data_dir = tmp_path / "data"
+    raw = make_raw_export()
+    path = tmp_path / "raw.csv"
+    raw[raw["arrival_date_year"] == 2015].to_csv(path, index=False)
+    ingest(path, "bookings", data_dir=data_dir, chunksize=500, log=_quiet)
+
+    raw.to_csv(path, index=False)
+    manifest = ingest(path, "bookings", data_dir=data_dir, chunksize=500, log=_quiet)
+    assert manifest["version"] == 2
+    assert len(read_bookings("bookings", data_dir=data_dir)) == manifest["rows"]
+
+
+def test_rebuild_removes_old_files(raw_export, tmp_path):
+    data_dir = tmp_path / "data"
+    ingest(raw_export, "bookings", data_dir=data_dir, chunksize=500, log=_quiet)
+    before = sorted((data_dir / "bookings").rglob("*.feather"))
+
+    ingest(raw_export, "bookings", data_dir=data_dir, chunksize=500, rebuild=True, log=_quiet)
+    after = sorted((data_dir / "bookings").rglob("*.feather"))
+    manifest = read_partition_manifest("bookings", data_dir)
+    listed = {f for part in manifest["partitions"].values() for f in part["files"]}
+    assert len(after) == len(before)
+    assert {str(p.relative_to(data_dir / "bookings")) for p in after} == listed
@@ -0,0 +1,89 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from src.server import ScoringServer
+
+
+class _Model:
+    # Pengganti src.server.Model: satu fitur, probabilitas tetap
+    version = "rf_model@v0:test"
+    monitor = None
+
+    def encode(self, bookings):
+        return np.zeros((len(bookings), 1), dtype=np.float32)
+
+    def score(self, X):
+        proba = np.tile([0.75, 0.25], (len(X), 1))
+        return np.zeros(len(X), dtype=int), proba
+
+
+async def _exchange(raw):
+    server = ScoringServer(_Model())
+    await server.batcher.start()
+    tcp = await asyncio.start_server(server.handle_connection, "127.0.0.1", 0)
+    port = tcp.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), timeout=5)
+        writer.close()
+        return response
+    finally:
+        tcp.close()
+        await tcp.wait_closed()
+        await server.batcher.stop()
+
+
+def _status(response):
+    return int(response.split(b" ", 2)[1])
+
+
+def _post(body):
+    body = body if isinstance(body, bytes) else json.dumps(body).encode()
+    request = (b"POST /predict HTTP/1.1\r\nConnection: close\r\nContent-Length: "
+               + str(len(body)).encode() + b"\r\n\r\n" + body)
+    response = asyncio.run(_exchange(request))
+    return _status(response), json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+
+BOOKING = {
+    "deposit_type": "No Deposit", "market_segment": "Online TA", "required_car_parking_spaces": 0,
+    "country": "PRT", "customer_type": "Transient", "previous_cancellations": 0, "lead_time": 30,
+    "adults": 2, "children": 0, "babies": 0, "adr": 100.0, "total_of_special_requests": 1,
+    "reserved_room_type": "A", "booking_changes": 0, "assigned_room_type": "A",
+}
+
+
+@pytest.mark.parametrize("length", [b"abc", b"-5", b"1.5"])
+def test_invalid_content_length_is_400(length):
+    response = asyncio.run(_exchange(b"POST /predict HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n{}"))
+    assert _status(response) == 400
+
+
+def test_predict_single_booking():
+    status, payload = _post(BOOKING)
+    assert status == 200
+    assert payload["cancel_probability"] == pytest.approx(0.25)
+
+
+def test_missing_and_unknown_fields_are_400():
+    booking = {k: v for k, v in BOOKING.items() if k not in ("adr", "country")}
+    booking["lead_tme"] = 30
+    status, payload = _post(booking)
+    assert status == 400
+    assert "adr" in payload["error"] and "country" in payload["error"] and "lead_tme" in payload["error"]
+
+
+@pytest.mark.parametrize("field, value", [
+    ("adr", "NaN"), ("adr", "Infinity"), ("adr", "1e40"), ("lead_time", "1e40"), ("lead_time", "2.5"),
+    ("lead_time", "true"), ("lead_time", "null"), ("country", "1"),
+])
+def test_invalid_values_are_400(field, value):
+    body = json.dumps(dict(BOOKING, **{field: 0})).replace(f'"{field}": 0', f'"{field}": {value}')
+    status, payload = _post(body.encode())
+    assert status == 400
+    assert field in payload["error"]
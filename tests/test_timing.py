@@ -0,0 +1,33 @@
+import sys
+import threading
+import time
+
+from src import timing
+
+
+def test_import_module_waits_for_import_in_progress(tmp_path, monkeypatch):
+    # Modul yang import-nya lambat: thread kedua tidak boleh mendapat modul setengah jadi
+    (tmp_path / "slow_page.py").write_text("import time\ntime.sleep(0.3)\n\ndef show():\n    return 'ok'\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "slow_page", raising=False)
+
+    warm_up = threading.Thread(target=timing.import_module, args=("slow_page",))
+    warm_up.start()
+    time.sleep(0.1)
+    try:
+        module = timing.import_module("slow_page")
+        assert module.show() == "ok"
+    finally:
+        warm_up.join()
+    imports = [r for r in timing.startup_report() if r["category"] == "import" and r["name"] == "slow_page"]
+    assert len(imports) == 1
+
+
+def test_startup_marks_survive_rolling_log():
+    timing.mark_once("startup", "test-first-render")
+    timing.mark_once("startup", "test-first-render")
+    for _ in range(timing.MAX_RECORDS + 10):
+        timing.record("page", "test-page", 0.001)
+    assert not any(r["name"] == "test-first-render" for r in timing.report())
+    marks = [r for r in timing.startup_report() if r["name"] == "test-first-render"]
+    assert len(marks) == 1
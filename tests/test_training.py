@@ -0,0 +1,28 @@
+import numpy as np
+
+from src.data import read_bookings
+from src.features import FeatureEncoder
+from src.ingest import clean_chunk
+from src.schema import TARGET
+from src.training import train_streaming
+from tests.conftest import make_raw_export
+
+
+def test_streaming_uses_dataset_schema(tmp_path):
+    # Export lama: agent/company mentah tanpa has_agent
+    frame = clean_chunk(make_raw_export(1_500)).drop(columns=["has_agent"])
+    frame["agent"] = ["NULL", "9", "240"] * 500
+    frame["company"] = "NULL"
+    frame.to_csv(tmp_path / "bookings.csv", index=False)
+
+    rf, encoder, metrics = train_streaming(tmp_path / "bookings.csv", chunksize=500, trees_per_chunk=2,
+                                           max_depth=6, n_jobs=1, log=lambda *_: None)
+    assert metrics["rows_trained"] > 0
+    # Fitur sama dengan encoder training in-memory (read_bookings), tanpa ID agent/company
+    expected = FeatureEncoder.fit(read_bookings("bookings", data_dir=tmp_path)
+                                  .drop(columns=[TARGET, "agent", "company"]))
+    assert encoder.feature_names == expected.feature_names
+    assert "has_agent" in encoder.numeric
+
+    X = encoder.transform_frame(read_bookings("bookings", data_dir=tmp_path).head(10))
+    assert np.array_equal(X[:, encoder.numeric_index("has_agent")], [0, 1, 1, 0, 1, 1, 0, 1, 1, 0])
@@ -0,0 +1,247 @@
+# train.py
+# Satu entry point untuk training model cancellation (pengganti train_model*.py).
+#
+#   python train.py fit                                  # 20% sample, 100 tree (default lama)
+#   python train.py fit --sample-frac 0.2 --n-estimators 150 --max-depth 10
+#   python train.py fit --encoding sparse_topk --top-k 20     # country dll. di-bucket top-K + "Other"
+#   python train.py grid --n-estimators 50 100 150 --max-depth 10 20 none --sample-frac 0.2 0.5 1.0
+#   python train.py stream --chunksize 200000 --trees-per-chunk 5 --publish
+#   python train.py backtest --min-train 12 --horizon 3 --workers 4
+import argparse
+import math
+from pathlib import Path
+
+import joblib
+
+from src.artifacts import artifact_version, publish
+from src.data import DEFAULT_DATASET, csv_path, read_bookings
+from src.drift import build_reference
+from src.features import ENCODERS
+from src.forest import publish_flat_forest
+
+
+def depth_arg(value):
+    return None if value.lower() in ("none", "0") else int(value)
+
+
+def print_metrics(metrics):
+    for key, value in metrics.items():
+        print(f"  {key}: {value:.4f}" if isinstance(value, float) else f"  {key}: {value}")
+
+
+def save_model(rf, encoder, out_dir, tag, publish_model=False, reference=None):
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    paths = {
+        "training_columns": out / f"training_columns_{tag}.pkl",
+        "feature_encoder": out / f"feature_encoder_{tag}.pkl",
+        "rf_model": out / f"rf_model_{tag}.pkl",
+    }
+    joblib.dump(encoder.feature_names, paths["training_columns"])
+    joblib.dump(encoder, paths["feature_encoder"])
+    joblib.dump(rf, paths["rf_model"])
+    if reference is not None:
+        # Sketch distribusi data training (src/drift.py), dibandingkan dengan booking yang di-score
+        paths["drift_reference"] = out / f"drift_reference_{tag}.pkl"
+        joblib.dump(reference, paths["drift_reference"])
+    print(f"✅ Model disimpan di {paths['rf_model']}")
+
+    if publish_model:
+        # Daftarkan ke artifact store sebagai model aktif (model terakhir, supaya versi kolom cocok)
+        for name, path in paths.items():
+            source = artifact_version("rf_model") if name == "drift_reference" else None
+            publish(name, path, source=source)
+        publish_flat_forest(rf=rf)
+        print("✅ Model dipublish ke artifact store")
+
+
+# -----------------------------
+# fit: satu model in-memory
+# -----------------------------
+def cmd_fit(args):
+    from src.training import evaluate_model, fit_model, split_holdout, training_sample
+
+    frame = read_bookings(args.dataset)
+    train_frame, test_frame = split_holdout(frame, random_state=args.random_state)
+    rf, encoder, fit_s = fit_model(
+        train_frame,
+        n_estimators=args.n_estimators,
+        max_depth=args.max_depth,
+        sample_frac=args.sample_frac,
+        encoding=args.encoding,
+        random_state=args.random_state,
+        n_jobs=args.n_jobs,
+        top_k=args.top_k,
+    )
+    metrics = {"fit_s": fit_s, "n_features": encoder.n_features}
+    metrics.update(evaluate_model(rf, encoder, test_frame))
+    print_metrics(metrics)
+    reference = build_reference(training_sample(train_frame, args.sample_frac, args.random_state))
+    save_model(rf, encoder, args.out_dir, args.tag, args.publish, reference)
+
+
+# -----------------------------
+# grid: banyak kandidat paralel + tabel hasil
+# -----------------------------
+def cmd_grid(args):
+    from src.training import fit_model, grid_candidates, pareto_front, run_grid, split_holdout, training_sample
+
+    candidates = grid_candidates(args.n_estimators, args.max_depth, args.sample_frac, args.encoding,
+                                 random_state=args.random_state)
+    results = run_grid(candidates, args.dataset, workers=args.workers, random_state=args.random_state)
+
+    Path(args.results).parent.mkdir(parents=True, exist_ok=True)
+    results.to_csv(args.results, index=False)
+    print(f"\n✅ Hasil grid disimpan di {args.results}")
+
+    front = pareto_front(results)
+    print("\nPareto front (AUC vs single-row latency vs ukuran):")
+    print(front.to_string(index=False))
+
+    if args.save_best:
+        pick = front
+        if args.max_latency_ms is not None:
+            pick = pick[pick["single_row_ms"] <= args.max_latency_ms]
+        if args.max_size_mb is not None:
+            pick = pick[pick["pickled_mb"] <= args.max_size_mb]
+        if pick.empty:
+            print("⚠️ Tidak ada kandidat yang memenuhi batas latency/ukuran.")
+            return
+        best = pick.iloc[0]
+        depth = None if best["max_depth"] is None or math.isnan(best["max_depth"]) else int(best["max_depth"])
+        print(f"\nMelatih ulang kandidat terbaik: n_estimators={best['n_estimators']} max_depth={depth} "
+              f"sample_frac={best['sample_frac']} encoding={best['encoding']}")
+        train_frame, _ = split_holdout(read_bookings(args.dataset), random_state=args.random_state)
+        rf, encoder, _ = fit_model(
+            train_frame,
+            n_estimators=int(best["n_estimators"]),
+            max_depth=depth,
+            sample_frac=float(best["sample_frac"]),
+            encoding=best["encoding"],
+            random_state=args.random_state,
+            n_jobs=-1,
+        )
+        reference = build_reference(training_sample(train_frame, float(best["sample_frac"]), args.random_state))
+        save_model(rf, encoder, args.out_dir, args.tag, args.publish, reference)
+
+
+# -----------------------------
+# stream: out-of-core, seluruh dataset
+# -----------------------------
+def cmd_stream(args):
+    from src.training import read_chunks, train_streaming
+
+    rf, encoder, metrics = train_streaming(
+        args.csv,
+        chunksize=args.chunksize,
+        trees_per_chunk=args.trees_per_chunk,
+        max_depth=args.max_depth,
+        holdout_frac=args.holdout_frac,
+        random_state=args.random_state,
+        n_jobs=args.n_jobs,
+    )
+    print_metrics(metrics)
+    # Referensi drift dari seluruh CSV, per chunk (memory tetap)
+    reference = build_reference(read_chunks(args.csv, args.chunksize))
+    save_model(rf, encoder, args.out_dir, args.tag, args.publish, reference)
+
+
+# -----------------------------
+# backtest: rolling-origin per bulan kedatangan, satu proses per fold
+# -----------------------------
+def cmd_backtest(args):
+    import tempfile
+
+    from src.training import run_backtest
+
+    with tempfile.TemporaryDirectory(prefix="backtest-", dir=args.work_dir) as work_dir:
+        results = run_backtest(
+            args.dataset,
+            work_dir,
+            encoding=args.encoding,
+            min_train=args.min_train,
+            horizon=args.horizon,
+            step=args.step,
+            window=args.window,
+            workers=args.workers,
+            n_estimators=args.n_estimators,
+            max_depth=args.max_depth,
+            sample_frac=args.sample_frac,
+            random_state=args.random_state,
+            n_jobs=args.n_jobs,
+        )
+
+    Path(args.results).parent.mkdir(parents=True, exist_ok=True)
+    results.to_csv(args.results, index=False)
+    print(f"\n✅ Hasil backtest disimpan di {args.results}")
+    print(results.to_string(index=False))
+    print(f"\nAUC mean {results['auc'].mean():.4f} (min {results['auc'].min():.4f}, max {results['auc'].max():.4f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Training model hotel cancellation")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--random-state", type=int, default=42)
+    common.add_argument("--out-dir", default="models")
+    common.add_argument("--publish", action="store_true", help="Publish hasil ke artifact store (models/manifest.json)")
+
+    fit = sub.add_parser("fit", parents=[common], help="Training satu model in-memory")
+    fit.add_argument("--dataset", default=DEFAULT_DATASET)
+    fit.add_argument("--n-estimators", type=int, default=100)
+    fit.add_argument("--max-depth", type=depth_arg, default=None)
+    fit.add_argument("--sample-frac", type=float, default=0.2)
+    fit.add_argument("--encoding", choices=list(ENCODERS), default="onehot")
+    fit.add_argument("--top-k", type=int, default=None, help="Jumlah kategori per kolom untuk encoding *_topk")
+    fit.add_argument("--n-jobs", type=int, default=-1)
+    fit.add_argument("--tag", default="20pct", help="Suffix nama file di out-dir")
+    fit.set_defaults(func=cmd_fit)
+
+    grid = sub.add_parser("grid", parents=[common], help="Grid search paralel + tabel akurasi/latency/ukuran")
+    grid.add_argument("--dataset", default=DEFAULT_DATASET)
+    grid.add_argument("--n-estimators", type=int, nargs="+", default=[50, 100, 150])
+    grid.add_argument("--max-depth", type=depth_arg, nargs="+", default=[10, 20, None])
+    grid.add_argument("--sample-frac", type=float, nargs="+", default=[0.2, 0.5])
+    grid.add_argument("--encoding", nargs="+", choices=list(ENCODERS), default=["onehot", "ordinal"])
+    grid.add_argument("--workers", type=int, default=None)
+    grid.add_argument("--results", default="models/grid_results.csv")
+    grid.add_argument("--save-best", action="store_true", help="Latih ulang & simpan kandidat AUC tertinggi di Pareto front")
+    grid.add_argument("--max-latency-ms", type=float, default=None, help="Batas single-row latency untuk --save-best")
+    grid.add_argument("--max-size-mb", type=float, default=None, help="Batas ukuran pickle untuk --save-best")
+    grid.add_argument("--tag", default="best")
+    grid.set_defaults(func=cmd_grid)
+
+    stream = sub.add_parser("stream", parents=[common], help="Training out-of-core: CSV dibaca per chunk, tree ditambah per chunk")
+    stream.add_argument("--csv", type=Path, default=csv_path(DEFAULT_DATASET))
+    stream.add_argument("--chunksize", type=int, default=100_000)
+    stream.add_argument("--trees-per-chunk", type=int, default=10)
+    stream.add_argument("--max-depth", type=depth_arg, default=None)
+    stream.add_argument("--holdout-frac", type=float, default=0.05, help="Porsi tiap chunk untuk evaluasi")
+    stream.add_argument("--n-jobs", type=int, default=-1)
+    stream.add_argument("--tag", default="full")
+    stream.set_defaults(func=cmd_stream)
+
+    backtest = sub.add_parser("backtest", help="Backtest rolling-origin: train s/d bulan T, score T+1..T+horizon")
+    backtest.add_argument("--dataset", default=DEFAULT_DATASET)
+    backtest.add_argument("--min-train", type=int, default=12, help="Jumlah bulan training di fold pertama")
+    backtest.add_argument("--horizon", type=int, default=1, help="Jumlah bulan yang di-score per fold")
+    backtest.add_argument("--step", type=int, default=1, help="Origin maju sekian bulan per fold")
+    backtest.add_argument("--window", type=int, default=None, help="Sliding window (bulan); default expanding")
+    backtest.add_argument("--n-estimators", type=int, default=100)
+    backtest.add_argument("--max-depth", type=depth_arg, default=None)
+    backtest.add_argument("--sample-frac", type=float, default=1.0)
+    backtest.add_argument("--encoding", choices=list(ENCODERS), default="onehot")
+    backtest.add_argument("--workers", type=int, default=None)
+    backtest.add_argument("--n-jobs", type=int, default=1, help="Thread per fold (paralelisme utama di level proses)")
+    backtest.add_argument("--work-dir", default=None, help="Lokasi matrix .npy sementara (default: temp dir sistem)")
+    backtest.add_argument("--random-state", type=int, default=42)
+    backtest.add_argument("--results", default="models/backtest_results.csv")
+    backtest.set_defaults(func=cmd_backtest)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()